@@ -24,6 +24,8 @@ from advanced_report_builder.models import (
     TableReport,
     Target,
     TargetColour,
+    WorkingDayCalendar,
+    WorkingDayClosure,
 )
 
 
@@ -263,3 +265,13 @@ class MultiValueReportCellAdmin(admin.ModelAdmin):
     list_display = ('multi_value_report', 'row', 'column', 'multi_value_type', 'multi_cell_style')
     list_filter = ('multi_value_report', 'multi_value_type')
     search_fields = ('text', 'label')
+
+
+class WorkingDayClosureInline(admin.TabularInline):
+    model = WorkingDayClosure
+
+
+@admin.register(WorkingDayCalendar)
+class WorkingDayCalendarAdmin(admin.ModelAdmin):
+    list_display = ('name',)
+    inlines = [WorkingDayClosureInline]
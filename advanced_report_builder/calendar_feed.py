@@ -0,0 +1,107 @@
+from datetime import UTC, datetime, timedelta
+from html import unescape
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.utils import timezone
+from django.utils.html import strip_tags
+
+CONTENT_TYPE = 'text/calendar; charset=utf-8'
+TOKEN_SALT = 'advanced_report_builder.calendar_feed'
+
+
+def get_feed_window(today):
+    """Returns the first day of the feed's events and the day after its last, around today."""
+    past_days = getattr(settings, 'REPORT_BUILDER_CALENDAR_FEED_PAST_DAYS', 30)
+    future_days = getattr(settings, 'REPORT_BUILDER_CALENDAR_FEED_FUTURE_DAYS', 365)
+    return today - timedelta(days=past_days), today + timedelta(days=future_days + 1)
+
+
+def get_feed_token(user):
+    """Returns a signed token identifying the user, for feed URLs that calendar apps request without a session."""
+    return signing.dumps(user.pk, salt=TOKEN_SALT)
+
+
+def get_feed_user(token):
+    """Returns the active user the token was issued to, or None if it wasn't signed by this site."""
+    try:
+        pk = signing.loads(token, salt=TOKEN_SALT)
+    except signing.BadSignature:
+        return None
+    return get_user_model().objects.filter(pk=pk, is_active=True).first()
+
+
+def escape_text(value):
+    """Returns the value as iCalendar TEXT, without any HTML it was formatted with."""
+    text = unescape(strip_tags(str(value))).strip()
+    return (
+        text.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,').replace('\r\n', '\\n').replace('\n', '\\n')
+    )
+
+
+def format_date(value):
+    """Returns the value as an iCalendar DATE or DATE-TIME, in UTC if it knows its timezone."""
+    if not isinstance(value, datetime):
+        return ';VALUE=DATE:' + value.strftime('%Y%m%d')
+    if timezone.is_aware(value):
+        return ':' + value.astimezone(UTC).strftime('%Y%m%dT%H%M%SZ')
+    return ':' + value.strftime('%Y%m%dT%H%M%S')
+
+
+def fold_line(line):
+    """Returns the content line split into lines of at most 75 octets, as RFC 5545 requires."""
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line + '\r\n'
+    parts = []
+    start = 0
+    limit = 75
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        # don't split a multibyte character
+        while end < len(encoded) and encoded[end] & 0xC0 == 0x80:
+            end -= 1
+        parts.append(encoded[start:end].decode())
+        start = end
+        limit = 74
+    return '\r\n '.join(parts) + '\r\n'
+
+
+def calendar_start(name):
+    return ''.join(
+        fold_line(line)
+        for line in (
+            'BEGIN:VCALENDAR',
+            'VERSION:2.0',
+            'PRODID:-//django-advanced-report-builder//calendar feed//EN',
+            'CALSCALE:GREGORIAN',
+            f'X-WR-CALNAME:{escape_text(name)}',
+        )
+    )
+
+
+def calendar_end():
+    return fold_line('END:VCALENDAR')
+
+
+def event(uid, start, end, summary, stamp, description=None, url=None):
+    """Returns a VEVENT. Without an end after its start the event lasts a day, or an hour if it has a time."""
+    if end is not None and isinstance(start, datetime) != isinstance(end, datetime):
+        end = end.date() if isinstance(end, datetime) else datetime.combine(end, start.timetz())
+    if end is None or end <= start:
+        end = start + timedelta(hours=1) if isinstance(start, datetime) else start + timedelta(days=1)
+    lines = [
+        'BEGIN:VEVENT',
+        f'UID:{uid}',
+        f'DTSTAMP{format_date(stamp)}',
+        f'DTSTART{format_date(start)}',
+        f'DTEND{format_date(end)}',
+        f'SUMMARY:{escape_text(summary)}',
+    ]
+    if description:
+        lines.append(f'DESCRIPTION:{escape_text(description)}')
+    if url:
+        lines.append(f'URL:{url}')
+    lines.append('END:VEVENT')
+    return ''.join(fold_line(line) for line in lines)
@@ -5,6 +5,7 @@ from advanced_report_builder.columns import (
     ColourColumn,
     ReverseForeignKeyBoolColumn,
     ReverseForeignKeyChoiceColumn,
+    ReverseForeignKeyColumnBase,
     ReverseForeignKeyDateColumn,
     ReverseForeignKeyStrColumn,
 )
@@ -24,3 +25,4 @@ REVERSE_FOREIGN_KEY_STR_COLUMNS = ReverseForeignKeyStrColumn
 REVERSE_FOREIGN_KEY_BOOL_COLUMNS = ReverseForeignKeyBoolColumn
 REVERSE_FOREIGN_KEY_CHOICE_COLUMNS = ReverseForeignKeyChoiceColumn
 REVERSE_FOREIGN_KEY_DATE_COLUMNS = ReverseForeignKeyDateColumn
+REVERSE_FOREIGN_KEY_COLUMNS = ReverseForeignKeyColumnBase
@@ -1,6 +1,10 @@
+import re
+from functools import lru_cache
+from operator import methodcaller
+
 from django.contrib.humanize.templatetags.humanize import intcomma
 from django.contrib.postgres.aggregates import ArrayAgg, BoolAnd, BoolOr, StringAgg
-from django.db.models import BooleanField, Count, Max, Min
+from django.db.models import BooleanField, Case, CharField, Count, Max, Min, OuterRef, Subquery, Value, When
 from django.db.models.functions import Cast
 from django_datatables.columns import (
     ColumnBase,
@@ -26,6 +30,28 @@ from advanced_report_builder.globals import (
     REVERSE_FOREIGN_KEY_DELIMITER_VALUES,
 )
 
+# str.format fields for the strftime directives that do not depend on the locale
+DATE_FORMAT_FIELDS = {'d': '{0:02d}', 'm': '{1:02d}', 'Y': '{2}', 'y': '{3:02d}', '%': '%'}
+
+
+@lru_cache
+def compile_date_format(date_format):
+    """Returns a function that formats a date like strftime(date_format) does.
+
+    Formats made up of day, month and year directives are built with str.format, which is several times quicker than
+    strftime. Any other directive, such as a month name, uses strftime.
+    """
+    template = ''
+    for part in re.split('(%.)', date_format):
+        if len(part) == 2 and part[0] == '%':
+            if part[1] not in DATE_FORMAT_FIELDS:
+                return methodcaller('strftime', date_format)
+            template += DATE_FORMAT_FIELDS[part[1]]
+        else:
+            template += part.replace('{', '{{').replace('}', '}}')
+    template_format = template.format
+    return lambda value: template_format(value.day, value.month, value.year, value.year % 100)
+
 
 class ReportBuilderDateColumn(ColumnBase):
     def __init__(self, *, date_format=None, **kwargs):
@@ -44,6 +70,17 @@ class ReportBuilderDateColumn(ColumnBase):
         except AttributeError:
             return ''
 
+    def format_column(self, rows, _page_data):
+        field = self.field
+        format_date = compile_date_format(self.date_format)
+        values = []
+        for data in rows:
+            try:
+                values.append(format_date(data[field]))
+            except AttributeError:
+                values.append('')
+        return values
+
 
 class ReportBuilderNumberColumn(ColumnBase):
     def __init__(self, *, decimal_places=0, trim_zeros=True, **kwargs):
@@ -64,6 +101,22 @@ class ReportBuilderNumberColumn(ColumnBase):
         else:
             return number
 
+    def format_column(self, rows, _page_data):
+        field = self.field
+        format_number = self.decimal_places.format
+        trim_zeros = self.trim_zeros
+        values = []
+        for data in rows:
+            number = data.get(field)
+            if number is None:
+                values.append('')
+                continue
+            number = format_number(number)
+            if trim_zeros and '.' in number:
+                number = number.rstrip('0').rstrip('.')
+            values.append(number)
+        return values
+
 
 class ReportBuilderCurrencyPenceColumn(CurrencyPenceColumn):
     currency_prefix = ''
@@ -75,6 +128,20 @@ class ReportBuilderCurrencyPenceColumn(CurrencyPenceColumn):
         except (KeyError, TypeError):
             return '0.00'
 
+    def format_column(self, rows, _page_data):
+        # the ',' format groups the thousands the same way intcomma does for a formatted string
+        field = self.field
+        prefix = self.currency_prefix
+        values = []
+        for data in rows:
+            try:
+                value = f'{data[field] / 100.0:,.2f}'
+            except (KeyError, TypeError):
+                values.append('0.00')
+                continue
+            values.append(f'{prefix}{value}' if prefix else value)
+        return values
+
 
 class ReportBuilderCurrencyColumn(CurrencyColumn):
     currency_prefix = ''
@@ -86,6 +153,19 @@ class ReportBuilderCurrencyColumn(CurrencyColumn):
         except (KeyError, TypeError):
             return '0.00'
 
+    def format_column(self, rows, _page_data):
+        field = self.field
+        prefix = self.currency_prefix
+        values = []
+        for data in rows:
+            try:
+                value = f'{data[field]:,.2f}'
+            except (KeyError, TypeError):
+                values.append('0.00')
+                continue
+            values.append(f'{prefix}{value}' if prefix else value)
+        return values
+
 
 class ArrowColumn(NoHeadingColumn):
     def __init__(self, **kwargs):
@@ -116,7 +196,41 @@ class FilterForeignKeyColumn(ColumnBase):
         return {v: v for v in values if v}
 
 
-class ReverseForeignKeyStrColumn(ColumnBase):
+@lru_cache
+def get_choices(model, field_name):
+    """Returns the choices of the field at field_name from model, looked up once per process."""
+    _, django_field, _ = DatatableModel.get_setup_data(model, field_name)
+    return tuple(django_field.flatchoices)
+
+
+class ReverseForeignKeyColumnBase(ColumnBase):
+    def set_annotations(self, annotations):
+        """Sets annotations whose field paths already include the column's model path."""
+        model_path = self.model_path
+        self.model_path = ''
+        try:
+            self.annotations = {f'{model_path}{name}': annotation for name, annotation in annotations.items()}
+        finally:
+            self.model_path = model_path
+
+    def use_subquery(self, model):
+        """Computes each aggregate in a correlated subquery against model, the table's model, rather than in the
+        table's own query, which would otherwise be grouped by every other column."""
+        pk_name = model._meta.pk.name
+        # set _annotations directly as the aggregates already have the column's model path
+        self._annotations = {
+            field_name: Subquery(
+                model._base_manager.filter(pk=OuterRef(pk_name))
+                .order_by()
+                .values(pk_name)
+                .annotate(value=aggregate)
+                .values('value')
+            )
+            for field_name, aggregate in self.annotations.items()
+        }
+
+
+class ReverseForeignKeyStrColumn(ReverseForeignKeyColumnBase):
     def __init__(self, field_name, report_builder_class_name, **kwargs):
         if not self.initialise(locals()):
             return
@@ -134,7 +248,7 @@ class ReverseForeignKeyStrColumn(ColumnBase):
         }
 
 
-class ReverseForeignKeyBoolColumn(ColumnBase):
+class ReverseForeignKeyBoolColumn(ReverseForeignKeyColumnBase):
     def __init__(self, field_name, report_builder_class_name, **kwargs):
         if not self.initialise(locals()):
             return
@@ -154,35 +268,36 @@ class ReverseForeignKeyBoolColumn(ColumnBase):
             self.annotations = {field_name: ArrayAgg(self.field_name, distinct=True, filter=sub_filter)}
 
 
-class ReverseForeignKeyChoiceColumn(ColumnBase):
+class ReverseForeignKeyChoiceColumn(ReverseForeignKeyColumnBase):
     def __init__(self, field_name, report_builder_class_name, **kwargs):
         if not self.initialise(locals()):
             return
         self.field_name = field_name
-        self.choices = None
         self.report_builder_class_name = report_builder_class_name
         self.delimiter_type = REVERSE_FOREIGN_KEY_DELIMITER_COMMA
         super().__init__(**kwargs)
 
-    def setup_results(self, request, all_results):
-        _, django_field, _ = DatatableModel.get_setup_data(self.model, self.field_name)
-        self.choices = {c[0]: c[1] for c in django_field.choices}
-
     def row_result(self, data, _page_data):
-        results = []
-        for x in data.get(self.field):
-            results.append(self.choices.get(x, ''))
-        delimiter = REVERSE_FOREIGN_KEY_DELIMITER_VALUES[self.delimiter_type]
-        return delimiter.join(results)
+        return data.get(self.field) or ''
 
     def setup_annotations(self, delimiter_type=None, sub_filter=None, field_name=None):
         if field_name is None:
             field_name = self.field_name
         self.delimiter_type = delimiter_type
-        self.annotations = {field_name: ArrayAgg(self.field_name, distinct=True, filter=sub_filter)}
+        # the labels are joined in the database so the column can be sorted and searched like a string column
+        field_path = f'{self.model_path}{self.field_name}'
+        label = Case(
+            *[
+                When(**{field_path: value}, then=Value(str(label)))
+                for value, label in get_choices(self.model, self.field_name)
+            ],
+            output_field=CharField(),
+        )
+        delimiter = REVERSE_FOREIGN_KEY_DELIMITER_VALUES[delimiter_type]
+        self.set_annotations({field_name: StringAgg(label, delimiter=delimiter, distinct=True, filter=sub_filter)})
 
 
-class ReverseForeignKeyDateColumn(ColumnBase):
+class ReverseForeignKeyDateColumn(ReverseForeignKeyColumnBase):
     def __init__(self, field_name, report_builder_class_name, **kwargs):
         if not self.initialise(locals()):
             return
@@ -0,0 +1,62 @@
+from datetime import datetime
+
+
+def lttb_indices(points, threshold):
+    """Returns the indices of the points Largest-Triangle-Three-Buckets keeps to draw the line with threshold points.
+
+    The first and last points are always kept. The points between are split into threshold - 2 buckets and from
+    each the point making the largest triangle with the point kept before it and the average of the next bucket is
+    kept, so peaks and troughs survive.
+    """
+    length = len(points)
+    if threshold >= length or threshold < 3:
+        return list(range(length))
+
+    every = (length - 2) / (threshold - 2)
+    indices = [0]
+    kept = 0
+    for bucket in range(threshold - 2):
+        next_start = int((bucket + 1) * every) + 1
+        next_end = min(int((bucket + 2) * every) + 1, length)
+        next_points = points[next_start:next_end]
+        average_x = sum(x for x, _ in next_points) / len(next_points)
+        average_y = sum(y for _, y in next_points) / len(next_points)
+
+        kept_x, kept_y = points[kept]
+        largest_area = -1
+        for index in range(int(bucket * every) + 1, next_start):
+            x, y = points[index]
+            area = abs((kept_x - average_x) * (y - kept_y) - (kept_x - x) * (average_y - kept_y))
+            if area > largest_area:
+                largest_area = area
+                kept = index
+        indices.append(kept)
+    indices.append(length - 1)
+    return indices
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def downsample_rows(rows, max_points, date_format='%Y-%m-%d'):
+    """Returns at most about max_points of the chart rows, each row being the date followed by a value per line.
+
+    Each line is downsampled on its own to its share of max_points and the rows any line keeps are returned, so
+    every line keeps its peaks.
+    """
+    if not rows or len(rows) <= max_points:
+        return rows
+    x_values = [datetime.strptime(row[0], date_format).toordinal() for row in rows]
+    series_count = max(len(rows[0]) - 1, 1)
+    threshold = max(3, max_points // series_count)
+    indices = set()
+    for series in range(1, series_count + 1):
+        points = [
+            (x, _to_float(row[series]) if series < len(row) else 0.0) for x, row in zip(x_values, rows, strict=True)
+        ]
+        indices.update(lttb_indices(points, threshold))
+    return [rows[index] for index in sorted(indices)]
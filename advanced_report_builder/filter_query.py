@@ -8,12 +8,11 @@ from django.apps import apps
 from django.conf import settings
 from django.db.models import F, Q
 from django.db.models.functions import ExtractWeekDay
-from django.shortcuts import get_object_or_404
 
 from advanced_report_builder.exceptions import ReportError
 from advanced_report_builder.field_utils import ReportBuilderFieldUtils
 from advanced_report_builder.globals import DATE_FORMAT_TYPE_DD_MM_YYYY_SLASH, PeriodType
-from advanced_report_builder.models import ReportOption, ReportQuery
+from advanced_report_builder.report_context import get_report_context
 from advanced_report_builder.utils import get_report_builder_class, try_int
 from advanced_report_builder.variable_date import VariableDate
 
@@ -172,8 +171,18 @@ class FilterQueryMixin:
         self.period_data = PeriodData()
         self._held_report_query = None
         self._report_options_data = None
+        self._report_context = None
+        # set once a filter has resolved a variable date, so its query depends on today
+        self.uses_variable_dates = False
         super().__init__(*args, **kwargs)
 
+    @property
+    def report_context(self):
+        if self._report_context is None:
+            kwargs = getattr(self, 'kwargs', None) or {}
+            self._report_context = kwargs.get('report_context') or get_report_context(getattr(self, 'request', None))
+        return self._report_context
+
     def get_currency_prefix(self):
         return getattr(settings, 'REPORT_BUILDER_CURRENCY_PREFIX', '£')
 
@@ -418,8 +427,7 @@ class FilterQueryMixin:
                     VariableDate.RANGE_TYPE_THIS_FINANCIAL_YEAR,
                     VariableDate.RANGE_TYPE_NEXT_FINANCIAL_YEAR,
                 ):
-                    variable_date = VariableDate()
-                    dates = variable_date.get_variable_dates(
+                    dates = self.get_variable_dates(
                         range_type=range_type,
                         financial_year_start_month=self.get_financial_month(),
                     )
@@ -444,13 +452,18 @@ class FilterQueryMixin:
     def set_min_max_date(self, min_date, max_date=None, period_type=None):
         self.period_data.set_min_max_date(min_date=min_date, max_date=max_date, period_type=period_type)
 
+    def get_variable_dates(self, range_type, financial_year_start_month):
+        self.uses_variable_dates = True
+        return self.report_context.get_variable_dates(
+            range_type=range_type, financial_year_start_month=financial_year_start_month
+        )
+
     def get_variable_date(self, value, query_list, display_operator, field, query_string):
         if display_operator in ['is_null', 'is_not_null']:
             query_list.append(Q((query_string, value)))
         else:
             _, range_type = value.split(':')
-            variable_date = VariableDate()
-            value = variable_date.get_variable_dates(
+            value = self.get_variable_dates(
                 range_type=int(range_type), financial_year_start_month=self.get_financial_month()
             )
 
@@ -764,15 +777,11 @@ class FilterQueryMixin:
             slug_key = self.slug.get(f'query{report.pk}_{dashboard_report.pk}')
         else:
             slug_key = self.slug.get(f'query{report.pk}')
-        if slug_key:
-            report_query = get_object_or_404(ReportQuery, id=slug_key)
-            if report_query.report_id != report.pk:
-                return None
-        else:
-            if dashboard_report is not None and dashboard_report.report_query is not None:
-                report_query = dashboard_report.report_query
-            else:
-                report_query = report.reportquery_set.first()
+        report_query = self.report_context.get_report_query(
+            report=report, dashboard_report=dashboard_report, query_id=slug_key
+        )
+        if report_query is None:
+            return None
         self._held_report_query = report_query
         return self._held_report_query
 
@@ -802,7 +811,7 @@ class FilterQueryMixin:
         else:
             title = self.report.name
             extra_title_parts = []
-            report_queries_count = self.report.reportquery_set.all().count()
+            report_queries_count = len(self.report_context.get_report_queries(report=self.report))
             if report_queries_count > 1:
                 version_name = self.get_report_query(report=self.report).name
                 extra_title_parts.append(version_name)
@@ -810,13 +819,22 @@ class FilterQueryMixin:
             report_options = report_options_data['report_options']
             report_options_dict = report_options_data['report_options_dict']
 
+            option_pks = {}
+            for report_option in report_options:
+                option_pks.setdefault(report_option.content_type.model_class(), []).append(
+                    report_options_dict.get(report_option.pk)
+                )
+            option_objects = {
+                base_model: self.report_context.get_option_objects(base_model=base_model, pks=pks)
+                for base_model, pks in option_pks.items()
+            }
+
             for report_option in report_options:
                 base_model = report_option.content_type.model_class()
-                report_cls = get_report_builder_class(
+                report_cls = self.report_context.get_report_builder_class(
                     model=base_model, class_name=report_option.report_builder_class_name
                 )
-
-                _obj = base_model.objects.filter(pk=report_options_dict.get(report_option.pk)).first()
+                _obj = option_objects[base_model][report_options_dict.get(report_option.pk)]
                 if _obj is not None:
                     method = getattr(_obj, report_cls.option_label, None)
                     label = method() if callable(method) else _obj.__str__()
@@ -872,7 +890,11 @@ class FilterQueryMixin:
                     key = try_int(key)
                     report_options_dict[key] = try_int(v)
 
-            report_options = ReportOption.objects.filter(report=self.report, id__in=report_options_dict.keys())
+            report_options = [
+                report_option
+                for report_option in self.report_context.get_report_options(report=self.report)
+                if report_option.id in report_options_dict
+            ]
             self._report_options_data = {'report_options': report_options, 'report_options_dict': report_options_dict}
 
         return self._report_options_data
@@ -889,7 +911,7 @@ class FilterQueryMixin:
                 app_label, model, report_builder_fields_str = include['model'].split('.')
                 new_model = apps.get_model(app_label, model)
 
-                new_report_builder_class = get_report_builder_class(
+                new_report_builder_class = self.report_context.get_report_builder_class(
                     model=new_model, class_name=report_builder_fields_str
                 )
 
@@ -907,7 +929,7 @@ class FilterQueryMixin:
             if include is not None:
                 app_label, model, report_builder_fields_str = include['model'].split('.')
                 new_model = apps.get_model(app_label, model)
-                new_report_builder_class = get_report_builder_class(
+                new_report_builder_class = self.report_context.get_report_builder_class(
                     model=new_model, class_name=report_builder_fields_str
                 )
 
@@ -937,7 +959,7 @@ class FilterQueryMixin:
             if include is not None:
                 app_label, model, report_builder_fields_str = include['model'].split('.')
                 new_model = apps.get_model(app_label, model)
-                new_report_builder_class = get_report_builder_class(
+                new_report_builder_class = self.report_context.get_report_builder_class(
                     model=new_model, class_name=report_builder_fields_str
                 )
                 if new_model != previous_base_model:
@@ -959,5 +981,4 @@ class FilterQueryMixin:
         return None
 
     def get_financial_month(self):
-        month = getattr(settings, 'FINANCIAL_YEAR_START_MONTH', 1)
-        return month if 1 <= month <= 12 else 1
+        return self.report_context.financial_year_start_month
@@ -28,6 +28,11 @@ class RecordNavInclude(SourceBase):
     js_filename = 'record_nav.js'
 
 
+class ChartRefreshInclude(SourceBase):
+    static_path = 'advanced_report_builder/chart_refresh/'
+    js_filename = 'chart_refresh.js'
+
+
 class ChartJS(SourceBase):
     static_path = 'advanced_report_builder/chart-js/'
     js_filename = [
@@ -75,4 +80,5 @@ packages = {
     'dashboard': [DashboardInclude],
     'funnel': [D3, D3Funnel],
     'record_nav': [RecordNavInclude],
+    'chart_refresh': [ChartRefreshInclude],
 }
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('advanced_report_builder', '0031_multivaluereportcell_group_field_multivaluereportrow'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tablereport',
+            name='keyset_pagination',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('advanced_report_builder', '0032_tablereport_keyset_pagination'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tablereport',
+            name='estimated_count',
+            field=models.BooleanField(default=False),
+        ),
+    ]
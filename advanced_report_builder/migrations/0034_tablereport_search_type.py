@@ -0,0 +1,17 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('advanced_report_builder', '0033_tablereport_estimated_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tablereport',
+            name='search_type',
+            field=models.PositiveSmallIntegerField(
+                choices=[(1, 'Contains'), (2, 'Trigram indexed'), (3, 'Full text')], default=1
+            ),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.1.3 on 2026-10-19 19:23
+
+import advanced_report_builder.models
+import django.db.models.deletion
+import time_stamped_model.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('advanced_report_builder', '0034_tablereport_search_type'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WorkingDayCalendar',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', time_stamped_model.models.CreationDateTimeField(auto_now_add=True)),
+                ('modified', time_stamped_model.models.ModificationDateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=64, unique=True)),
+                ('exclude_weekdays', models.JSONField(default=advanced_report_builder.models.default_exclude_weekdays, help_text='The days of the week that are not worked, Sunday=1 to Saturday=7.')),
+            ],
+            options={
+                'get_latest_by': 'created',
+                'abstract': False,
+            },
+        ),
+        migrations.AddField(
+            model_name='multivaluereportcell',
+            name='working_day_calendar',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='advanced_report_builder.workingdaycalendar'),
+        ),
+        migrations.AddField(
+            model_name='singlevaluereport',
+            name='working_day_calendar',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='advanced_report_builder.workingdaycalendar'),
+        ),
+        migrations.CreateModel(
+            name='WorkingDayClosure',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', time_stamped_model.models.CreationDateTimeField(auto_now_add=True)),
+                ('modified', time_stamped_model.models.ModificationDateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=64)),
+                ('closure_type', models.PositiveSmallIntegerField(choices=[(1, 'Bank holiday'), (2, 'Closure')], default=1)),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField(blank=True, help_text='The last day of a closure lasting more than a day.', null=True)),
+                ('calendar', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='closures', to='advanced_report_builder.workingdaycalendar')),
+            ],
+            options={
+                'ordering': ['start_date'],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-19 19:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('advanced_report_builder', '0035_working_day_calendars'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='linechartreport',
+            name='max_points',
+            field=models.PositiveIntegerField(blank=True, help_text='Downsample each line to about this many points, keeping its peaks. Leave blank to draw them all.', null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-19 19:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('advanced_report_builder', '0036_linechartreport_max_points'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='kanbanreportlane',
+            name='card_limit',
+            field=models.PositiveIntegerField(blank=True, help_text='The cards shown before "Load more", each load showing this many more. Leave blank to show them all.', null=True),
+        ),
+    ]
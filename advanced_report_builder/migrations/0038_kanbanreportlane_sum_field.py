@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-19 19:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('advanced_report_builder', '0037_kanbanreportlane_card_limit'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='kanbanreportlane',
+            name='sum_field',
+            field=models.CharField(blank=True, help_text='A number field totalled for the lane in its heading.', max_length=200, null=True),
+        ),
+    ]
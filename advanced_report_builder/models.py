@@ -1,8 +1,13 @@
+from functools import lru_cache
+
 from django.apps import apps
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.forms import ChoiceField
+from django.utils import timezone
 from django.utils.dates import MONTHS
 from django_datatables.columns import DatatableColumn, ManyToManyColumn
 from django_datatables.model_def import DatatableModel
@@ -29,6 +34,7 @@ from advanced_report_builder.globals import (
     PeriodType,
 )
 from advanced_report_builder.signals import model_report_save
+from advanced_report_builder.working_days import get_calendar_index
 
 
 class Target(TimeStampedModel):
@@ -128,6 +134,52 @@ class TargetColour(TimeStampedModel):
         return f'≤ {self.percentage}%'
 
 
+def default_exclude_weekdays():
+    return [1, 7]
+
+
+class WorkingDayCalendar(TimeStampedModel):
+    name = models.CharField(max_length=64, unique=True)
+    # Django's week_day numbering, Sunday=1 to Saturday=7
+    exclude_weekdays = models.JSONField(
+        default=default_exclude_weekdays, help_text='The days of the week that are not worked, Sunday=1 to Saturday=7.'
+    )
+
+    def __str__(self):
+        return self.name
+
+    def get_index(self):
+        return get_calendar_index(self.pk, self.modified)
+
+
+class WorkingDayClosure(TimeStampedModel):
+    class ClosureType(models.IntegerChoices):
+        BANK_HOLIDAY = 1, 'Bank holiday'
+        CLOSURE = 2, 'Closure'
+
+    calendar = models.ForeignKey(WorkingDayCalendar, on_delete=models.CASCADE, related_name='closures')
+    name = models.CharField(max_length=64)
+    closure_type = models.PositiveSmallIntegerField(choices=ClosureType.choices, default=ClosureType.BANK_HOLIDAY)
+    start_date = models.DateField()
+    end_date = models.DateField(blank=True, null=True, help_text='The last day of a closure lasting more than a day.')
+
+    class Meta:
+        ordering = ['start_date']
+
+    def __str__(self):
+        return self.name
+
+
+@receiver((post_save, post_delete), sender=WorkingDayClosure)
+def touch_working_day_calendar(instance, **_kwargs):
+    """Updates the calendar's modified time, which rebuilds its working day index.
+
+    post_delete is also sent for each closure a queryset delete removes, such as the admin's delete selected. Closures
+    changed with QuerySet.update() or bulk_create send neither, so save their calendar afterwards.
+    """
+    WorkingDayCalendar.objects.filter(pk=instance.calendar_id).update(modified=timezone.now())
+
+
 class ReportTag(TimeStampedModel):
     name = models.CharField(max_length=128, unique=True)
     slug = models.SlugField(unique=True)
@@ -165,17 +217,23 @@ class ReportType(TimeStampedModel):
 class Report(TimeStampedModel):
     report_type_label = 'N/A'
     report_type_icon = '<i class="far fa-file"></i>'
+    # lookups prefetched when the child reports are bulk loaded by prefetch_child_reports
+    child_prefetch_related = ()
 
-    def get_child_model_class(self):
+    @staticmethod
+    @lru_cache
+    def get_model_class_from_instance_type(instance_type):
+        if instance_type is None:
+            return None
         try:
-            if '.' in self.instance_type:
-                model = apps.get_model(*self.instance_type.split('.'))
-            else:
-                model = apps.get_model('advanced_report_builder', self.instance_type)
+            if '.' in instance_type:
+                return apps.get_model(*instance_type.split('.'))
+            return apps.get_model('advanced_report_builder', instance_type)
         except LookupError:
             return None
 
-        return model()
+    def get_child_model_class(self):
+        return self.get_model_class_from_instance_type(self.instance_type)
 
     def get_output_type_name(self):
         child_model_class = self.get_child_model_class()
@@ -222,7 +280,7 @@ class Report(TimeStampedModel):
         ordering = ['name']
 
     def get_report(self):
-        return getattr(self, self.instance_type)
+        return getattr(self, self.instance_type.split('.')[-1])
 
     def get_title(self):
         return self.name
@@ -319,6 +377,32 @@ class Report(TimeStampedModel):
         )
 
 
+def prefetch_child_reports(reports):
+    """Attaches the concrete child report to each report so get_report() doesn't need a query per report.
+    Reports are grouped by instance_type and each group is loaded with a single query."""
+    reports_by_type = {}
+    for report in reports:
+        model = report.get_child_model_class()
+        if model is None or model is Report:
+            continue
+        accessor_name = model._meta.model_name
+        if Report._meta.get_field(accessor_name).is_cached(report):
+            continue
+        reports_by_type.setdefault(model, []).append(report)
+
+    for model, type_reports in reports_by_type.items():
+        child_reports = model.objects.filter(pk__in=[report.pk for report in type_reports])
+        child_reports = child_reports.select_related('report_type__content_type')
+        if model.child_prefetch_related:
+            child_reports = child_reports.prefetch_related(*model.child_prefetch_related)
+        child_reports = {child_report.pk: child_report for child_report in child_reports}
+        accessor_name = model._meta.model_name
+        for report in type_reports:
+            child_report = child_reports.get(report.pk)
+            if child_report is not None:
+                setattr(report, accessor_name, child_report)
+
+
 class ReportOption(TimeStampedModel):
     report = models.ForeignKey(Report, on_delete=models.CASCADE)
     slug = models.SlugField()
@@ -406,6 +490,23 @@ class TableReport(Report):
     # query / version) without going into the report-edit flow.
     allow_new_version = models.BooleanField(default=False)
 
+    # Pages on the server. When ordered by an indexed field each page seeks from the previous page's last row
+    # rather than using an OFFSET, so deep pages of large tables stay fast.
+    keyset_pagination = models.BooleanField(default=False)
+
+    # With keyset pagination, shows the database's estimate of the number of rows once it reaches
+    # REPORT_BUILDER_ESTIMATED_COUNT_THRESHOLD, rather than counting every row on each page.
+    estimated_count = models.BooleanField(default=False)
+
+    class SearchType(models.IntegerChoices):
+        CONTAINS = 1, 'Contains'
+        TRIGRAM = 2, 'Trigram indexed'
+        FULL_TEXT = 3, 'Full text'
+
+    # With keyset pagination, how the search box matches rows. Trigram and full text only search the text columns
+    # and are meant to be used with the indexes from advanced_report_builder.search.search_index_operations.
+    search_type = models.PositiveSmallIntegerField(choices=SearchType.choices, default=SearchType.CONTAINS)
+
 
 class SingleValueReport(Report):
     report_type_label = 'Single Value'
@@ -444,6 +545,8 @@ class SingleValueReport(Report):
     average_scale = models.PositiveSmallIntegerField(choices=ANNOTATION_VALUE_CHOICES, blank=True, null=True)
     average_start_period = models.PositiveSmallIntegerField(blank=True, null=True)
     average_end_period = models.PositiveSmallIntegerField(blank=True, null=True)
+    # the working days for an average over time excluding weekends, rather than Monday to Friday
+    working_day_calendar = models.ForeignKey(WorkingDayCalendar, on_delete=models.SET_NULL, blank=True, null=True)
 
     def is_percentage(self):
         return self.SingleValueType.is_percentage(self.single_value_type)
@@ -500,6 +603,7 @@ class BarChartReport(Report):
 class LineChartReport(Report):
     report_type_label = 'Line Chart'
     report_type_icon = '<i class="fas fa-chart-line"></i>'
+    child_prefetch_related = ('targets',)
 
     axis_scale = models.PositiveSmallIntegerField(choices=ANNOTATION_VALUE_CHOICES)
     date_field = models.CharField(max_length=200)
@@ -513,6 +617,11 @@ class LineChartReport(Report):
     x_label = models.CharField(max_length=200, blank=True, null=True)
     y_label = models.CharField(max_length=200, blank=True, null=True)
     show_totals = models.BooleanField(default=False)
+    max_points = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text='Downsample each line to about this many points, keeping its peaks. Leave blank to draw them all.',
+    )
 
     has_targets = models.BooleanField(default=False)
     targets = models.ManyToManyField(Target, blank=True)
@@ -558,6 +667,7 @@ class FunnelChartReport(Report):
 class KanbanReport(Report):
     report_type_label = 'Kanban Report'
     report_type_icon = '<i class="fas fa-chart-bar fa-flip-vertical"></i>'
+    child_prefetch_related = ('kanbanreportlane_set',)
 
     def show_dashboard_query(self):
         return False  # show queries if true
@@ -614,6 +724,14 @@ class KanbanReportLane(TimeStampedModel):
     link_field = models.CharField(max_length=200, blank=True, null=True)
     order_by_field = models.CharField(max_length=200, blank=True, null=True)
     order_by_ascending = models.BooleanField(default=True)
+    card_limit = models.PositiveIntegerField(
+        blank=True,
+        null=True,
+        help_text='The cards shown before "Load more", each load showing this many more. Leave blank to show them all.',
+    )
+    sum_field = models.CharField(
+        max_length=200, blank=True, null=True, help_text='A number field totalled for the lane in its heading.'
+    )
     kanban_report_description = models.ForeignKey(
         KanbanReportDescription, null=True, blank=False, on_delete=models.CASCADE
     )
@@ -648,6 +766,7 @@ class KanbanReportLane(TimeStampedModel):
 class MultiValueReport(Report):
     report_type_label = 'Multi Values'
     report_type_icon = '<i class="fas fa-grip-horizontal"></i>'
+    child_prefetch_related = ('multivaluereportrow_set', 'multivaluereportcolumn_set')
 
     rows = models.PositiveSmallIntegerField()
     columns = models.PositiveSmallIntegerField()
@@ -802,6 +921,7 @@ class MultiValueReportCell(TimeStampedModel):
     average_scale = models.PositiveSmallIntegerField(choices=ANNOTATION_VALUE_CHOICES, blank=True, null=True)
     average_start_period = models.PositiveSmallIntegerField(blank=True, null=True)
     average_end_period = models.PositiveSmallIntegerField(blank=True, null=True)
+    working_day_calendar = models.ForeignKey(WorkingDayCalendar, on_delete=models.SET_NULL, blank=True, null=True)
     label = models.CharField(max_length=256, blank=True, null=True)
 
     multi_value_held_query = models.ForeignKey('MultiValueHeldQuery', on_delete=models.SET_NULL, null=True, blank=True)
@@ -826,6 +946,7 @@ class MultiValueReportCell(TimeStampedModel):
 class CalendarReport(Report):
     report_type_label = 'Calendar'
     report_type_icon = '<i class="fas fa-calendar"></i>'
+    child_prefetch_related = ('calendarreportdataset_set',)
 
     VIEW_TYPE_CODES = {
         CALENDAR_VIEW_TYPE_MONTH: 'dayGridMonth',
@@ -971,6 +1092,20 @@ class Dashboard(TimeStampedModel):
         return super().save(*args, **kwargs)
 
 
+class DashboardReportQuerySet(models.QuerySet):
+    def with_report_data(self):
+        """Loads everything needed to render the dashboard pods up front rather than lazily per pod."""
+        return self.select_related(
+            'dashboard',
+            'report',
+            'report__report_type__content_type',
+            'report_query',
+        ).prefetch_related(
+            'report__reportquery_set__target',
+            'report__reportoption_set__content_type',
+        )
+
+
 class DashboardReport(TimeStampedModel):
     dashboard = models.ForeignKey(Dashboard, on_delete=models.CASCADE)
     order = models.PositiveSmallIntegerField()
@@ -984,6 +1119,8 @@ class DashboardReport(TimeStampedModel):
     show_options = models.BooleanField(default=True)
     options = models.JSONField(null=True, blank=True)
 
+    objects = DashboardReportQuerySet.as_manager()
+
     def get_class(self, extra_class_name=None):
         if self.display_option != DisplayOption.NONE:
             display_value = self.display_option
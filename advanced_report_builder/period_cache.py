@@ -0,0 +1,147 @@
+import hashlib
+import math
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db import connections
+from django.db.models import DateTimeField, Q
+from django.utils import timezone
+
+from advanced_report_builder.globals import (
+    ANNOTATION_VALUE_DAY,
+    ANNOTATION_VALUE_MONTH,
+    ANNOTATION_VALUE_QUARTER,
+    ANNOTATION_VALUE_WEEK,
+    ANNOTATION_VALUE_YEAR,
+)
+
+CACHE_PREFIX = 'advanced_report_builder:period_buckets'
+
+
+def get_period_cache_timeout():
+    """Returns the seconds closed periods are kept for, None to keep them until invalidated, or 0 when off."""
+    return getattr(settings, 'REPORT_BUILDER_PERIOD_CACHE_TIMEOUT', 0)
+
+
+def get_seconds_to_tomorrow():
+    """Returns the seconds until the next day starts, when variable dates move on."""
+    now = datetime.now()
+    tomorrow = datetime.combine(now.date() + timedelta(days=1), time.min)
+    return max(1, math.ceil((tomorrow - now).total_seconds()))
+
+
+def get_period_start(day, axis_scale):
+    """Returns the first day of the year, quarter, month, week or day holding day, as the Trunc functions do."""
+    if axis_scale == ANNOTATION_VALUE_YEAR:
+        return day.replace(month=1, day=1)
+    if axis_scale == ANNOTATION_VALUE_QUARTER:
+        return day.replace(month=3 * ((day.month - 1) // 3) + 1, day=1)
+    if axis_scale == ANNOTATION_VALUE_MONTH:
+        return day.replace(day=1)
+    if axis_scale == ANNOTATION_VALUE_WEEK:
+        return day - timedelta(days=day.weekday())
+    if axis_scale == ANNOTATION_VALUE_DAY:
+        return day
+    raise AssertionError('unknown axis scale')
+
+
+def get_period_boundary(day, django_field):
+    """Returns the value to compare django_field with for the start of day, midnight for a DateTimeField."""
+    if isinstance(django_field, DateTimeField):
+        boundary = datetime.combine(day, time.min)
+        return timezone.make_aware(boundary) if settings.USE_TZ else boundary
+    return day
+
+
+def _version_key(report_id):
+    return f'{CACHE_PREFIX}:version:{report_id}'
+
+
+def invalidate_period_cache(report_id=None):
+    """Drops the closed periods kept for the report, or for every report when report_id is None.
+
+    Call this when rows are added or changed in periods that have already closed, such as an import of old data.
+    """
+    key = _version_key(report_id)
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+class PeriodBucketCache:
+    """Keeps a chart's rows for the periods that have closed, so each render only queries the periods still open.
+
+    A period is closed once it ended more than REPORT_BUILDER_PERIOD_CACHE_LATE_DAYS ago. The closed rows are kept
+    per report and per SQL of the chart's query, so changing the report or its filters starts again. A filter on a
+    variable date changes the SQL each day, so those rows are only kept until the end of the day.
+    """
+
+    def __init__(self, report_id, date_field, django_field, bucket_field, axis_scale, today):
+        self.report_id = report_id
+        self.date_field = date_field
+        self.bucket_field = bucket_field
+        self.django_field = django_field
+        self.axis_scale = axis_scale
+        late_days = getattr(settings, 'REPORT_BUILDER_PERIOD_CACHE_LATE_DAYS', 1)
+        self.closed_before = get_period_start(today - timedelta(days=late_days), axis_scale)
+
+    def get_cache_key(self, query):
+        try:
+            sql, params = query.query.sql_with_params()
+        except EmptyResultSet:
+            return None
+        versions = cache.get_many([_version_key(None), _version_key(self.report_id)])
+        key = hashlib.md5(
+            f'{self.axis_scale}|{self.date_field}|{versions!r}|{sql}|{params!r}'.encode(),
+        ).hexdigest()
+        return f'{CACHE_PREFIX}:{self.report_id}:{key}'
+
+    def get_boundary(self, day):
+        return get_period_boundary(day, self.django_field)
+
+    def before(self, query, day):
+        return query.filter(**{f'{self.date_field}__lt': self.get_boundary(day)})
+
+    def get_results(self, query, uses_variable_dates=False):
+        """Returns the rows of the query, with the closed periods' rows from the cache where possible.
+
+        With uses_variable_dates the query's SQL changes tomorrow, so its rows are not kept past today.
+        """
+        cache_key = self.get_cache_key(query)
+        if cache_key is None:
+            return list(query)
+        # rows without a date are in no period, so are always fetched with the open periods
+        open_query = query.filter(
+            Q(**{f'{self.date_field}__gte': self.get_boundary(self.closed_before)})
+            | Q(**{f'{self.date_field}__isnull': True})
+        )
+
+        held = cache.get(cache_key)
+        if held is not None and held['closed_before'] <= self.closed_before:
+            closed_rows = held['rows']
+            if held['closed_before'] < self.closed_before:
+                # periods closed since the rows were kept
+                closed_rows = closed_rows + list(
+                    self.before(query, self.closed_before).filter(
+                        **{f'{self.date_field}__gte': self.get_boundary(held['closed_before'])}
+                    )
+                )
+        else:
+            closed_rows = list(self.before(query, self.closed_before))
+        if held is None or held['closed_before'] != self.closed_before:
+            timeout = get_period_cache_timeout()
+            if uses_variable_dates:
+                timeout = get_seconds_to_tomorrow() if timeout is None else min(timeout, get_seconds_to_tomorrow())
+            cache.set(cache_key, {'closed_before': self.closed_before, 'rows': closed_rows}, timeout)
+
+        open_rows = []
+        undated_rows = []
+        for row in open_query:
+            (open_rows if row[self.bucket_field] is not None else undated_rows).append(row)
+        if connections[query.db].features.nulls_order_largest:
+            return closed_rows + open_rows + undated_rows
+        return undated_rows + closed_rows + open_rows
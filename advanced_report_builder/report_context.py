@@ -0,0 +1,102 @@
+import datetime
+
+from django.conf import settings
+from django.shortcuts import get_object_or_404
+
+from advanced_report_builder.models import ReportQuery
+from advanced_report_builder.variable_date import lookup_variable_dates
+
+REPORT_CONTEXT_ATTRIBUTE = '_report_builder_context'
+
+
+class ReportContext:
+    """Resolves the per-report lookups needed to render a request once.
+
+    A context is created when a report or dashboard view is dispatched and is shared by every view
+    rendered for that request, so dashboard pods reuse the same report queries, option objects,
+    report builder classes and variable date windows rather than each pod fetching its own.
+    """
+
+    def __init__(self, today=None):
+        self.today = today if today is not None else datetime.date.today()
+        self.financial_year_start_month = self._get_financial_year_start_month()
+        self._report_queries = {}
+        self._selected_report_queries = {}
+        self._report_options = {}
+        self._option_objects = {}
+        self._report_builder_classes = {}
+
+    @staticmethod
+    def _get_financial_year_start_month():
+        month = getattr(settings, 'FINANCIAL_YEAR_START_MONTH', 1)
+        return month if 1 <= month <= 12 else 1
+
+    def get_report_queries(self, report):
+        if report.pk not in self._report_queries:
+            self._report_queries[report.pk] = list(report.reportquery_set.all())
+        return self._report_queries[report.pk]
+
+    def get_report_query(self, report, dashboard_report, query_id):
+        key = (report.pk, dashboard_report.pk if dashboard_report is not None else None, query_id)
+        if key not in self._selected_report_queries:
+            if query_id:
+                report_query = next((q for q in self.get_report_queries(report) if str(q.pk) == str(query_id)), None)
+                if report_query is None:
+                    report_query = get_object_or_404(ReportQuery, id=query_id)
+                    if report_query.report_id != report.pk:
+                        report_query = None
+            elif dashboard_report is not None and dashboard_report.report_query_id is not None:
+                report_query = dashboard_report.report_query
+            else:
+                report_queries = self.get_report_queries(report)
+                report_query = report_queries[0] if report_queries else None
+            self._selected_report_queries[key] = report_query
+        return self._selected_report_queries[key]
+
+    def get_report_options(self, report):
+        if report.pk not in self._report_options:
+            if 'reportoption_set' in getattr(report, '_prefetched_objects_cache', {}):
+                report_options = report.reportoption_set.all()
+            else:
+                report_options = report.reportoption_set.select_related('content_type')
+            self._report_options[report.pk] = list(report_options)
+        return self._report_options[report.pk]
+
+    def get_option_objects(self, base_model, pks):
+        """Returns a dict of pk to object, fetching any pks not already held in a single query per model."""
+        held = self._option_objects.setdefault(base_model, {})
+        missing = {pk for pk in pks if pk not in held}
+        if missing:
+            found = {obj.pk: obj for obj in base_model.objects.filter(pk__in=missing)}
+            for pk in missing:
+                held[pk] = found.get(pk)
+        return {pk: held[pk] for pk in pks}
+
+    def get_report_builder_class(self, model, report_type=None, class_name=None):
+        if class_name is None:
+            class_name = report_type.report_builder_class_name
+        key = (model, class_name)
+        if key not in self._report_builder_classes:
+            report_builder_class = getattr(model, class_name, None)
+            if report_builder_class is not None:
+                report_builder_class = report_builder_class()
+            self._report_builder_classes[key] = report_builder_class
+        return self._report_builder_classes[key]
+
+    def get_variable_dates(self, range_type, financial_year_start_month=None):
+        if financial_year_start_month is None:
+            financial_year_start_month = self.financial_year_start_month
+        return lookup_variable_dates(
+            range_type=range_type, financial_year_start_month=financial_year_start_month, today=self.today
+        )
+
+
+def get_report_context(request):
+    """Returns the ReportContext for the request, creating one if the request does not have one yet."""
+    if request is None:
+        return ReportContext()
+    report_context = getattr(request, REPORT_CONTEXT_ATTRIBUTE, None)
+    if report_context is None:
+        report_context = ReportContext()
+        setattr(request, REPORT_CONTEXT_ATTRIBUTE, report_context)
+    return report_context
@@ -0,0 +1,116 @@
+from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.operations import TrigramExtension
+from django.contrib.postgres.search import SearchQuery, SearchVector
+from django.core.exceptions import FieldDoesNotExist
+from django.db import migrations, models
+from django.db.backends.utils import names_digest, truncate_name
+from django.db.models import Q, TextField
+from django.db.models.functions import Cast, Upper
+
+from advanced_report_builder.models import TableReport
+
+
+def get_search_config():
+    return getattr(settings, 'REPORT_BUILDER_FULL_TEXT_SEARCH_CONFIG', 'english')
+
+
+def get_text_field(model, path):
+    """Returns the CharField or TextField at the end of the __ path from model, or None."""
+    field = None
+    for part in path.split('__'):
+        if field is not None:
+            if not field.is_relation or field.related_model is None:
+                return None
+            model = field.related_model
+        try:
+            field = model._meta.get_field(part)
+        except FieldDoesNotExist:
+            return None
+    if isinstance(field, (models.CharField, models.TextField)):
+        return field
+    return None
+
+
+def get_search_paths(table, exclude_fields=()):
+    """Returns the paths of the table's text columns for a trigram or full text search."""
+    paths = []
+    for column in table.columns:
+        if column.column_name in exclude_fields:
+            continue
+        for path in column._search_paths():
+            if path not in paths and path not in exclude_fields and get_text_field(table.model, path) is not None:
+                paths.append(path)
+    return paths
+
+
+def search_queryset(queryset, paths, value, search_type):
+    """Filters the queryset to the rows where any of paths matches value.
+
+    TRIGRAM keeps the case insensitive contains match. It is the text columns only, so the
+    UPPER(column::text) LIKE the database runs can use the indexes from search_index_operations.
+
+    FULL_TEXT matches whole words in a tsvector of the columns, using the websearch syntax
+    ("quoted phrases", or, -word).
+    """
+    if search_type == TableReport.SearchType.FULL_TEXT:
+        config = get_search_config()
+        return queryset.alias(_report_search=SearchVector(*paths, config=config)).filter(
+            _report_search=SearchQuery(value, config=config, search_type='websearch')
+        )
+    q = Q()
+    for path in paths:
+        q |= Q(**{f'{path}__icontains': value})
+    return queryset.filter(q)
+
+
+def get_search_indexes(model, field_names, search_type, connection):
+    """Returns GIN indexes matching the SQL search_queryset runs for the model's field_names."""
+    digest = names_digest(*field_names, length=6)
+    if search_type == TableReport.SearchType.FULL_TEXT:
+        expressions = [('tsv', SearchVector(*field_names, config=get_search_config()))]
+    else:
+        expressions = [
+            (f'{field_name}_trgm', OpClass(Upper(Cast(field_name, output_field=TextField())), name='gin_trgm_ops'))
+            for field_name in field_names
+        ]
+    return [
+        GinIndex(
+            expression,
+            name=truncate_name(f'{model._meta.db_table}_{suffix}_{digest}', connection.ops.max_name_length()),
+        )
+        for suffix, expression in expressions
+    ]
+
+
+def search_index_operations(
+    app_label, model_name, field_names, search_type=TableReport.SearchType.TRIGRAM, concurrently=False
+):
+    """Returns migration operations creating the indexes for a trigram or full text search of the model.
+
+    Only runs on PostgreSQL, and leaves the model's state alone so the indexes are not part of its Meta.
+    With concurrently=True the migration has to be non atomic.
+    """
+
+    def get_indexes(apps, schema_editor):
+        model = apps.get_model(app_label, model_name)
+        return model, get_search_indexes(model, field_names, search_type, schema_editor.connection)
+
+    def create_indexes(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        model, indexes = get_indexes(apps, schema_editor)
+        for index in indexes:
+            schema_editor.add_index(model, index, concurrently=concurrently)
+
+    def remove_indexes(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        model, indexes = get_indexes(apps, schema_editor)
+        for index in indexes:
+            schema_editor.remove_index(model, index, concurrently=concurrently)
+
+    operations = [migrations.RunPython(create_indexes, remove_indexes)]
+    if search_type == TableReport.SearchType.TRIGRAM:
+        operations.insert(0, TrigramExtension())
+    return operations
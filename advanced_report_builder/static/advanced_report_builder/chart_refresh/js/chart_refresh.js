@@ -0,0 +1,81 @@
+// Keeps a bar or line chart's table up to date from its data URL.
+// Each poll sends the last period the chart holds as since, so only that period and any after it are returned,
+// and those rows replace the chart's rows from since on. A reply without since holds every row.
+var advanced_report_builder_chart_refresh = function (table, options) {
+    var etag = null;
+
+    function last_label() {
+        if (table.data.length === 0) {
+            return null;
+        }
+        return table.data[table.data.length - 1][0];
+    }
+
+    function merge_targets(targets, since_index) {
+        for (var i = 0; i < targets.length; i++) {
+            var held = table.targets[i];
+            if (held === undefined) {
+                table.targets.push(targets[i]);
+                continue;
+            }
+            held.data = held.data.slice(0, since_index).concat(targets[i].data);
+            held.backgroundColor = held.backgroundColor.slice(0, since_index).concat(targets[i].backgroundColor);
+        }
+    }
+
+    function merge(chart_data) {
+        var labels = chart_data.labels || [];
+        var rows = [];
+        for (var j = 0; j < labels.length; j++) {
+            var row = [labels[j]];
+            for (var i = 0; i < chart_data.series.length; i++) {
+                row.push(chart_data.series[i].data[j]);
+            }
+            rows.push(row);
+        }
+        if (chart_data.since === undefined) {
+            table.data = rows;
+            table.targets = chart_data.targets || [];
+            return;
+        }
+        var since_index = table.data.length;
+        while (since_index > 0 && table.data[since_index - 1][0] >= chart_data.since) {
+            since_index--;
+        }
+        table.data = table.data.slice(0, since_index).concat(rows);
+        merge_targets(chart_data.targets || [], since_index);
+    }
+
+    function poll() {
+        if (options.canvas && !document.body.contains(options.canvas)) {
+            // the pod has been redrawn or removed
+            return;
+        }
+        var url = options.url;
+        var since = last_label();
+        if (since !== null) {
+            url += (url.indexOf('?') === -1 ? '?' : '&') + 'since=' + encodeURIComponent(since);
+        }
+        var headers = {'X-Requested-With': 'XMLHttpRequest'};
+        if (etag !== null) {
+            headers['If-None-Match'] = etag;
+        }
+        fetch(url, {credentials: 'same-origin', headers: headers}).then(function (response) {
+            if (response.status !== 200) {
+                return null;
+            }
+            etag = response.headers.get('ETag');
+            return response.json();
+        }).then(function (chart_data) {
+            if (chart_data) {
+                merge(chart_data);
+                options.redraw();
+            }
+        }).catch(function () {
+        }).then(function () {
+            setTimeout(poll, options.seconds * 1000);
+        });
+    }
+
+    setTimeout(poll, options.seconds * 1000);
+};
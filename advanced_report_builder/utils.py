@@ -1,11 +1,13 @@
 import base64
-from datetime import date, timedelta
+from datetime import date
 
 from crispy_forms.layout import HTML, Div
 from django.conf import settings
 from django.utils.module_loading import import_string
 from django_modals.helper import show_modal
 
+from advanced_report_builder.working_days import WorkingDayIndex
+
 
 def split_attr(data):
     if 'data_attr' not in data:
@@ -113,20 +115,7 @@ def get_query_js(button_name, field_id):
 def count_days(
     start_date: date, end_date: date, exclude_weekdays: list[int] = None, exclude_dates: list[date] = None
 ) -> int:
-    if start_date > end_date:
-        start_date, end_date = end_date, start_date
-
-    exclude_weekdays = set(exclude_weekdays or [])
-    exclude_dates = set(exclude_dates or [])
-
-    current = start_date
-    count = 0
-    while current < end_date:
-        weekday = ((current.weekday() + 1) % 7) + 1  # Django-style Sunday=1
-        if weekday not in exclude_weekdays and current not in exclude_dates:
-            count += 1
-        current += timedelta(days=1)
-    return count
+    return WorkingDayIndex(exclude_weekdays=exclude_weekdays, exclude_dates=exclude_dates).count(start_date, end_date)
 
 
 def excel_column_name(n: int, row: int | None = None) -> str:
@@ -1,6 +1,8 @@
 import calendar
 from calendar import monthrange
 from datetime import date, datetime, timedelta
+from functools import lru_cache
+from types import MappingProxyType
 
 from date_offset.date_offset import DateOffset
 from dateutil.relativedelta import relativedelta
@@ -201,8 +203,9 @@ class VariableDate:
         (RANGE_TYPE_NEXT_CALENDAR_YEAR_Q4, 'Next calendar year Q4'),
     )
 
-    def get_variable_dates(self, range_type, financial_year_start_month=1):  # financial_year_start_month 1=jan
-        today = date.today()
+    def get_variable_dates(self, range_type, financial_year_start_month=1, today=None):  # 1=jan
+        if today is None:
+            today = date.today()
         start_of_this_week = today - timedelta(days=today.weekday())
         number_of_days = None
         if range_type == self.RANGE_TYPE_TODAY:
@@ -329,8 +332,7 @@ class VariableDate:
             last_year = today.year - 1
             start_date = date(last_year, 1, 1)
             end_date = date(last_year, 12, 31)
-
-        elif range_type == self.RANGE_TYPE_LAST_CALENDAR_YEAR:  # Last Year
+        elif range_type == self.RANGE_TYPE_NEXT_CALENDAR_YEAR:  # Next Year
             next_year = today.year + 1
             start_date = date(next_year, 1, 1)
             end_date = date(next_year, 12, 31)
@@ -675,3 +677,33 @@ class VariableDate:
         """
         fy_start_date = date(year, 1, 1)
         return self._get_financial_quarter_bounds(fy_start_date, quarter)
+
+
+@lru_cache(maxsize=32)
+def get_variable_date_table(today, financial_year_start_month=1):
+    """Returns every range type's (start, end, number of days) for the day and financial year start month.
+
+    Built once per day and financial year start month in each process. The mapping is read only as it is shared.
+    """
+    variable_date = VariableDate()
+    return MappingProxyType(
+        {
+            range_type: variable_date.get_variable_dates(
+                range_type=range_type, financial_year_start_month=financial_year_start_month, today=today
+            )
+            for range_type, _ in VariableDate.RANGE_TYPE_CHOICES
+        }
+    )
+
+
+def lookup_variable_dates(range_type, financial_year_start_month=1, today=None):
+    """Returns the same as VariableDate().get_variable_dates from the table for the day."""
+    if today is None:
+        today = date.today()
+    dates = get_variable_date_table(today, financial_year_start_month).get(int(range_type))
+    if dates is None:
+        # not a range type, so raises as get_variable_dates does
+        dates = VariableDate().get_variable_dates(
+            range_type=int(range_type), financial_year_start_month=financial_year_start_month, today=today
+        )
+    return dates
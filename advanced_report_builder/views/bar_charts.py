@@ -13,7 +13,6 @@ from django.db.models import Q
 from django.forms import BooleanField, CharField, ChoiceField
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
-from django_datatables.datatables import DatatableTable
 from django_menus.menu import MenuItem
 from django_modals.fields import FieldEx
 from django_modals.form_helpers import HorizontalNoEnterHelper
@@ -46,6 +45,7 @@ from advanced_report_builder.utils import (
     get_report_builder_class,
     split_attr,
 )
+from advanced_report_builder.views.breakdown import BreakdownModalMixin
 from advanced_report_builder.views.charts_base import ChartBaseFieldForm, ChartBaseView
 from advanced_report_builder.views.datatables.modal import (
     TableFieldForm,
@@ -60,6 +60,9 @@ from advanced_report_builder.views.query_modal.mixin import MultiQueryModalMixin
 
 
 class BarChartView(ChartBaseView):
+    cache_closed_periods = True
+    refreshes_itself = True
+
     def dispatch(self, request, *args, **kwargs):
         self.report = kwargs.get('report')
         self.chart_report = self.report.barchartreport
@@ -138,7 +141,9 @@ class BarChartView(ChartBaseView):
         if start_field_name is None or end_field_name is None:
             return
 
-        report_builder_class = get_report_builder_class(model=base_model, report_type=self.chart_report.report_type)
+        report_builder_class = self.report_context.get_report_builder_class(
+            model=base_model, report_type=self.chart_report.report_type
+        )
 
         start_django_field, start_col_type_override, _, _ = self.get_field_details(
             base_model=base_model,
@@ -607,7 +612,7 @@ class BarChartBreakdownFieldModal(TableFieldModal):
     update_selection_command = 'breakdown_update_selection'
 
 
-class BarChartShowBreakdownModal(TableUtilsMixin, Modal):
+class BarChartShowBreakdownModal(BreakdownModalMixin, TableUtilsMixin, Modal):
     button_container_class = 'text-center'
     size = 'xl'
 
@@ -633,9 +638,6 @@ class BarChartShowBreakdownModal(TableUtilsMixin, Modal):
         date_title = self.get_date_title()
         return f'{bar_chart_report.name} - {title} - {date_title}'
 
-    def add_table(self, base_model):
-        return DatatableTable(view=self, model=base_model)
-
     def setup_table(self):
         bar_chart_report = self.get_bar_chart_report()
         self.chart_report = bar_chart_report
@@ -693,7 +695,6 @@ class BarChartShowBreakdownModal(TableUtilsMixin, Modal):
 
         table.extra_filters = self.extra_filters
 
-        table.ajax_data = False
         table.table_options['pageLength'] = 25
         table.table_options['bStateSave'] = False
         if bar_chart_report.record_nav:
@@ -0,0 +1,117 @@
+import csv
+import io
+from itertools import islice
+
+from ajax_helpers.utils import ajax_command
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.html import strip_tags
+from django.utils.text import slugify
+from django_modals.helper import modal_button
+
+from advanced_report_builder.views.datatables.keyset import KeysetTable
+
+
+class BreakdownTable(KeysetTable):
+    """Server side table of the records behind a chart or value.
+
+    With row_cap set only the first row_cap rows can be paged through: pages are fetched with an OFFSET that stops at
+    row_cap, and the count stops once it gets past row_cap rather than counting every row.
+    """
+
+    row_cap = None
+
+    def get_seek_descending(self, ordering):
+        # a seek could run past the cap, and the cap keeps the offsets short
+        if self.row_cap is not None:
+            return None
+        return super().get_seek_descending(ordering)
+
+    def get_page(self, queryset, start, length):
+        if self.row_cap is not None:
+            length = min(length, self.row_cap - start)
+            if length <= 0:
+                return []
+        return super().get_page(queryset=queryset, start=start, length=length)
+
+    def get_count(self, queryset, post_data):
+        if self.row_cap is None:
+            return super().get_count(queryset=queryset, post_data=post_data)
+        count = queryset[: self.row_cap + 1].count()
+        capped = count > self.row_cap
+        # the filtered count comes last, so its warning is the one left showing
+        self.ajax_commands.append(
+            ajax_command(
+                'html',
+                selector=f'#{self.table_id}-above',
+                html=(
+                    f'<div class="alert alert-warning"><b>Not all results shown.</b> Limited to {self.row_cap} rows, '
+                    f'use Export all for the rest.</div>'
+                    if capped
+                    else ''
+                ),
+            )
+        )
+        return min(count, self.row_cap), False
+
+
+class BreakdownModalMixin:
+    """Breakdown modal whose table is paged on the server by posting back to the modal's url.
+
+    The modal's setup_table builds the table for both the page and each draw, so the draws are filtered by the same
+    extra_filters. Export all downloads every row as a CSV file, streamed from a GET of the modal's url with
+    export=csv.
+    """
+
+    breakdown_table_id = 'breakdown'
+    export_chunk_size = 2000
+
+    def add_table(self, base_model):
+        table = BreakdownTable(self.breakdown_table_id, view=self, model=base_model)
+        table.row_cap = getattr(settings, 'REPORT_BUILDER_BREAKDOWN_MAX_ROWS', None)
+        return table
+
+    def get(self, request, *args, **kwargs):
+        if request.GET.get('export') == 'csv':
+            return self.export_csv()
+        return super().get(request, *args, **kwargs)
+
+    def post(self, request, *args, **kwargs):
+        if request.POST.get('datatable_data'):
+            table = self.setup_table()
+            table_data = table.get_server_side_json(request, table.get_query(), request.POST)
+            return HttpResponse(table_data, content_type='application/json')
+        return super().post(request, *args, **kwargs)
+
+    def get_modal_buttons(self):
+        export_url = f'{self.request.path}?export=csv'
+        return [
+            modal_button('Export all', {'function': 'redirect', 'url': export_url}, 'btn-secondary'),
+            *super().get_modal_buttons(),
+        ]
+
+    def export_csv(self):
+        table = self.setup_table()
+        response = StreamingHttpResponse(self.iter_csv(table), content_type='text/csv')
+        response['Content-Disposition'] = f'attachment; filename="{slugify(self.modal_title()) or "breakdown"}.csv"'
+        return response
+
+    def iter_csv(self, table):
+        """Yields the CSV a chunk of rows at a time, reading them from a server side cursor."""
+        columns = [
+            (index, column)
+            for index, column in enumerate(table.columns)
+            if not column.xl_dont_show() and not column.options.get('hidden')
+        ]
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow([strip_tags(str(column.title)) for _, column in columns])
+        yield output.getvalue()
+        rows = table.get_query().iterator(chunk_size=self.export_chunk_size)
+        while chunk := list(islice(rows, self.export_chunk_size)):
+            output.seek(0)
+            output.truncate()
+            for row in table.get_table_array(self.request, chunk):
+                values = [column.excel(row[index]) for index, column in columns]
+                writer.writerow([strip_tags(value) if isinstance(value, str) else value for value in values])
+            yield output.getvalue()
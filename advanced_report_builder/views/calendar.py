@@ -1,15 +1,19 @@
 import json
+from collections import defaultdict
 from datetime import timedelta
+from itertools import islice
 
 from ajax_helpers.utils import random_string
 from django.conf import settings
+from django.db import connections, models
 from django.forms import CharField, IntegerField, ModelChoiceField, NumberInput
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import urlencode
 from django.views.generic import TemplateView
 from django_datatables.columns import DateColumn, DateTimeColumn, MenuColumn
-from django_datatables.datatables import DatatableExcludedRow
 from django_datatables.helpers import DUMMY_ID, row_link
 from django_datatables.widgets import DataTableReorderWidget
 from django_menus.menu import HtmlMenu, MenuItem
@@ -20,6 +24,7 @@ from django_modals.modals import Modal, ModelFormModal
 from django_modals.processes import PERMISSION_OFF, PROCESS_EDIT_DELETE
 from django_modals.widgets.select2 import Select2, Select2Multiple
 
+from advanced_report_builder import calendar_feed
 from advanced_report_builder.columns import ReportBuilderNumberColumn
 from advanced_report_builder.data_merge.utils import DataMergeUtils
 from advanced_report_builder.data_merge.widget import DataMergeWidget
@@ -30,7 +35,8 @@ from advanced_report_builder.models import (
     CalendarReportDescription,
     ReportType,
 )
-from advanced_report_builder.utils import crispy_modal_link_args, get_report_builder_class
+from advanced_report_builder.period_cache import get_period_boundary
+from advanced_report_builder.utils import crispy_modal_link_args
 from advanced_report_builder.views.charts_base import ChartJSTable
 from advanced_report_builder.views.datatables.utils import DescriptionColumn
 from advanced_report_builder.views.helpers import QueryBuilderModelForm
@@ -41,36 +47,50 @@ from advanced_report_builder.views.report import ReportBase
 class CalendarTable(ChartJSTable):
     DATE_COLUMNS = (DateColumn, DateTimeColumn)
 
-    def get_table_array(self, request, results):
-        result_processes = self.get_result_processes()
-        for p in result_processes:
-            p.setup_results(request, self.page_results)
-        for c in self.columns:
-            c.setup_results(request, self.page_results)
-        results_list = []
-        for data_dict in results:
-            try:
-                for p in result_processes:
-                    p.row_result(data_dict, self.page_results)
-                row_data = []
-                for column in self.columns:
-                    if isinstance(column, DescriptionColumn):
-                        row_data.append(column.row_result(data_dict, self.page_results, columns=self.columns))
-                    elif isinstance(column, self.DATE_COLUMNS) and hasattr(column, 'iso_row_result'):
-                        row_data.append(column.iso_row_result(data_dict, self.page_results))
-                    else:
-                        row_data.append(column.row_result(data_dict, self.page_results))
-
-                results_list.append(row_data)
-            except DatatableExcludedRow:
-                pass
-        return results_list
+    def __init__(self, *args, **kwargs):
+        self.start_field = None
+        self.start_django_field = None
+        self.end_field = None
+        self.end_django_field = None
+        self.end_duration_field = None
+        self.end_duration = None
+        super().__init__(*args, **kwargs)
+
+    def get_event_dates(self, row):
+        """Returns the start and end of the row's event, the end found as the end date columns find it."""
+        start = row.get(self.start_field)
+        if start is None or self.end_field is not None:
+            return start, row.get(self.end_field) if self.end_field is not None else None
+        if self.end_duration_field is not None:
+            end_duration = row.get(self.end_duration_field)
+            if end_duration is None or end_duration <= 0:
+                end_duration = 3600
+        else:
+            end_duration = 3600 if self.end_duration is None else self.end_duration
+        return start, start + timedelta(seconds=end_duration)
+
+    def get_column_values(self, column, rows, excluded):
+        if isinstance(column, DescriptionColumn):
+            return self.get_row_results(
+                rows,
+                excluded,
+                lambda data_dict: column.row_result(data_dict, self.page_results, columns=self.columns),
+            )
+        if isinstance(column, self.DATE_COLUMNS) and hasattr(column, 'iso_row_result'):
+            return self.get_row_results(
+                rows, excluded, lambda data_dict: column.iso_row_result(data_dict, self.page_results)
+            )
+        return super().get_column_values(column, rows, excluded)
 
 
 class CalendarView(DataMergeUtils, ReportBase, FilterQueryMixin, TemplateView):
     number_field = ReportBuilderNumberColumn
     template_name = 'advanced_report_builder/calendar/report.html'
     chart_js_table = CalendarTable
+    union_prefix = 'rb_union'
+    # whether the view returns an iCalendar feed for ViewReportCalendarFeedBase
+    serves_calendar_feed = True
+    feed_chunk_size = 500
 
     def __init__(self, *args, **kwargs):
         self.chart_report = None
@@ -86,9 +106,27 @@ class CalendarView(DataMergeUtils, ReportBase, FilterQueryMixin, TemplateView):
             report_menu = self.pod_report_menu()
         self.add_menu('button_menu', 'button_group').add_items(
             *report_menu,
+            *self.calendar_feed_menu(),
             *self.queries_option_menus(report=self.report, dashboard_report=self.dashboard_report),
         )
 
+    def calendar_feed_menu(self):
+        url_name = getattr(settings, 'REPORT_BUILDER_CALENDAR_FEED_URL_NAME', None)
+        if not url_name or not self.request.user.is_authenticated:
+            return []
+        # calendar apps don't share the browser's session, so the feed is identified by the user's token
+        url = reverse(url_name, kwargs={'slug': self.report.slug})
+        token = urlencode({'token': calendar_feed.get_feed_token(self.request.user)})
+        return [
+            MenuItem(
+                f'{url}?{token}',
+                menu_display='Subscribe',
+                font_awesome='fas fa-calendar-plus',
+                css_classes=['btn-secondary'],
+                link_type=MenuItem.HREF,
+            )
+        ]
+
     def dispatch(self, request, *args, **kwargs):
         self.report = kwargs.get('report')
         self.chart_report = self.report.calendarreport
@@ -104,22 +142,28 @@ class CalendarView(DataMergeUtils, ReportBase, FilterQueryMixin, TemplateView):
     def get_calendar_events(self, base_model, calendar_report_data_set, lanes, label=None, extra_query_filter=None):
         table = self.chart_js_table(model=base_model)
 
-        report_builder_class = get_report_builder_class(
+        report_builder_class = self.report_context.get_report_builder_class(
             model=base_model, report_type=calendar_report_data_set.report_type
         )
         table_indexes = ['start_date_field', 'end_date_field']
         table.add_columns(calendar_report_data_set.start_date_field)
+        table.start_django_field, _, _, start_field_col_field = self.get_field_details(
+            base_model=base_model,
+            field=calendar_report_data_set.start_date_field,
+            report_builder_class=report_builder_class,
+        )
+        table.start_field = start_field_col_field
         if calendar_report_data_set.end_date_type == CalendarReportDataSet.END_DATE_TYPE_FIELD:
             table.add_columns(calendar_report_data_set.end_date_field)
+            table.end_django_field, _, _, table.end_field = self.get_field_details(
+                base_model=base_model,
+                field=calendar_report_data_set.end_date_field,
+                report_builder_class=report_builder_class,
+            )
         elif (
             calendar_report_data_set.end_date_type == CalendarReportDataSet.END_DATE_TYPE_DURATION_FIELD
             and calendar_report_data_set.end_duration_field is not None
         ):
-            _, _, _, start_field_col_field = self.get_field_details(
-                base_model=base_model,
-                field=calendar_report_data_set.start_date_field,
-                report_builder_class=report_builder_class,
-            )
             _, _, _, end_duration_col_field = self.get_field_details(
                 base_model=base_model,
                 field=calendar_report_data_set.end_duration_field,
@@ -144,13 +188,10 @@ class CalendarView(DataMergeUtils, ReportBase, FilterQueryMixin, TemplateView):
                         return ''
 
             table.add_columns(DurationEndDateColumn(column_name='EndDate'))
+            table.end_duration_field = end_duration_col_field
 
         else:
-            _, _, _, start_field_col_field = self.get_field_details(
-                base_model=base_model,
-                field=calendar_report_data_set.start_date_field,
-                report_builder_class=report_builder_class,
-            )
+            table.end_duration = calendar_report_data_set.end_duration
 
             class FixedDurationEndDateColumn(DateColumn):
                 def row_result(self, data, _page_result):
@@ -232,18 +273,89 @@ class CalendarView(DataMergeUtils, ReportBase, FilterQueryMixin, TemplateView):
         table.view_filter = self.view_filter_extra
         lanes.append({'datatable': table, 'label': label, 'calendar_report_data_set': calendar_report_data_set})
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        context['title'] = self.get_title()
-        calendar_report_data_sets = self.chart_report.calendarreportdataset_set.all()
+    def get_lanes(self):
         lanes = []
-        headings = []
-
-        for calendar_report_data_set in calendar_report_data_sets:
+        for calendar_report_data_set in self.chart_report.calendarreportdataset_set.all():
             base_model = calendar_report_data_set.get_base_model()
             self.get_calendar_events(
                 base_model=base_model, calendar_report_data_set=calendar_report_data_set, lanes=lanes
             )
+        return lanes
+
+    def get(self, request, *args, **kwargs):
+        if not self.kwargs.get('calendar_feed'):
+            return super().get(request, *args, **kwargs)
+        lanes = self.get_lanes()
+        window_start, window_end = calendar_feed.get_feed_window(timezone.localdate())
+        for lane in lanes:
+            table = lane['datatable']
+            table.extra_query_filter = self.get_window_filter(table, window_start, window_end)
+            pk_name = table.model._meta.pk.name
+            if pk_name not in table.fields():
+                table.add_columns(f'.{pk_name}')
+        response = StreamingHttpResponse(self.iter_calendar_feed(lanes), content_type=calendar_feed.CONTENT_TYPE)
+        response['Content-Disposition'] = f'inline; filename="{self.report.slug}.ics"'
+        return response
+
+    @staticmethod
+    def get_window_filter(table, window_start, window_end):
+        """Returns the Q for the events starting in the window, or starting before it and ending in it."""
+        if table.start_django_field is None:
+            return None
+        start_field = table.start_field
+        window_filter = models.Q(**{f'{start_field}__lt': get_period_boundary(window_end, table.start_django_field)})
+        starts_in_window = models.Q(
+            **{f'{start_field}__gte': get_period_boundary(window_start, table.start_django_field)}
+        )
+        if table.end_django_field is None:
+            return window_filter & starts_in_window
+        ends_in_window = models.Q(
+            **{f'{table.end_field}__gte': get_period_boundary(window_start, table.end_django_field)}
+        )
+        return window_filter & (starts_in_window | ends_in_window)
+
+    def iter_calendar_feed(self, lanes):
+        """Yields the feed a data set at a time, reading each data set's rows in chunks from a server side cursor."""
+        stamp = timezone.now()
+        host = self.request.get_host()
+        yield calendar_feed.calendar_start(self.report.name)
+        for lane in lanes:
+            table = lane['datatable']
+            calendar_report_data_set = lane['calendar_report_data_set']
+            indexes = table.table_options['indexes']
+            heading_index = indexes.index('heading') if 'heading' in indexes else None
+            description_index = indexes.index('description') if 'description' in indexes else None
+            link = table.table_options['row_href'][0] if table.has_link else None
+            link_index = table.find_column(link['column'])[1] if link else None
+            pk_name = table.model._meta.pk.name
+            rows = table.get_query().iterator(chunk_size=self.feed_chunk_size)
+            while chunk := list(islice(rows, self.feed_chunk_size)):
+                for row, values in zip(chunk, table.get_table_array(self.request, chunk), strict=True):
+                    start, end = table.get_event_dates(row)
+                    if start is None:
+                        continue
+                    url = None
+                    if link_index is not None:
+                        url = self.request.build_absolute_uri(
+                            link['html'].replace(link['var'], str(values[link_index]))
+                        )
+                    yield calendar_feed.event(
+                        uid=f'{calendar_report_data_set.id}-{row[pk_name]}@{host}',
+                        start=start,
+                        end=end,
+                        summary=values[heading_index] if heading_index is not None else calendar_report_data_set.name,
+                        stamp=stamp,
+                        description=values[description_index] if description_index is not None else None,
+                        url=url,
+                    )
+        yield calendar_feed.calendar_end()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['title'] = self.get_title()
+        lanes = self.get_lanes()
+        headings = []
+        self.combine_data_set_queries(lanes)
         view_type = None
         if self.dashboard_report and self.dashboard_report.options is not None:
             view_type = self.dashboard_report.options.get('calendar_view_type')
@@ -259,6 +371,87 @@ class CalendarView(DataMergeUtils, ReportBase, FilterQueryMixin, TemplateView):
         context['field_id'] = random_string()
         return context
 
+    @staticmethod
+    def can_combine(query):
+        sql_query = query.query
+        return not (sql_query.is_sliced or sql_query.distinct or sql_query.combinator or sql_query.group_by)
+
+    def combine_data_set_queries(self, lanes):
+        """Fetches the events of the data sets sharing a database with one UNION ALL query rather than one each.
+
+        Data sets that slice, group or are on their own database keep their own query.
+        """
+        queries = defaultdict(list)
+        for index, lane in enumerate(lanes):
+            query = lane['datatable'].get_query()
+            if self.can_combine(query):
+                queries[query.db].append((index, lane['datatable'], query))
+        for combined in queries.values():
+            if len(combined) > 1:
+                self.fetch_combined(combined)
+
+    def get_slots(self, table, query, slot_fields):
+        """Returns {slot: field} putting the table's fields in slots shared with other tables' fields of the same type.
+
+        slot_fields holds the output field of each slot by database type, adding slots as needed. Returns None if
+        a field has no database type to match.
+        """
+        fields = table.fields()
+        typed = query.values(**{f'{self.union_prefix}_{i}': models.F(field) for i, field in enumerate(fields)})
+        connection = connections[query.db]
+        used = defaultdict(int)
+        slots = {}
+        for i, field in enumerate(fields):
+            output_field = typed.query.annotations[f'{self.union_prefix}_{i}'].output_field
+            db_type = output_field.db_type(connection)
+            if db_type is None:
+                return None
+            position = used[db_type]
+            used[db_type] += 1
+            type_slot_fields = slot_fields.setdefault(db_type, [])
+            if position == len(type_slot_fields):
+                type_slot_fields.append(output_field)
+            slots[f'{self.union_prefix}_{list(slot_fields).index(db_type)}_{position}'] = field
+        return slots
+
+    def fetch_combined(self, combined):
+        """Fetches the rows of each table in one query and sets them as the table's raw data.
+
+        Each table's fields are projected into the shared slots, padded with NULL, along with its lane's index
+        which the rows are split back by.
+        """
+        slot_fields = {}
+        lane_slots = []
+        for index, table, query in combined:
+            slots = self.get_slots(table=table, query=query, slot_fields=slot_fields)
+            if slots is not None:
+                lane_slots.append((index, table, query, slots))
+        if len(lane_slots) < 2:
+            return
+        all_slots = [
+            (f'{self.union_prefix}_{type_index}_{position}', output_field)
+            for type_index, type_slot_fields in enumerate(slot_fields.values())
+            for position, output_field in enumerate(type_slot_fields)
+        ]
+        lane_field = f'{self.union_prefix}_lane'
+        parts = []
+        for index, _, query, slots in lane_slots:
+            expressions = {lane_field: models.Value(index, output_field=models.IntegerField())}
+            for slot, output_field in all_slots:
+                expressions[slot] = (
+                    models.F(slots[slot]) if slot in slots else models.Value(None, output_field=output_field)
+                )
+            parts.append(query.order_by().values(**expressions))
+
+        rows = defaultdict(list)
+        for row in parts[0].union(*parts[1:], all=True):
+            rows[row[lane_field]].append(row)
+        for index, table, _, slots in lane_slots:
+            table.raw_data = table.get_table_array(
+                table.kwargs.get('request'),
+                [{field: row[slot] for slot, field in slots.items()} for row in rows[index]],
+            )
+
     def view_filter(self, query, table):
         if not table.query_data:
             return query
@@ -7,11 +7,15 @@ from datetime import datetime, timedelta
 from date_offset.date_offset import DateOffset
 from dateutil.relativedelta import relativedelta
 from django.apps import apps
+from django.conf import settings
 from django.core.exceptions import FieldDoesNotExist, FieldError
 from django.db import DataError, ProgrammingError
-from django.db.models import Q
+from django.db.models import DateField, Q, QuerySet
 from django.forms import ChoiceField
+from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.html import strip_tags
 from django.utils.safestring import mark_safe
 from django.views.generic import TemplateView
 from django_datatables.datatables import DatatableTable
@@ -33,26 +37,44 @@ from advanced_report_builder.globals import (
     PeriodType,
 )
 from advanced_report_builder.models import ReportType
+from advanced_report_builder.period_cache import (
+    PeriodBucketCache,
+    get_period_boundary,
+    get_period_cache_timeout,
+    get_period_start,
+)
 from advanced_report_builder.utils import (
     count_days,
     get_report_builder_class,
     get_template_type_class,
+    make_slug_str,
     split_attr,
     split_slug,
 )
-from advanced_report_builder.variable_date import VariableDate
+from advanced_report_builder.views.datatables.tables import ColumnBatchMixin
 from advanced_report_builder.views.helpers import QueryBuilderForm
 from advanced_report_builder.views.report import ReportBase
 from advanced_report_builder.views.report_utils_mixin import ReportUtilsMixin
 from advanced_report_builder.views.targets.utils import TargetUtils
+from advanced_report_builder.working_days import WorkingDayIndex
+
 
+class ChartJSTable(ColumnBatchMixin, DatatableTable):
+    # whether the first column holds the labels, such as the dates of a bar or line chart
+    has_labels = False
 
-class ChartJSTable(DatatableTable):
     def __init__(self, *args, **kwargs):
         pk = kwargs.pop('pk', None)
         self.axis_scale = kwargs.pop('axis_scale', None)
         self.targets = kwargs.pop('targets', None)
         self.raw_data = None
+        self.period_cache = None
+        # whether the query's filters resolved a variable date, so the query changes tomorrow
+        self.uses_variable_dates = False
+        # the first period returned when only the periods from it on are asked for, see ChartBaseView.get_since
+        self.since = None
+        self.refresh_url = None
+        self.refresh_seconds = None
 
         super().__init__(*args, **kwargs)
         if pk:
@@ -63,15 +85,12 @@ class ChartJSTable(DatatableTable):
             targets_data = []
             error = False
             try:
-                data = self.get_table_array(self.kwargs.get('request'), self.get_query())
-                self.raw_data = data
+                data = self.get_raw_data()
             except (DataError, FieldError):
                 data = [['N/A']]
                 error = True
-            if self.targets is not None and not error:
-                targets = self.targets.all()
-                if targets and len(data) > 0:
-                    targets_data = self.process_data_structure_target(targets=targets, data=data)
+            if not error:
+                targets_data = self.get_targets_data(data)
             return mark_safe(
                 json.dumps(
                     {
@@ -86,6 +105,43 @@ class ChartJSTable(DatatableTable):
         except (ProgrammingError, TypeError, ValueError, KeyError) as e:
             raise ReportError(e)
 
+    def get_targets_data(self, data):
+        if self.targets is None or len(data) == 0:
+            return []
+        targets = self.targets.all()
+        if not targets:
+            return []
+        return self.process_data_structure_target(targets=targets, data=data)
+
+    def get_chart_data(self):
+        """Returns the chart's data a column at a time, as the labels and a list of data for each series."""
+        try:
+            data = self.get_raw_data()
+        except (DataError, FieldError) as e:
+            raise ReportError(e) from e
+        columns = [list(column) for column in zip(*data, strict=True)] if data else [[] for _ in self.columns]
+        titles = [strip_tags(str(column.title)) for column in self.columns]
+        chart_data = {}
+        if self.has_labels:
+            chart_data['labels'] = columns.pop(0)
+            titles.pop(0)
+        chart_data['series'] = [{'title': title, 'data': column} for title, column in zip(titles, columns, strict=True)]
+        targets_data = self.get_targets_data(data)
+        if targets_data:
+            chart_data['targets'] = targets_data
+        if self.since is not None:
+            chart_data['since'] = self.since.strftime('%Y-%m-%d')
+        return chart_data
+
+    def get_raw_data(self):
+        """Returns the table array, only running the query the first time so the value and its target share it."""
+        if self.raw_data is None:
+            results = self.get_query()
+            if self.period_cache is not None and isinstance(results, QuerySet) and not results.query.is_sliced:
+                results = self.period_cache.get_results(results, uses_variable_dates=self.uses_variable_dates)
+            self.raw_data = self.get_table_array(self.kwargs.get('request'), results)
+        return self.raw_data
+
     def process_data_structure_target(self, targets, data):
         results = []
         for target in targets:
@@ -138,11 +194,19 @@ class ChartBaseView(ReportBase, ReportUtilsMixin, TemplateView):
     chart_js_table = ChartJSTable
 
     template_name = 'advanced_report_builder/charts/report.html'
+    # keep the rows of closed periods between renders, see PeriodBucketCache
+    cache_closed_periods = False
+    # whether get_chart_data returns the report's data for ViewReportDataBase
+    serves_chart_data = True
+    # whether the chart's template polls get_refresh_url to keep itself up to date
+    refreshes_itself = False
 
     def __init__(self, *args, **kwargs):
         self.chart_report = None
         self.show_toolbar = False
         self.table = None
+        self.period_date_field = None
+        self.since = None
         super().__init__(*args, **kwargs)
 
     def dispatch(self, request, *args, **kwargs):
@@ -165,6 +229,11 @@ class ChartBaseView(ReportBase, ReportUtilsMixin, TemplateView):
             query = self.process_query_filters(
                 query=query, search_filter_data=search_filter_data, extra_filter=option_query
             )
+            if self.table is not None:
+                self.table.uses_variable_dates = self.uses_variable_dates
+        if self.since is not None:
+            date_field, django_field, _ = self.period_date_field
+            query = query.filter(**{f'{date_field}__gte': get_period_boundary(self.since, django_field)})
         return query
 
     def get_report_template(self):
@@ -180,7 +249,9 @@ class ChartBaseView(ReportBase, ReportUtilsMixin, TemplateView):
         field_name = self.chart_report.date_field
         if field_name is None:
             return None
-        report_builder_class = get_report_builder_class(model=base_model, report_type=self.chart_report.report_type)
+        report_builder_class = self.report_context.get_report_builder_class(
+            model=base_model, report_type=self.chart_report.report_type
+        )
 
         django_field, col_type_override, _, _ = self.get_field_details(
             base_model=base_model,
@@ -201,6 +272,7 @@ class ChartBaseView(ReportBase, ReportUtilsMixin, TemplateView):
         new_field_name = f'{annotations_value}_{field_name}_{index}'
         function = ANNOTATION_VALUE_FUNCTIONS[annotations_value]
         date_function_kwargs['annotations_value'] = {new_field_name: function(field_name)}
+        self.period_date_field = (field_name, django_field, new_field_name)
         field_name = new_field_name
 
         date_function_kwargs.update({'field': field_name, 'column_name': field_name, 'model_path': ''})
@@ -222,6 +294,7 @@ class ChartBaseView(ReportBase, ReportUtilsMixin, TemplateView):
         date_field_name = self.get_date_field(0, fields, base_model=base_model, table=table)
         if date_field_name is not None:
             table.order_by = [date_field_name]
+            table.has_labels = True
         else:
             table.order_by = ['id']
 
@@ -229,7 +302,9 @@ class ChartBaseView(ReportBase, ReportUtilsMixin, TemplateView):
             return fields
         chart_fields = self.chart_report.fields
 
-        report_builder_class = get_report_builder_class(model=base_model, report_type=self.chart_report.report_type)
+        report_builder_class = self.report_context.get_report_builder_class(
+            model=base_model, report_type=self.chart_report.report_type
+        )
 
         for index, table_field in enumerate(chart_fields, 1):
             field = table_field['field']
@@ -360,6 +435,17 @@ class ChartBaseView(ReportBase, ReportUtilsMixin, TemplateView):
         else:
             self.table = self.chart_js_table(model=base_model)
 
+    def get(self, request, *args, **kwargs):
+        if not self.kwargs.get('chart_data'):
+            return super().get(request, *args, **kwargs)
+        self.get_context_data(**kwargs)
+        return JsonResponse(self.get_chart_data(), json_dumps_params={'separators': (',', ':')})
+
+    def get_chart_data(self):
+        if self.table is None:
+            return {'series': []}
+        return self.table.get_chart_data()
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
@@ -372,11 +458,74 @@ class ChartBaseView(ReportBase, ReportUtilsMixin, TemplateView):
             except (FieldError, FieldDoesNotExist) as e:
                 raise ReportError(e)
             self.table.add_columns(*fields)
+            self.since = self.table.since = self.get_since()
+            self.table.period_cache = self.get_period_cache()
+            self.table.refresh_url = self.get_refresh_url()
+            self.table.refresh_seconds = getattr(settings, 'REPORT_BUILDER_CHART_REFRESH_SECONDS', None)
             context['datatable'] = self.table
         context['show_toolbar'] = self.show_toolbar
         context['title'] = self.get_title()
         return context
 
+    def supports_since(self):
+        """Whether the chart can return only the periods from a date on, which needs dates as its labels."""
+        return (
+            self.cache_closed_periods
+            and self.period_date_field is not None
+            and isinstance(self.period_date_field[1], DateField)
+            and self.get_date_format() == '%Y-%m-%d'
+        )
+
+    def get_since(self):
+        """Returns the start of the period holding the since date asked for by a refreshing chart, or None.
+
+        A chart that is refreshed sends the last period it holds, so only that period and any after it are queried
+        and returned, as the periods before it have closed.
+        """
+        since = self.request.GET.get('since') if self.kwargs.get('chart_data') else None
+        if not since or not self.supports_since():
+            return None
+        try:
+            since = datetime.strptime(since, '%Y-%m-%d').date()
+        except ValueError:
+            return None
+        return get_period_start(since, self.chart_report.axis_scale)
+
+    def get_refresh_url(self):
+        """Returns the URL of the chart's data for it to refresh itself with, or None when it isn't refreshed."""
+        url_name = getattr(settings, 'REPORT_BUILDER_CHART_DATA_URL_NAME', None)
+        if (
+            not self.refreshes_itself
+            or not url_name
+            or not getattr(settings, 'REPORT_BUILDER_CHART_REFRESH_SECONDS', None)
+            or self.kwargs.get('chart_data')
+        ):
+            return None
+        slug = {**self.slug, 'pk': self.report.slug}
+        if self.dashboard_report:
+            slug['dashboard_report'] = self.dashboard_report.pk
+        return reverse(url_name, kwargs={'slug': make_slug_str(slug)})
+
+    def get_period_cache(self):
+        if (
+            not self.cache_closed_periods
+            or self.period_date_field is None
+            or self.since is not None
+            or get_period_cache_timeout() == 0
+        ):
+            return None
+        date_field, django_field, bucket_field = self.period_date_field
+        if not isinstance(django_field, DateField):
+            return None
+        return PeriodBucketCache(
+            report_id=self.chart_report.pk,
+            date_field=date_field,
+            django_field=django_field,
+            bucket_field=bucket_field,
+            axis_scale=self.chart_report.axis_scale,
+            today=self.report_context.today,
+        )
+
     def setup_menu(self):
         if not self.show_toolbar:
             return
@@ -390,9 +539,14 @@ class ChartBaseView(ReportBase, ReportUtilsMixin, TemplateView):
 
         self.add_menu('button_menu', 'button_group').add_items(
             *report_menu,
+            *self.chart_option_menus(),
             *self.queries_option_menus(report=self.report, dashboard_report=self.dashboard_report),
         )
 
+    # noinspection PyMethodMayBeStatic
+    def chart_option_menus(self):
+        return []
+
     def pod_dashboard_edit_menu(self):
         return [
             MenuItem(
@@ -429,40 +583,42 @@ class ChartBaseView(ReportBase, ReportUtilsMixin, TemplateView):
         end_date_type,
         exclude_weekdays=None,
         exclude_dates=None,
+        working_day_calendar=None,
     ):
         """
         Calculates the number of periods (year, quarter, month, week, day)
         between two variable dates.
         Supports working-day exclusions and financial quarters.
+        A working_day_calendar replaces exclude_weekdays and exclude_dates with its own.
 
         financial_year_start_month:
             1 = Jan (default calendar year)
             4 = Apr (UK fiscal year)
             7 = Jul (AU fiscal year)
         """
-        variable_date = VariableDate()
-
         financial_year_start_month = self.get_financial_month()
 
-        start_date_and_time, _, _ = variable_date.get_variable_dates(
+        start_date_and_time, _, _ = self.report_context.get_variable_dates(
             range_type=start_date_type, financial_year_start_month=financial_year_start_month
         )
-        _, end_date_and_time, _ = variable_date.get_variable_dates(
+        _, end_date_and_time, _ = self.report_context.get_variable_dates(
             range_type=end_date_type, financial_year_start_month=financial_year_start_month
         )
 
         start_date = start_date_and_time.date()
         end_date = end_date_and_time.date()
 
+        if working_day_calendar is not None:
+            working_days = working_day_calendar.get_index()
+        elif exclude_weekdays or exclude_dates:
+            working_days = WorkingDayIndex(exclude_weekdays=exclude_weekdays, exclude_dates=exclude_dates)
+        else:
+            working_days = None
+
         # YEAR
         if annotation_value_choice == ANNOTATION_VALUE_YEAR:
-            if exclude_weekdays or exclude_dates:
-                total_working_days = count_days(
-                    start_date,
-                    end_date,
-                    exclude_weekdays=exclude_weekdays,
-                    exclude_dates=exclude_dates,
-                )
+            if working_days is not None:
+                total_working_days = working_days.count(start_date, end_date)
                 divider = max(1, math.ceil(total_working_days / 260))
             else:
                 divider = abs(end_date.year - start_date.year) + 1
@@ -486,25 +642,15 @@ class ChartBaseView(ReportBase, ReportUtilsMixin, TemplateView):
             divider = max(1, math.ceil(adjusted_months / 3))
 
             # If working-day exclusions apply, switch to day-based quarter calculation
-            if exclude_weekdays or exclude_dates:
-                total_working_days = count_days(
-                    start_date,
-                    end_date,
-                    exclude_weekdays=exclude_weekdays,
-                    exclude_dates=exclude_dates,
-                )
+            if working_days is not None:
+                total_working_days = working_days.count(start_date, end_date)
                 # Approx. 65 working days per quarter
                 divider = max(1, math.ceil(total_working_days / 65))
 
         # CALENDAR QUARTER
         elif annotation_value_choice == ANNOTATION_VALUE_QUARTER:
-            if exclude_weekdays or exclude_dates:
-                total_working_days = count_days(
-                    start_date,
-                    end_date,
-                    exclude_weekdays=exclude_weekdays,
-                    exclude_dates=exclude_dates,
-                )
+            if working_days is not None:
+                total_working_days = working_days.count(start_date, end_date)
                 divider = max(1, math.ceil(total_working_days / 65))
             else:
                 delta = relativedelta(end_date, start_date)
@@ -522,15 +668,9 @@ class ChartBaseView(ReportBase, ReportUtilsMixin, TemplateView):
 
         # WEEK
         elif annotation_value_choice == ANNOTATION_VALUE_WEEK:
-            if exclude_weekdays or exclude_dates:
-                total_working_days = count_days(
-                    start_date,
-                    end_date,
-                    exclude_weekdays=exclude_weekdays,
-                    exclude_dates=exclude_dates,
-                )
-                ex = {d for d in (exclude_weekdays or []) if 1 <= d <= 7}
-                workdays_per_week = 7 - len(ex) if ex else 7
+            if working_days is not None:
+                total_working_days = working_days.count(start_date, end_date)
+                workdays_per_week = working_days.workdays_per_week
                 if workdays_per_week == 0:
                     raise ReportError('All days are excluded from the week; cannot calculate number of weeks.')
                 divider = math.ceil(total_working_days / workdays_per_week)
@@ -541,12 +681,10 @@ class ChartBaseView(ReportBase, ReportUtilsMixin, TemplateView):
 
         # DAY
         elif annotation_value_choice == ANNOTATION_VALUE_DAY:
-            divider = count_days(
-                start_date,
-                end_date,
-                exclude_weekdays=exclude_weekdays,
-                exclude_dates=exclude_dates,
-            )
+            if working_days is not None:
+                divider = working_days.count(start_date, end_date)
+            else:
+                divider = count_days(start_date, end_date)
 
         else:
             raise ReportError('unknown annotation_value_choice')
@@ -27,7 +27,9 @@ from advanced_report_builder.models import (
     DashboardReport,
     Report,
     ReportQuery,
+    prefetch_child_reports,
 )
+from advanced_report_builder.report_context import get_report_context
 from advanced_report_builder.utils import (
     get_report_builder_class,
     get_template_type_class,
@@ -46,6 +48,7 @@ class ViewDashboardBase(AjaxHelpers, MenuMixin, TemplateView):
 
     def __init__(self, *args, **kwargs):
         self.dashboard = None
+        self.report_context = None
         self._view_type_class = None
         super().__init__(*args, **kwargs)
 
@@ -70,6 +73,7 @@ class ViewDashboardBase(AjaxHelpers, MenuMixin, TemplateView):
         return {'dashboard': dashboard}
 
     def dispatch(self, request, *args, **kwargs):
+        self.report_context = get_report_context(request)
         dashboard_data = self.get_dashboard()
         if 'redirect' in dashboard_data:
             return dashboard_data['redirect']
@@ -127,7 +131,9 @@ class ViewDashboardBase(AjaxHelpers, MenuMixin, TemplateView):
 
         top_reports = []
         reports = []
-        for dashboard_report in self.dashboard.dashboardreport_set.all():
+        dashboard_reports = list(self.dashboard.dashboardreport_set.with_report_data())
+        prefetch_child_reports([dashboard_report.report for dashboard_report in dashboard_reports])
+        for dashboard_report in dashboard_reports:
             if self.has_report_got_permission(report=dashboard_report.report):
                 report_view = self.get_view(report=dashboard_report.report)
                 extra_class_name = report_view().get_dashboard_class(report=dashboard_report.report)
@@ -197,6 +203,7 @@ class ViewDashboardBase(AjaxHelpers, MenuMixin, TemplateView):
         view_kwargs['enable_links'] = self.enable_links
         view_kwargs['output_type_template'] = self.get_report_template(dashboard_report=dashboard_report)
         view_kwargs['extra_kwargs'] = extra_kwargs
+        view_kwargs['report_context'] = self.report_context
         return report_view.as_view()(self.request, *self.args, **view_kwargs)
 
     def get_report_template(self, dashboard_report):
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.core.exceptions import FieldDoesNotExist, FieldError
 from django.db import ProgrammingError
 from django_datatables.datatables import DatatableError, DatatableView
@@ -6,8 +7,12 @@ from django_menus.menu import MenuItem
 
 from advanced_report_builder.columns import ArrowColumn
 from advanced_report_builder.exceptions import ReportError
+from advanced_report_builder.models import TableReport
 from advanced_report_builder.record_nav import RecordNavPlugin
-from advanced_report_builder.utils import get_report_builder_class, split_slug
+from advanced_report_builder.search import get_search_paths
+from advanced_report_builder.utils import split_slug
+from advanced_report_builder.views.datatables.keyset import KeysetTable
+from advanced_report_builder.views.datatables.tables import ReportTable
 from advanced_report_builder.views.datatables.utils import TableUtilsMixin
 from advanced_report_builder.views.report import ReportBase
 
@@ -35,7 +40,8 @@ class TableView(ReportBase, TableUtilsMixin, DatatableView):
             self.table_id = f'table_{self.table_report.id}'
 
         self.base_model = self.table_report.get_base_model()
-        self.add_table(self.table_id, model=self.base_model)
+        table_class = KeysetTable if self.table_report.keyset_pagination else ReportTable
+        self.add_table(self.table_id, model=self.base_model, table_class=table_class)
 
         try:
             return super().dispatch(request, *args, **kwargs)
@@ -51,7 +57,9 @@ class TableView(ReportBase, TableUtilsMixin, DatatableView):
         pivot_fields = self.table_report.pivot_fields
         fields_used = set()
         fields_map = {}
-        report_builder_class = get_report_builder_class(model=base_model, report_type=self.table_report.report_type)
+        report_builder_class = self.report_context.get_report_builder_class(
+            model=base_model, report_type=self.table_report.report_type
+        )
         try:
             self.process_query_results(
                 report_builder_class=report_builder_class,
@@ -74,6 +82,18 @@ class TableView(ReportBase, TableUtilsMixin, DatatableView):
                 table.sort(order_by_field)
             else:
                 table.sort(f'-{order_by_field}')
+            if isinstance(table, KeysetTable) and table.can_seek(base_model, self.table_report.order_by_field):
+                table.keyset_field = self.table_report.order_by_field
+                pk_name = base_model._meta.pk.name
+                if pk_name not in table.fields():
+                    table.add_columns(f'.{pk_name}')
+
+        if isinstance(table, KeysetTable) and self.table_report.estimated_count:
+            table.estimated_count_threshold = getattr(settings, 'REPORT_BUILDER_ESTIMATED_COUNT_THRESHOLD', 100000)
+
+        if isinstance(table, KeysetTable) and self.table_report.search_type != TableReport.SearchType.CONTAINS:
+            table.search_type = self.table_report.search_type
+            table.search_paths = get_search_paths(table, exclude_fields=report_builder_class.exclude_search_fields)
 
         table.table_options['pageLength'] = self.table_report.page_length
         table.table_options['bStateSave'] = False
@@ -0,0 +1,77 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django_datatables.server_side_filters import (
+    ServerPivotFilter,
+    ServerSelect2Filter,
+    ServerTagFilter,
+    ServerTotalsFilter,
+)
+
+
+class FacetTotalsMixin:
+    """Pivot filter counts for server side tables that keep the unfiltered totals between requests.
+
+    The totals only depend on the report's own filters, so toggling a pivot value just runs the GROUP BY on the
+    filtered rows. When nothing is filtered the totals are used for both counts.
+    """
+
+    def get_facet_queryset(self, base_queryset, filtered_queryset):
+        return filtered_queryset
+
+    def count_facets(self, queryset):
+        return [
+            (row[self.field], self._facet_value(row))
+            for row in queryset.values(self.field).annotate(_facet_count=self._facet_annotation()).order_by()
+        ]
+
+    def get_facet_totals(self, base_queryset):
+        timeout = getattr(settings, 'REPORT_BUILDER_FACET_TOTALS_CACHE_TIMEOUT', 60)
+        if not timeout:
+            return self.count_facets(base_queryset)
+        try:
+            sql, params = base_queryset.query.sql_with_params()
+        except EmptyResultSet:
+            return []
+        key = hashlib.md5(f'{self.field}|{self._facet_annotation()!r}|{sql}|{params!r}'.encode()).hexdigest()
+        cache_key = f'advanced_report_builder:facet_totals:{key}'
+        totals = cache.get(cache_key)
+        if totals is None:
+            totals = self.count_facets(base_queryset)
+            cache.set(cache_key, totals, timeout)
+        return totals
+
+    def get_facets(self, base_queryset, filtered_queryset):
+        totals = self.get_facet_totals(base_queryset)
+        if len(totals) > self.max_facet_values:
+            return None
+        if filtered_queryset is base_queryset:
+            counts = totals
+        else:
+            counts = self.count_facets(self.get_facet_queryset(base_queryset, filtered_queryset))
+        facets = {}
+        for value, total in totals:
+            facets.setdefault(self.value_to_key(value), [0, 0])[1] += total
+        for value, count in counts:
+            facets.setdefault(self.value_to_key(value), [0, 0])[0] += count
+        return facets
+
+
+class ReportPivotFilter(FacetTotalsMixin, ServerPivotFilter):
+    pass
+
+
+class ReportSelect2Filter(FacetTotalsMixin, ServerSelect2Filter):
+    pass
+
+
+class ReportTotalsFilter(FacetTotalsMixin, ServerTotalsFilter):
+    pass
+
+
+class ReportTagFilter(FacetTotalsMixin, ServerTagFilter):
+    def get_facet_queryset(self, base_queryset, filtered_queryset):
+        # the tag filter joins to the tags it matched, so count every tag of the matching rows
+        return base_queryset.filter(pk__in=filtered_queryset.values('pk'))
@@ -0,0 +1,216 @@
+import json
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import DatabaseError, connections
+from django.db.models import Q
+from django.template.loader import render_to_string
+from django_datatables.datatables.server_side import ServerSideTable
+
+from advanced_report_builder.models import TableReport
+from advanced_report_builder.search import search_queryset
+from advanced_report_builder.views.datatables.facets import (
+    ReportPivotFilter,
+    ReportSelect2Filter,
+    ReportTagFilter,
+    ReportTotalsFilter,
+)
+from advanced_report_builder.views.datatables.tables import ColumnBatchMixin
+
+
+class KeysetPaginationPlugin:
+    """Remembers the first and last row of each page and sends them with the next or previous page request."""
+
+    def __init__(self, datatable):
+        self.datatable = datatable
+
+    def render(self):
+        return render_to_string(
+            'advanced_report_builder/datatables/keyset_pagination_plugin.html',
+            {'datatable': self.datatable},
+        )
+
+
+class KeysetTable(ColumnBatchMixin, ServerSideTable):
+    """Server side table that pages by seeking from the rows either side of the current page.
+
+    When the table is ordered by keyset_field the next page is fetched with
+    WHERE (keyset_field, pk) > (last value, last pk) rather than an OFFSET, so the thousandth page costs the same as
+    the first when keyset_field is indexed. Any other ordering, or jumping to a page that is not next to the current
+    one, falls back to an OFFSET.
+
+    With estimated_count_threshold set, PostgreSQL's row estimate for the query is used in place of the exact counts
+    once it reaches the threshold. The plugin shows these as "about N rows" with a link to count them exactly.
+
+    Pivot counts are worked out with GROUP BY queries on the server, see FacetTotalsMixin.
+
+    With search_type set to trigram or full text the search box only searches search_paths, see search_queryset.
+    """
+
+    server_js_filters = {
+        **ServerSideTable.server_js_filters,
+        'pivot': ReportPivotFilter,
+        'select2': ReportSelect2Filter,
+        'tag': ReportTagFilter,
+        'totals': ReportTotalsFilter,
+    }
+
+    keyset_field = None
+    # when set, row counts at or above this come from the query planner's estimate rather than COUNT(*)
+    estimated_count_threshold = None
+    # a TableReport.SearchType other than CONTAINS, with the text fields it searches
+    search_type = None
+    search_paths = ()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.add_plugin(KeysetPaginationPlugin)
+
+    @staticmethod
+    def can_seek(model, field_name):
+        """Returns True if field_name is an indexed, not null column of the model."""
+        try:
+            field = model._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            return False
+        if not field.concrete or field.is_relation or field.null:
+            return False
+        if field.primary_key or field.unique or field.db_index:
+            return True
+        return any(index.fields and index.fields[0].lstrip('-') == field_name for index in model._meta.indexes)
+
+    def get_seek_descending(self, ordering):
+        """Returns whether the seek runs descending, or None if the ordering is not the keyset field."""
+        if self.keyset_field is None or len(ordering) != 1 or ordering[0].lstrip('-') != self.keyset_field:
+            return None
+        return ordering[0].startswith('-')
+
+    def get_cursor(self, post_data, key):
+        try:
+            value, pk = json.loads(post_data.get(key) or 'null')
+            return (
+                self.model._meta.get_field(self.keyset_field).to_python(value),
+                self.model._meta.pk.to_python(pk),
+            )
+        except (TypeError, ValueError, ValidationError):
+            return None
+
+    def get_cursor_values(self, row):
+        pk_name = self.model._meta.pk.name
+        if self.keyset_field not in row or pk_name not in row:
+            return None
+        return [row[self.keyset_field], row[pk_name]]
+
+    def seek(self, queryset, post_data, descending, start, length):
+        """Returns the rows of the page, seeking from the cursor sent by the plugin when there is one."""
+        pk_name = self.model._meta.pk.name
+        after = self.get_cursor(post_data, 'keyset_after')
+        before = None if after else self.get_cursor(post_data, 'keyset_before')
+        prefix = '-' if descending else ''
+
+        if after is None and before is None:
+            queryset = queryset.order_by(f'{prefix}{self.keyset_field}', f'{prefix}{pk_name}')
+            return list(queryset[start : start + length])
+
+        # going back a page walks the ordering in reverse, then puts the rows the right way round
+        greater = (after is not None) != descending
+        lookup = 'gt' if greater else 'lt'
+        value, pk = after or before
+        queryset = queryset.filter(
+            Q(**{f'{self.keyset_field}__{lookup}': value}) | Q(**{self.keyset_field: value, f'{pk_name}__{lookup}': pk})
+        )
+        prefix = '' if greater else '-'
+        rows = list(queryset.order_by(f'{prefix}{self.keyset_field}', f'{prefix}{pk_name}')[:length])
+        if before is not None:
+            rows.reverse()
+        return rows
+
+    @staticmethod
+    def get_page(queryset, start, length):
+        """Returns the rows of the page with an OFFSET, for orderings that can't seek."""
+        return list(queryset[start : start + length])
+
+    def get_count(self, queryset, post_data):
+        """Returns the number of rows and whether it is the planner's estimate rather than an exact count."""
+        if self.estimated_count_threshold is not None and post_data.get('exact_count') != '1':
+            estimate = self.estimate_count(queryset)
+            if estimate is not None and estimate >= self.estimated_count_threshold:
+                return estimate, True
+        return queryset.count(), False
+
+    @staticmethod
+    def estimate_count(queryset):
+        """Returns PostgreSQL's estimate of the rows the queryset returns, or None on other databases."""
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return None
+        sql, params = queryset.query.sql_with_params()
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+                plan = cursor.fetchone()[0]
+        except DatabaseError:
+            return None
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    def _apply_global_search(self, queryset, search_value):
+        if not self.search_paths or (
+            self.search_type == TableReport.SearchType.FULL_TEXT and connections[queryset.db].vendor != 'postgresql'
+        ):
+            return super()._apply_global_search(queryset, search_value)
+        return search_queryset(
+            queryset=queryset, paths=self.search_paths, value=search_value, search_type=self.search_type
+        )
+
+    def get_server_side_json(self, request, queryset, post_data):
+        draw = int(post_data.get('draw', 1))
+        start = max(int(post_data.get('start', 0)), 0)
+        length = int(post_data.get('length', 25))
+        max_page = self.max_records or 500
+        length = max_page if length < 0 else min(length, max_page)
+
+        base_queryset = queryset
+        records_total, total_estimated = self.get_count(queryset=queryset, post_data=post_data)
+        search_value = post_data.get('search[value]', '').strip()
+        if search_value:
+            queryset = self._apply_global_search(queryset, search_value)
+        queryset = self._apply_column_searches(queryset, post_data)
+        queryset, _ = self._apply_js_filters(queryset, self._parse_js_filter_state(post_data))
+        # each filter returns the same queryset when it has nothing to apply
+        if queryset is base_queryset:
+            records_filtered, filtered_estimated = records_total, total_estimated
+        else:
+            records_filtered, filtered_estimated = self.get_count(queryset=queryset, post_data=post_data)
+
+        ordering = self._build_ordering(post_data)
+        descending = self.get_seek_descending(ordering)
+        if descending is not None:
+            page_data = self.seek(
+                queryset=queryset, post_data=post_data, descending=descending, start=start, length=length
+            )
+        else:
+            if ordering:
+                queryset = queryset.order_by(*ordering)
+            page_data = self.get_page(queryset=queryset, start=start, length=length)
+
+        result = {
+            'draw': draw,
+            'recordsTotal': records_total,
+            'recordsFiltered': records_filtered,
+            'data': self.get_table_array(request, page_data),
+        }
+        if total_estimated or filtered_estimated:
+            result['count_estimated'] = True
+        if descending is not None and page_data:
+            result['keyset'] = {
+                'first': self.get_cursor_values(page_data[0]),
+                'last': self.get_cursor_values(page_data[-1]),
+            }
+        if post_data.get('need_facets') == '1' or draw == 1:
+            facets = self._build_facets(base_queryset, queryset)
+            if facets:
+                result['facets'] = facets
+        if self.ajax_commands:
+            result['ajax_commands'] = self.ajax_commands
+        return json.dumps(result, separators=(',', ':'), default=str)
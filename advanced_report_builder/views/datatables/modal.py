@@ -119,6 +119,31 @@ class TableModal(MultiQueryModalMixin, QueryBuilderModalBase):
                 )
             },
         ),
+        (
+            'keyset_pagination',
+            {
+                'widget': Toggle(
+                    attrs={
+                        'data-onstyle': 'success',
+                        'data-on': 'YES',
+                        'data-off': 'NO',
+                    }
+                )
+            },
+        ),
+        (
+            'estimated_count',
+            {
+                'widget': Toggle(
+                    attrs={
+                        'data-onstyle': 'success',
+                        'data-on': 'YES',
+                        'data-off': 'NO',
+                    }
+                )
+            },
+        ),
+        'search_type',
         'report_type',
         'report_tags',
         'table_fields',
@@ -203,6 +228,15 @@ class TableModal(MultiQueryModalMixin, QueryBuilderModalBase):
                 'allow_new_version',
                 template='django_modals/fields/label_checkbox.html',
             ),
+            FieldEx(
+                'keyset_pagination',
+                template='django_modals/fields/label_checkbox.html',
+            ),
+            FieldEx(
+                'estimated_count',
+                template='django_modals/fields/label_checkbox.html',
+            ),
+            'search_type',
             FieldEx(
                 'table_fields',
                 template='advanced_report_builder/select_column.html',
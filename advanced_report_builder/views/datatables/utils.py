@@ -5,6 +5,7 @@ from django.db.models import ExpressionWrapper, F, FloatField, Q
 from django.db.models.functions import NullIf
 from django.template import Context, Template, TemplateSyntaxError
 from django_datatables.columns import ColumnBase
+from django_datatables.datatables.server_side import ServerSideTable
 from django_datatables.helpers import render_replace
 from django_datatables.plugins.column_totals import ColumnTotals
 
@@ -15,6 +16,7 @@ from advanced_report_builder.column_types import (
     NUMBER_FIELDS,
     REVERSE_FOREIGN_KEY_BOOL_COLUMNS,
     REVERSE_FOREIGN_KEY_CHOICE_COLUMNS,
+    REVERSE_FOREIGN_KEY_COLUMNS,
     REVERSE_FOREIGN_KEY_DATE_COLUMNS,
     REVERSE_FOREIGN_KEY_STR_COLUMNS,
 )
@@ -392,6 +394,7 @@ class TableUtilsMixin(ReportUtilsMixin):
         if not has_annotations and len(report_builder_class.default_columns) > 0:
             table.add_columns(*report_builder_class.default_columns)
         table.add_columns(*fields)
+        self.use_reverse_foreign_key_subqueries(table=table)
         table.show_pivot_table = False
         if pivot_fields is not None:
             for pivot_field in pivot_fields:
@@ -414,6 +417,10 @@ class TableUtilsMixin(ReportUtilsMixin):
                 pivot_data_attr = split_attr(pivot_field)
                 if 'collapsed' in pivot_data_attr:
                     pivot_kwargs['collapsed'] = pivot_data_attr['collapsed'] == '1'
+                if isinstance(table, ServerSideTable) and 'server_side_field' in pivot_field_details:
+                    # the path from the table's model to the values, for pivots on columns worked out in python
+                    include_path = pivot_field_data['id'][: -len(pivot_field_details['field'])]
+                    pivot_kwargs['field'] = include_path + pivot_field_details['server_side_field']
                 table.add_js_filters(
                     pivot_field_details['type'],
                     pivot_field_data['id'],
@@ -425,6 +432,29 @@ class TableUtilsMixin(ReportUtilsMixin):
             totals[first_field_name] = {'text': 'Totals'}
             table.add_plugin(self.column_totals_class, totals)
 
+    @staticmethod
+    def use_reverse_foreign_key_subqueries(table):
+        """When the reverse foreign key columns are the only aggregates in the table, works each of them out in a
+        correlated subquery. The table's query is then not grouped, so it can be paged without first aggregating
+        every row, and several reverse foreign key columns no longer multiply the rows being grouped."""
+        reverse_columns = [
+            column for column in table.columns if isinstance(column, REVERSE_FOREIGN_KEY_COLUMNS) and column.annotations
+        ]
+        if not reverse_columns or table.initial_values:
+            return
+        for column in table.columns:
+            if isinstance(column, REVERSE_FOREIGN_KEY_COLUMNS):
+                continue
+            annotations = column.get_annotations(**table.kwargs) or {}
+            if (
+                column.annotations_value
+                or column.aggregations
+                or any(getattr(annotation, 'contains_aggregate', False) for annotation in annotations.values())
+            ):
+                return
+        for column in reverse_columns:
+            column.use_subquery(model=table.model)
+
     def get_number_fields(
         self,
         field_name,
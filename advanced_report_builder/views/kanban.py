@@ -1,17 +1,22 @@
 import json
 from calendar import monthrange
+from collections import defaultdict
 from datetime import date, datetime, timedelta
 
 from django.conf import settings
-from django.db.models import Q
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, FloatField, Q, Sum
+from django.db.models.sql.datastructures import Join
 from django.forms import CharField, ChoiceField
-from django.http import JsonResponse
+from django.http import Http404, HttpResponseBadRequest, JsonResponse
 from django.shortcuts import get_object_or_404
 from django.template import Context, Template, TemplateSyntaxError
 from django.urls import reverse
+from django.utils.formats import number_format
+from django.utils.safestring import mark_safe
 from django.views.generic import TemplateView
 from django_datatables.columns import ColumnBase, MenuColumn
-from django_datatables.datatables import DatatableExcludedRow
 from django_datatables.helpers import DUMMY_ID, row_link
 from django_datatables.widgets import DataTableReorderWidget
 from django_menus.menu import HtmlMenu, MenuItem
@@ -22,9 +27,11 @@ from django_modals.modals import Modal, ModelFormModal
 from django_modals.processes import PERMISSION_OFF, PROCESS_EDIT_DELETE
 from django_modals.widgets.select2 import Select2, Select2Multiple
 
+from advanced_report_builder.column_types import NUMBER_FIELDS
 from advanced_report_builder.columns import ReportBuilderNumberColumn
 from advanced_report_builder.data_merge.utils import DataMergeUtils
 from advanced_report_builder.data_merge.widget import DataMergeWidget
+from advanced_report_builder.exceptions import ReportError
 from advanced_report_builder.filter_query import FilterQueryMixin
 from advanced_report_builder.globals import (
     DATE_FORMAT_TYPE_DD_MM_YY_SLASH,
@@ -40,7 +47,6 @@ from advanced_report_builder.models import (
 from advanced_report_builder.toggle import RBToggle
 from advanced_report_builder.utils import (
     crispy_modal_link_args,
-    get_report_builder_class,
 )
 from advanced_report_builder.variable_date import VariableDate
 from advanced_report_builder.views.charts_base import ChartJSTable
@@ -66,28 +72,125 @@ class DescriptionColumn(ColumnBase):
 
 
 class KanbanTable(ChartJSTable):
-    def get_table_array(self, request, results):
-        result_processes = self.get_result_processes()
-        for p in result_processes:
-            p.setup_results(request, self.page_results)
-        for c in self.columns:
-            c.setup_results(request, self.page_results)
-        results_list = []
-        for data_dict in results:
+    """The cards of a lane. With card_limit set only that many cards are fetched at a time.
+
+    When the lane is ordered by a field that is never null the next cards are fetched with
+    WHERE (seek_field, pk) > (last value, last pk), so loading more costs the same however far down the lane it is.
+    Otherwise they are fetched with an OFFSET. The cursor is the [value, pk] of the last card or the offset.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.card_limit = None
+        self.seek_field = None
+        self.seek_descending = False
+        self.cursor = None
+        self.next_cursor = None
+        self.total_count = None
+        self.sum_field = None
+        self.sum_divisor = 1
+        self.sum_decimal_places = 0
+        self.sum_total = None
+        super().__init__(*args, **kwargs)
+
+    def get_column_values(self, column, rows, excluded):
+        if isinstance(column, DescriptionColumn):
+            return self.get_row_results(
+                rows,
+                excluded,
+                lambda data_dict: column.row_result(data_dict, self.page_results, columns=self.columns),
+            )
+        return super().get_column_values(column, rows, excluded)
+
+    @staticmethod
+    def get_seek_field(model, field_path):
+        """Returns the field at the end of field_path if neither it nor any relation on the way can be null."""
+        field = None
+        for name in field_path.split('__'):
             try:
-                for p in result_processes:
-                    p.row_result(data_dict, self.page_results)
-                row_data = []
-                for column in self.columns:
-                    if isinstance(column, DescriptionColumn):
-                        row_data.append(column.row_result(data_dict, self.page_results, columns=self.columns))
-                    else:
-                        row_data.append(column.row_result(data_dict, self.page_results))
+                field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                return None
+            if not field.concrete or field.null:
+                return None
+            if field.is_relation:
+                model = field.related_model
+        if field is None or field.is_relation:
+            return None
+        return field
+
+    def set_card_limit(self, card_limit, order_by_field, ascending):
+        self.card_limit = card_limit
+        pk_name = self.model._meta.pk.name
+        seek_field = order_by_field or pk_name
+        if self.get_seek_field(self.model, seek_field) is not None:
+            self.seek_field = seek_field
+            self.seek_descending = not ascending
+        for field in dict.fromkeys((seek_field, pk_name)):
+            if field not in self.fields():
+                self.add_columns(f'.{field}')
+
+    def get_cursor(self, cursor):
+        """Returns the cursor sent back by "load more" as the seek field's value and pk, or as an offset."""
+        try:
+            if self.seek_field is None:
+                return max(int(cursor), 0)
+            value, pk = cursor
+            return (
+                self.get_seek_field(self.model, self.seek_field).to_python(value),
+                self.model._meta.pk.to_python(pk),
+            )
+        except (TypeError, ValueError, ValidationError):
+            return None
+
+    def get_cards(self, query):
+        """Returns the card_limit cards after the cursor, setting next_cursor when there are more."""
+        pk_name = self.model._meta.pk.name
+        cursor = self.get_cursor(self.cursor) if self.cursor is not None else None
+        if self.seek_field is None:
+            offset = cursor or 0
+            rows = list(query.order_by(*self.order_by, pk_name)[offset : offset + self.card_limit + 1])
+        else:
+            prefix = '-' if self.seek_descending else ''
+            if cursor is not None:
+                lookup = 'lt' if self.seek_descending else 'gt'
+                value, pk = cursor
+                query = query.filter(
+                    Q(**{f'{self.seek_field}__{lookup}': value})
+                    | Q(**{self.seek_field: value, f'{pk_name}__{lookup}': pk})
+                )
+            rows = list(query.order_by(f'{prefix}{self.seek_field}', f'{prefix}{pk_name}')[: self.card_limit + 1])
 
-                results_list.append(row_data)
-            except DatatableExcludedRow:
-                pass
-        return results_list
+        self.next_cursor = None
+        if len(rows) > self.card_limit:
+            rows = rows[: self.card_limit]
+            if self.seek_field is None:
+                self.next_cursor = offset + self.card_limit
+            else:
+                self.next_cursor = [rows[-1][self.seek_field], rows[-1][pk_name]]
+        return rows
+
+    def get_raw_data(self):
+        if self.raw_data is None:
+            results = self.get_query()
+            if self.card_limit:
+                results = self.get_cards(results)
+            self.raw_data = self.get_table_array(self.kwargs.get('request'), results)
+        return self.raw_data
+
+    def get_total_count(self):
+        """Returns the number of cards in the lane, including those not loaded yet."""
+        if self.total_count is None:
+            self.total_count = self.get_query().count() if self.card_limit else len(self.get_raw_data())
+        return self.total_count
+
+    def get_sum_display(self):
+        return number_format(
+            (self.sum_total or 0) / self.sum_divisor, decimal_pos=self.sum_decimal_places, force_grouping=True
+        )
+
+    def next_cursor_json(self):
+        self.get_raw_data()
+        return mark_safe(json.dumps(self.next_cursor, cls=DjangoJSONEncoder))
 
 
 class KanbanView(DataMergeUtils, ReportBase, FilterQueryMixin, TemplateView):
@@ -135,7 +238,9 @@ class KanbanView(DataMergeUtils, ReportBase, FilterQueryMixin, TemplateView):
     ):
         table = self.chart_js_table(model=base_model)
 
-        report_builder_class = get_report_builder_class(model=base_model, report_type=kanban_report_lane.report_type)
+        report_builder_class = self.report_context.get_report_builder_class(
+            model=base_model, report_type=kanban_report_lane.report_type
+        )
         table_indexes = []
 
         if kanban_report_lane.heading_field is not None:
@@ -194,6 +299,21 @@ class KanbanView(DataMergeUtils, ReportBase, FilterQueryMixin, TemplateView):
             else:
                 table.order_by = [f'-{kanban_report_lane.order_by_field}']
 
+        table.kanban_report_lane_id = kanban_report_lane.id
+        if kanban_report_lane.sum_field:
+            self.set_sum_field(
+                table=table,
+                base_model=base_model,
+                field=kanban_report_lane.sum_field,
+                report_builder_class=report_builder_class,
+            )
+        if kanban_report_lane.card_limit:
+            table.set_card_limit(
+                card_limit=kanban_report_lane.card_limit,
+                order_by_field=kanban_report_lane.order_by_field,
+                ascending=kanban_report_lane.order_by_ascending,
+            )
+
         table.query_data = kanban_report_lane.query_data
         table.extra_query_filter = extra_query_filter
         table.view_filter = self.view_filter_extra
@@ -206,6 +326,23 @@ class KanbanView(DataMergeUtils, ReportBase, FilterQueryMixin, TemplateView):
             }
         )
 
+    def set_sum_field(self, table, base_model, field, report_builder_class):
+        django_field, col_type_override, _, _ = self.get_field_details(
+            base_model=base_model, field=field, report_builder_class=report_builder_class
+        )
+        if (
+            not isinstance(django_field, NUMBER_FIELDS)
+            or django_field.primary_key
+            or col_type_override is None
+            or col_type_override.annotations
+            or not isinstance(col_type_override.field, str)
+        ):
+            raise ReportError('not a number field')
+        table.sum_field = col_type_override.field
+        # currency columns store pence and show pounds
+        table.sum_divisor = getattr(col_type_override, 'divisor', 1)
+        table.sum_decimal_places = 2 if table.sum_divisor != 1 or isinstance(django_field, FloatField) else 0
+
     @staticmethod
     def get_multiple_date(multiple_type, current_date):
         if multiple_type in (
@@ -262,13 +399,22 @@ class KanbanView(DataMergeUtils, ReportBase, FilterQueryMixin, TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['title'] = self.get_title()
+        headings, lanes = self.get_lanes()
+        self.set_lane_totals(lanes)
+        context['kanban_report'] = self.chart_report
+        context['headings'] = headings
+        context['lanes'] = lanes
+        return context
+
+    def get_lanes(self):
+        """Returns the headings and the lanes of the board, a lane for each period of a lane with multiple set."""
         kanban_report_lanes = self.chart_report.kanbanreportlane_set.all()
         lanes = []
         headings = []
 
         for kanban_report_lane in kanban_report_lanes:
             base_model = kanban_report_lane.get_base_model()
-            report_builder_class = get_report_builder_class(
+            report_builder_class = self.report_context.get_report_builder_class(
                 model=base_model, report_type=kanban_report_lane.report_type
             )
             if kanban_report_lane.multiple_type == KanbanReportLane.MULTIPLE_TYPE_NA:
@@ -277,15 +423,14 @@ class KanbanView(DataMergeUtils, ReportBase, FilterQueryMixin, TemplateView):
                     kanban_report_lane=kanban_report_lane,
                     lanes=lanes,
                 )
-                headings.append({'label': kanban_report_lane.name, 'row_span': 2, 'col_span': 1})
+                headings.append({'label': kanban_report_lane.name, 'row_span': 2, 'col_span': 1, 'lane': lanes[-1]})
             else:
-                variable_date = VariableDate()
                 financial_year_start_month = self.get_financial_month()
-                start_date_and_time, _, _ = variable_date.get_variable_dates(
+                start_date_and_time, _, _ = self.report_context.get_variable_dates(
                     range_type=kanban_report_lane.multiple_start_period,
                     financial_year_start_month=financial_year_start_month,
                 )
-                _, end_date_and_time, _ = variable_date.get_variable_dates(
+                _, end_date_and_time, _ = self.report_context.get_variable_dates(
                     range_type=kanban_report_lane.multiple_end_period,
                     financial_year_start_month=financial_year_start_month,
                 )
@@ -352,10 +497,81 @@ class KanbanView(DataMergeUtils, ReportBase, FilterQueryMixin, TemplateView):
 
                 lanes += sub_lanes
 
-        context['kanban_report'] = self.chart_report
-        context['headings'] = headings
-        context['lanes'] = lanes
-        return context
+        for index, lane in enumerate(lanes):
+            lane['datatable'].lane_index = index
+            lane['datatable'].post_table_id = f'kanban_{self.dashboard_report.id}' if self.dashboard_report else ''
+        return headings, lanes
+
+    @staticmethod
+    def has_multi_valued_join(query):
+        return any(
+            isinstance(join, Join) and (join.join_field.one_to_many or join.join_field.many_to_many)
+            for join in query.query.alias_map.values()
+        )
+
+    def get_lane_filter(self, table):
+        """Returns the Q selecting the lane's cards from all of its base model's rows, or None for all of them.
+
+        A filter that annotates, or follows a relation to many rows, is returned as the pks its query matches so
+        its joins don't repeat the rows of the other lanes counted with it.
+        """
+        annotations = {}
+        lane_filter = self.process_filters(search_filter_data=table.query_data, annotations=annotations)
+        if table.extra_query_filter:
+            lane_filter = table.extra_query_filter & lane_filter if lane_filter else table.extra_query_filter
+        if not lane_filter:
+            return None
+        if annotations or self.has_multi_valued_join(table.model.objects.filter(lane_filter)):
+            return Q(pk__in=self.view_filter_extra(table.model.objects.all(), table).values('pk'))
+        return lane_filter
+
+    def set_lane_totals(self, lanes):
+        """Sets the card count and the sum field's total of the lanes showing them in their headings.
+
+        The lanes sharing a base model are totalled together in one query with a filtered Count and Sum for each
+        lane, so the headings don't need each lane's cards. A lane summing a field across a relation to many rows
+        is totalled in a query of its own.
+        """
+        aggregations = defaultdict(dict)
+        for index, lane in enumerate(lanes):
+            table = lane['datatable']
+            if not table.card_limit and not table.sum_field:
+                continue
+            lane_filter = self.get_lane_filter(table)
+            key = table.model
+            if table.sum_field:
+                if self.has_multi_valued_join(table.model.objects.values(table.sum_field)):
+                    key = (table.model, index)
+                aggregations[key][f'sum_{index}'] = Sum(table.sum_field, filter=lane_filter)
+            aggregations[key][f'count_{index}'] = Count('pk', filter=lane_filter, distinct=key != table.model)
+
+        totals = {}
+        for key, lane_aggregations in aggregations.items():
+            model = key[0] if isinstance(key, tuple) else key
+            totals.update(model.objects.aggregate(**lane_aggregations))
+        for index, lane in enumerate(lanes):
+            if f'count_{index}' in totals:
+                lane['datatable'].total_count = totals[f'count_{index}']
+                lane['datatable'].sum_total = totals.get(f'sum_{index}')
+
+    def post(self, request, *args, **kwargs):
+        """Returns the next cards of a lane for its "load more" button."""
+        try:
+            lane_index = int(request.POST['lane_index'])
+            kanban_report_lane_id = int(request.POST['kanban_report_lane'])
+            cursor = json.loads(request.POST['cursor'])
+        except (KeyError, ValueError):
+            return HttpResponseBadRequest()
+        _, lanes = self.get_lanes()
+        if not 0 <= lane_index < len(lanes) or lanes[lane_index]['kanban_report_lane'].id != kanban_report_lane_id:
+            raise Http404
+        table = lanes[lane_index]['datatable']
+        if not table.card_limit:
+            raise Http404
+        table.cursor = cursor
+        return JsonResponse(
+            {'data': table.get_raw_data(), 'cursor': table.next_cursor}, json_dumps_params={'separators': (',', ':')}
+        )
 
     def view_filter(self, query, table):
         if not table.query_data:
@@ -555,6 +771,8 @@ class KanbanLaneForm(QueryBuilderModelForm):
             'kanban_report_description',
             'order_by_field',
             'order_by_ascending',
+            'card_limit',
+            'sum_field',
             'multiple_type',
             'multiple_type_label',
             'multiple_type_date_field',
@@ -604,6 +822,7 @@ class KanbanLaneModal(QueryBuilderModalBase):
         if 'data' in _kwargs:
             heading_field = _kwargs['data'].get('heading_field')
             order_by_field = _kwargs['data'].get('order_by_field')
+            sum_field = _kwargs['data'].get('sum_field')
             multiple_type_date_field = _kwargs['data'].get('multiple_type_date_field')
             multiple_type_end_date_field = _kwargs['data'].get('multiple_type_end_date_field')
             background_colour_field = _kwargs['data'].get('background_colour_field')
@@ -618,6 +837,7 @@ class KanbanLaneModal(QueryBuilderModalBase):
         else:
             heading_field = form.instance.heading_field
             order_by_field = form.instance.order_by_field
+            sum_field = form.instance.sum_field
             report_type = form.instance.report_type
             multiple_type_date_field = form.instance.multiple_type_date_field
             multiple_type_end_date_field = form.instance.multiple_type_end_date_field
@@ -652,6 +872,14 @@ class KanbanLaneModal(QueryBuilderModalBase):
             report_type=report_type,
         )
 
+        self.setup_field(
+            field_type='number',
+            form=form,
+            field_name='sum_field',
+            selected_field_id=sum_field,
+            report_type=report_type,
+        )
+
         self.setup_field(
             field_type='date',
             form=form,
@@ -703,6 +931,8 @@ class KanbanLaneModal(QueryBuilderModalBase):
             'kanban_report_description',
             'order_by_field',
             'order_by_ascending',
+            'card_limit',
+            'sum_field',
             'multiple_type',
             'multiple_type_label',
             'multiple_type_date_field',
@@ -736,6 +966,13 @@ class KanbanLaneModal(QueryBuilderModalBase):
             search_string=kwargs.get('search'),
         )
 
+    def select2_sum_field(self, **kwargs):
+        return self.get_fields_for_select2(
+            field_type='number',
+            report_type=kwargs['report_type'],
+            search_string=kwargs.get('search'),
+        )
+
     def select2_multiple_type_date_field(self, **kwargs):
         return self.get_fields_for_select2(
             field_type='date',
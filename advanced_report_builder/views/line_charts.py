@@ -15,6 +15,7 @@ from django_modals.processes import PERMISSION_OFF, PROCESS_EDIT_DELETE
 from django_modals.widgets.colour_picker import ColourPickerWidget
 from django_modals.widgets.select2 import Select2Multiple
 
+from advanced_report_builder.downsample import downsample_rows
 from advanced_report_builder.exceptions import ReportError
 from advanced_report_builder.globals import (
     ANNOTATION_VALUE_DAY,
@@ -29,6 +30,7 @@ from advanced_report_builder.utils import (
     decode_attribute,
     encode_attribute,
     get_report_builder_class,
+    make_slug_str,
     split_attr,
 )
 from advanced_report_builder.views.charts_base import (
@@ -44,7 +46,17 @@ from advanced_report_builder.views.query_modal.mixin import MultiQueryModalMixin
 
 
 class LineChartJSTable(ChartJSTable):
+    def __init__(self, *args, **kwargs):
+        self.max_points = kwargs.pop('max_points', None)
+        super().__init__(*args, **kwargs)
+
     def get_table_array(self, request, results):
+        results = self.get_filled_table_array(request, results)
+        if self.max_points:
+            results = downsample_rows(results, self.max_points)
+        return results
+
+    def get_filled_table_array(self, request, results):
         results = super().get_table_array(request, results)
         if len(results) == 0:
             return results
@@ -55,6 +67,9 @@ class LineChartJSTable(ChartJSTable):
             next_date = datetime.strptime(results[0][0], '%Y-%m-%d').date()
         except ValueError as e:
             raise ReportError(e)
+        if self.since is not None:
+            # fill from the period asked for, so the periods without rows still replace the ones the chart holds
+            next_date = min(next_date, self.since)
 
         new_results = []
         for record in results:
@@ -96,6 +111,8 @@ class LineChartJSTable(ChartJSTable):
 
 class LineChartView(ChartBaseView):
     chart_js_table = LineChartJSTable
+    cache_closed_periods = True
+    refreshes_itself = True
 
     def dispatch(self, request, *args, **kwargs):
         self.report = kwargs.get('report')
@@ -135,7 +152,35 @@ class LineChartView(ChartBaseView):
 
         if getattr(self.chart_report, 'has_targets', False):
             targets = self.chart_report.targets
-        self.table = self.chart_js_table(model=base_model, axis_scale=axis_scale, targets=targets)
+        self.table = self.chart_js_table(
+            model=base_model,
+            axis_scale=axis_scale,
+            targets=targets,
+            max_points=None if self.show_full_resolution() else self.chart_report.max_points,
+        )
+
+    def get_full_resolution_slug(self):
+        full_resolution_slug = f'full{self.chart_report.id}'
+        if self.dashboard_report is not None:
+            full_resolution_slug += f'_{self.dashboard_report.id}'
+        return full_resolution_slug
+
+    def show_full_resolution(self):
+        return self.slug.get(self.get_full_resolution_slug()) == '1'
+
+    def chart_option_menus(self):
+        if not self.chart_report.max_points:
+            return []
+        full_resolution = self.show_full_resolution()
+        slug_str = make_slug_str(self.slug, overrides={self.get_full_resolution_slug(): 0 if full_resolution else 1})
+        return [
+            MenuItem(
+                url=self.request.resolver_match.view_name,
+                url_slug=slug_str,
+                menu_display='Downsample' if full_resolution else 'Full resolution',
+                css_classes='btn-secondary',
+            )
+        ]
 
 
 class LineChartModal(MultiQueryModalMixin, QueryBuilderModalBase):
@@ -165,6 +210,7 @@ class LineChartModal(MultiQueryModalMixin, QueryBuilderModalBase):
         'x_label',
         'y_label',
         'show_totals',
+        'max_points',
         'has_targets',
         'targets',
     ]
@@ -221,6 +267,7 @@ class LineChartModal(MultiQueryModalMixin, QueryBuilderModalBase):
             'x_label',
             'y_label',
             'show_totals',
+            'max_points',
             'has_targets',
             'targets',
         ]
@@ -2,19 +2,21 @@ import contextlib
 import json
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 from datetime import datetime, timedelta
+from functools import partial
 
 from crispy_forms.layout import HTML
 from django.conf import settings
 from django.core.exceptions import FieldDoesNotExist, FieldError
+from django.db import connections
 from django.forms import CharField, ChoiceField, ModelChoiceField
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
 from django.utils.html import escape
 from django_datatables.columns import ColumnBase, MenuColumn
-from django_datatables.datatables import DatatableTable
 from django_datatables.helpers import DUMMY_ID
 from django_datatables.widgets import DataTableWidget
 from django_menus.menu import HtmlMenu, MenuItem
@@ -55,6 +57,7 @@ from advanced_report_builder.record_nav import RecordNavPlugin
 from advanced_report_builder.toggle import RBToggle
 from advanced_report_builder.utils import crispy_modal_link_args, excel_column_name, get_report_builder_class
 from advanced_report_builder.variable_date import VariableDate
+from advanced_report_builder.views.breakdown import BreakdownModalMixin
 from advanced_report_builder.views.charts_base import ChartJSTable
 from advanced_report_builder.views.datatables.modal import TableFieldForm, TableFieldModal
 from advanced_report_builder.views.datatables.utils import TableUtilsMixin
@@ -522,6 +525,7 @@ class MultiValueReportCellForm(QueryBuilderModelForm):
             'average_scale',
             'average_start_period',
             'average_end_period',
+            'working_day_calendar',
             'query_data',
             'extra_query_data',
         ]
@@ -655,6 +659,11 @@ class MultiValueReportCellModal(MultiQueryModalMixin, QueryBuilderModalBase):
                     'values': {MultiValueReportCell.MultiValueType.AVERAGE_SUM_OVER_TIME: 'show'},
                     'default': 'hide',
                 },
+                {
+                    'selector': '#div_id_working_day_calendar',
+                    'values': {MultiValueReportCell.MultiValueType.AVERAGE_SUM_OVER_TIME_EXCLUDING_WEEKENDS: 'show'},
+                    'default': 'hide',
+                },
                 {
                     'selector': '#div_id_report_type',
                     'values': {
@@ -844,6 +853,7 @@ class MultiValueReportCellModal(MultiQueryModalMixin, QueryBuilderModalBase):
             'average_scale',
             'average_start_period',
             'average_end_period',
+            'working_day_calendar',
             FieldEx(
                 'breakdown_fields',
                 template='advanced_report_builder/select_column.html',
@@ -1091,6 +1101,7 @@ class MultiValueView(ValueBaseView):
     number_field = ReportBuilderNumberColumn
     template_name = 'advanced_report_builder/multi_values/report.html'
     chart_js_table = ChartJSTable
+    serves_chart_data = False
 
     def __init__(self, *args, **kwargs):
         self.current_multi_value_report_cell = None
@@ -1163,6 +1174,7 @@ class MultiValueView(ValueBaseView):
         table_data = [[None for _ in range(self.chart_report.columns)] for _ in range(self.chart_report.rows)]
         exp = ExpressionBuilder()
         multi_value_report_equations = []
+        evaluated_cells = []
         for multi_value_report_cell in multi_value_report_cells:
             cell_name = excel_column_name(multi_value_report_cell.column, row=multi_value_report_cell.row)
 
@@ -1171,15 +1183,11 @@ class MultiValueView(ValueBaseView):
             if table_data[row][column] is not None:
                 continue
 
+            table_data[row][column] = {'value': '', 'cell': multi_value_report_cell, 'append_str': ''}
             if multi_value_report_cell.multi_value_type == MultiValueReportCell.MultiValueType.EQUATION:
                 multi_value_report_equations.append((cell_name, multi_value_report_cell))
-                value, append_str = '', ''
             else:
-                value, append_str = self._evaluate_cell(
-                    multi_value_report_cell=multi_value_report_cell, cell_name=cell_name, exp=exp
-                )
-
-            table_data[row][column] = {'value': value, 'cell': multi_value_report_cell, 'append_str': append_str}
+                evaluated_cells.append((cell_name, multi_value_report_cell, table_data[row][column]))
 
             if multi_value_report_cell.row_span > 1 or multi_value_report_cell.col_span > 1:
                 for row_offset in range(multi_value_report_cell.row_span):
@@ -1190,17 +1198,62 @@ class MultiValueView(ValueBaseView):
 
                         table_data[row + row_offset][column + col_offset] = {'value': None}
 
+        results = self._compute_cells([(cell_name, cell) for cell_name, cell, _ in evaluated_cells])
+        for (cell_name, _, cell_data), (value, append_str, expression_value) in zip(
+            evaluated_cells, results, strict=True
+        ):
+            cell_data['value'] = value
+            cell_data['append_str'] = append_str
+            if expression_value is not None:
+                exp.add_to_global(name=cell_name, value=expression_value)
+
         self._resolve_equations(table_data=table_data, equations=multi_value_report_equations, exp=exp)
 
         context['html'] = self.render_html(table_data=table_data)
         return context
 
+    def _compute_cells(self, cells):
+        """Compute the (cell_name, cell) pairs, returning a (value, append_str, expression_value) for each.
+
+        With REPORT_BUILDER_MULTI_VALUE_WORKERS above 1 the cells are computed in a pool of that many
+        threads, each with its own database connections, so the grid takes as long as its slowest
+        cell rather than the sum of them. Inside a transaction the cells are computed one after
+        another, as other connections can't see its uncommitted rows.
+        """
+        workers = min(getattr(settings, 'REPORT_BUILDER_MULTI_VALUE_WORKERS', 1), len(cells))
+        if workers <= 1 or any(connection.in_atomic_block for connection in connections.all(initialized_only=True)):
+            return [self._compute_cell(multi_value_report_cell=cell, cell_name=cell_name) for cell_name, cell in cells]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='multi_value') as executor:
+            return list(executor.map(lambda cell: self._compute_cell_in_thread(*cell), cells))
+
+    def _compute_cell_in_thread(self, cell_name, multi_value_report_cell):
+        try:
+            return self._compute_cell(multi_value_report_cell=multi_value_report_cell, cell_name=cell_name)
+        except Exception as e:  # noqa: BLE001 - an error can't be raised to the request from the pool
+            return self._cell_error(cell_name, e), '', None
+        finally:
+            # the thread's connections aren't closed at the end of the request like the request's are
+            connections.close_all()
+
     def _evaluate_cell(self, multi_value_report_cell, cell_name, exp):
         """Compute a single (non-equation) cell's display value and trailing symbol.
 
         Extracted so the fixed grid and the dynamic-row grid share identical cell semantics. Feeds
         the cell's numeric result into the expression builder so equation cells can reference it.
         """
+        value, append_str, expression_value = self._compute_cell(
+            multi_value_report_cell=multi_value_report_cell, cell_name=cell_name
+        )
+        if expression_value is not None:
+            exp.add_to_global(name=cell_name, value=expression_value)
+        return value, append_str
+
+    def _compute_cell(self, multi_value_report_cell, cell_name):
+        """Compute a cell's display value and trailing symbol, and the value equation cells see for it.
+
+        Only reads from the view, so cells can be computed at the same time. The value for equations
+        is None when the cell has none.
+        """
         base_model = multi_value_report_cell.get_base_model()
         value = ''
         append_str = ''
@@ -1243,14 +1296,17 @@ class MultiValueView(ValueBaseView):
                 MultiValueReportCell.MultiValueType.AVERAGE_SUM_OVER_TIME_EXCLUDING_WEEKENDS,
             ]:
                 exclude_weekdays = None
+                working_day_calendar = None
                 if multi_value_type == MultiValueReportCell.MultiValueType.AVERAGE_SUM_OVER_TIME_EXCLUDING_WEEKENDS:
                     exclude_weekdays = [1, 7]
+                    working_day_calendar = multi_value_report_cell.working_day_calendar
 
                 divider = self.get_period_divider(
                     annotation_value_choice=multi_value_report_cell.average_scale,
                     start_date_type=multi_value_report_cell.average_start_period,
                     end_date_type=multi_value_report_cell.average_end_period,
                     exclude_weekdays=exclude_weekdays,
+                    working_day_calendar=working_day_calendar,
                 )
                 self._process_aggregations(
                     field=multi_value_report_cell.field,
@@ -1290,9 +1346,10 @@ class MultiValueView(ValueBaseView):
         except Exception as e:  # noqa: BLE001 - contain a bad cell rather than 500-ing the whole grid
             value = self._cell_error(cell_name, e)
 
+        expression_value = None
         if fields:
             try:
-                value, raw_value = self.render_value(
+                value, expression_value = self.render_value(
                     base_model=base_model, fields=fields, multi_value_report_cell=multi_value_report_cell
                 )
             # A cell that fails to render (e.g. a non-aggregatable field wrongly summed) must not
@@ -1300,18 +1357,13 @@ class MultiValueView(ValueBaseView):
             # reference (e.g. "B2") so it is clear which cell failed.
             except Exception as e:  # noqa: BLE001
                 value = self._cell_error(cell_name, e)
-                raw_value = None
-            if raw_value is not None:
-                with contextlib.suppress(ValueError):
-                    raw_value = float(raw_value)
-                exp.add_to_global(name=cell_name, value=raw_value)
         elif value is not None:
             expression_value = value
+        if expression_value is not None:
             with contextlib.suppress(ValueError):
                 expression_value = float(expression_value)
-            exp.add_to_global(name=cell_name, value=expression_value)
 
-        return value, append_str
+        return value, append_str, expression_value
 
     @staticmethod
     def _resolve_equations(table_data, equations, exp):
@@ -1599,11 +1651,13 @@ class MultiValueView(ValueBaseView):
             )
         ]
 
-    def extra_filters(self, query):
-        query_data = self.current_multi_value_report_cell.query_data
+    def extra_filters(self, query, multi_value_report_cell=None):
+        if multi_value_report_cell is None:
+            multi_value_report_cell = self.current_multi_value_report_cell
+        query_data = multi_value_report_cell.query_data
         extra_filter_data = None
-        if self.current_multi_value_report_cell.multi_value_held_query is not None:
-            extra_filter_data = self.current_multi_value_report_cell.multi_value_held_query.query
+        if multi_value_report_cell.multi_value_held_query is not None:
+            extra_filter_data = multi_value_report_cell.multi_value_held_query.query
         if query_data:
             query = self.process_query_filters(
                 query=query, search_filter_data=query_data, extra_filter_data=extra_filter_data
@@ -1651,7 +1705,8 @@ class MultiValueView(ValueBaseView):
 
         self.current_multi_value_report_cell = multi_value_report_cell
 
-        table.extra_filters = self.extra_filters
+        # bound to the cell rather than read from the view, as cells may be rendered at the same time
+        table.extra_filters = partial(self.extra_filters, multi_value_report_cell=multi_value_report_cell)
         table.enable_links = self.kwargs.get('enable_links')
         table.datatable_template = 'advanced_report_builder/multi_values/middle.html'
         value = table.render()
@@ -1660,7 +1715,7 @@ class MultiValueView(ValueBaseView):
         return value, None
 
 
-class MultiValueShowBreakdownModal(TableUtilsMixin, Modal):
+class MultiValueShowBreakdownModal(BreakdownModalMixin, TableUtilsMixin, Modal):
     button_container_class = 'text-center'
     size = 'xl'
 
@@ -1675,9 +1730,6 @@ class MultiValueShowBreakdownModal(TableUtilsMixin, Modal):
             title = excel_column_name(multi_value_report_cell.column, row=multi_value_report_cell.row)
         return f'{self.table_report.multi_value_report.name} - {title}'
 
-    def add_table(self, base_model):
-        return DatatableTable(view=self, model=base_model)
-
     def get_multi_value_report_cell(self):
         if self._held_multi_value_report_cell is None:
             self._held_multi_value_report_cell = get_object_or_404(MultiValueReportCell, pk=self.slug['pk'])
@@ -1705,7 +1757,6 @@ class MultiValueShowBreakdownModal(TableUtilsMixin, Modal):
             )
         except (FieldError, FieldDoesNotExist) as e:
             raise ReportError(e)
-        table.ajax_data = False
         table.table_options['pageLength'] = 25
         table.table_options['bStateSave'] = False
         if multi_value_report_cell.record_nav:
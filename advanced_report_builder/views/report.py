@@ -13,6 +13,7 @@ from django_modals.modals import FormModal
 from django_modals.widgets.select2 import Select2, select2_ajax_result
 
 from advanced_report_builder.models import ReportOption
+from advanced_report_builder.report_context import get_report_context
 from advanced_report_builder.utils import get_report_builder_class, make_slug_str
 
 
@@ -69,7 +70,7 @@ class ReportBase(AjaxHelpers, MenuMixin):
             if not dashboard_report.show_versions:
                 return
             query_slug += f'_{dashboard_report.id}'
-        report_queries = report.reportquery_set.all()
+        report_queries = get_report_context(self.request).get_report_queries(report=report)
         extras = self.version_dropdown_extras(report)
         if len(report_queries) > 1 or extras or self.force_show_version_menu(report):
             dropdown = []
@@ -104,10 +105,13 @@ class ReportBase(AjaxHelpers, MenuMixin):
             dashboard_report_id = dashboard_report.id
             append_option_slug = f'_{dashboard_report.id}'
         view_name = self.request.resolver_match.view_name
-        for report_option in report.reportoption_set.all():
+        report_context = get_report_context(self.request)
+        for report_option in report_context.get_report_options(report=report):
             option_slug = f'option{report_option.id}{append_option_slug}'
             base_model = report_option.content_type.model_class()
-            report_cls = get_report_builder_class(model=base_model, class_name=report_option.report_builder_class_name)
+            report_cls = report_context.get_report_builder_class(
+                model=base_model, class_name=report_option.report_builder_class_name
+            )
             qs = base_model.objects.filter(report_cls.options_filter)
             # Fetch at most 21 rows
             probe = list(qs[: self.max_dropdown_option + 1])
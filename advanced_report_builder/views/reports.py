@@ -1,19 +1,27 @@
+import hashlib
+import time
+
 from ajax_helpers.mixins import AjaxHelpers
 from ajax_helpers.utils import is_ajax
 from django.conf import settings
 from django.contrib import messages
-from django.http import Http404
+from django.core.cache import cache
+from django.http import Http404, HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
 from django.views.generic import TemplateView
 from django_datatables.columns import ColumnNameError
 from django_menus.menu import MenuItemDisplay, MenuMixin
 from django_modals.helper import modal_button, modal_button_method
 from django_modals.modals import Modal
 
+from advanced_report_builder import calendar_feed
 from advanced_report_builder.duplicate import DuplicateReport
 from advanced_report_builder.exceptions import ReportError
-from advanced_report_builder.models import Report
+from advanced_report_builder.models import DashboardReport, Report
+from advanced_report_builder.report_context import get_report_context
 from advanced_report_builder.utils import get_template_type_class, get_view_type_class, split_slug
 
 
@@ -25,6 +33,7 @@ class ViewReportBase(AjaxHelpers, MenuMixin, TemplateView):
 
     def __init__(self, *args, **kwargs):
         self.report = None
+        self.report_context = None
         self._view_type_class = None
         super().__init__(*args, **kwargs)
 
@@ -33,6 +42,7 @@ class ViewReportBase(AjaxHelpers, MenuMixin, TemplateView):
         return None
 
     def dispatch(self, request, *args, **kwargs):
+        self.report_context = get_report_context(request)
         slug = split_slug(self.kwargs['slug'])
         self.report = self.model.objects.filter(slug=slug['pk']).first()
 
@@ -72,6 +82,7 @@ class ViewReportBase(AjaxHelpers, MenuMixin, TemplateView):
         view = self.get_view(report=self.report)
         self.kwargs['report'] = self.report
         self.kwargs['enable_links'] = self.enable_links
+        self.kwargs['report_context'] = self.report_context
         self.kwargs['output_type_template'] = self.get_report_template()
         try:
             report_data = view.as_view()(self.request, *self.args, **self.kwargs).rendered_content
@@ -120,6 +131,7 @@ class ViewReportBase(AjaxHelpers, MenuMixin, TemplateView):
         view = self.get_view(report=self.report)
         self.kwargs['report'] = self.report
         self.kwargs['enable_links'] = self.enable_links
+        self.kwargs['report_context'] = self.report_context
         return view.as_view()(self.request, *self.args, **self.kwargs)
 
     def get_view_types_class(self):
@@ -128,6 +140,127 @@ class ViewReportBase(AjaxHelpers, MenuMixin, TemplateView):
         return self._view_type_class
 
 
+class ViewReportDataBase(ViewReportBase):
+    """Returns the data of a chart or single value report as JSON, for pods that refresh themselves.
+
+    The ETag is a hash of the report's modified time and the data, and Last-Modified is when the user was first
+    returned that data, so polling with If-None-Match or If-Modified-Since gets a 304 until the data changes. The
+    query still runs for every request, as the rows can change without the report, so a 304 only saves sending
+    the data. A dashboard_report in the slug returns the data as that dashboard pod shows it.
+    """
+
+    def get(self, request, *args, **kwargs):
+        view = self.get_view(report=self.report)
+        if view is None or not getattr(view, 'serves_chart_data', False):
+            raise Http404
+        self.kwargs['report'] = self.report
+        self.kwargs['enable_links'] = self.enable_links
+        self.kwargs['report_context'] = self.report_context
+        self.kwargs['chart_data'] = True
+        dashboard_report_id = split_slug(self.kwargs['slug']).get('dashboard_report')
+        if dashboard_report_id is not None:
+            # a pod's data uses the pod's query and options
+            self.kwargs['dashboard_report'] = get_object_or_404(
+                DashboardReport.objects.select_related('report_query'), pk=dashboard_report_id, report=self.report
+            )
+        try:
+            response = view.as_view()(request, *self.args, **self.kwargs)
+        except (ReportError, ColumnNameError) as e:
+            return JsonResponse({'error': str(e.value)}, status=400)
+        return self.conditional_response(response)
+
+    def conditional_response(self, response):
+        digest = hashlib.md5(f'{self.report.modified.isoformat()}|'.encode() + response.content).hexdigest()
+        etag = quote_etag(digest)
+        path_key = hashlib.md5(self.request.get_full_path().encode()).hexdigest()
+        # queries can filter on the logged in user, so each user has their own Last-Modified
+        cache_key = f'advanced_report_builder:chart_data:{self.report.pk}:{self.request.user.pk}:{path_key}'
+        held = cache.get(cache_key)
+        if held is not None and held['etag'] == etag:
+            last_modified = held['last_modified']
+        else:
+            last_modified = int(time.time())
+            cache.set(cache_key, {'etag': etag, 'last_modified': last_modified})
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        patch_cache_control(response, private=True, no_cache=True)
+        return get_conditional_response(self.request, etag=etag, last_modified=last_modified, response=response)
+
+
+class ViewReportCalendarFeedBase(ViewReportBase):
+    """Returns a calendar report's events as an iCalendar feed that calendar apps can subscribe to.
+
+    The feed holds the events from REPORT_BUILDER_CALENDAR_FEED_PAST_DAYS before today to
+    REPORT_BUILDER_CALENDAR_FEED_FUTURE_DAYS after it and is streamed as the rows are read. It is then kept for
+    REPORT_BUILDER_CALENDAR_FEED_CACHE_SECONDS for the user and served from the cache with an ETag, so polling
+    with If-None-Match gets a 304 until the cached feed changes.
+
+    Calendar apps don't send the browser's session, so the feed's URL carries a token from
+    calendar_feed.get_feed_token. The request is made as the user the token was issued to, before has_permission
+    is checked, and a request without a valid token or a logged in user gets report_no_permission.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        token = request.GET.get('token')
+        if token is not None:
+            user = calendar_feed.get_feed_user(token)
+            if user is None:
+                return self.report_no_permission()
+            request.user = user
+        if not request.user.is_authenticated:
+            return self.report_no_permission()
+        return super().dispatch(request, *args, **kwargs)
+
+    def get(self, request, *args, **kwargs):
+        view = self.get_view(report=self.report)
+        if view is None or not getattr(view, 'serves_calendar_feed', False):
+            raise Http404
+        timeout = getattr(settings, 'REPORT_BUILDER_CALENDAR_FEED_CACHE_SECONDS', 300)
+        path_key = hashlib.md5(f'{self.report.modified.isoformat()}|{request.get_full_path()}'.encode()).hexdigest()
+        # queries can filter on the logged in user, so each user (the token's when there is one) has their own feed
+        cache_key = f'advanced_report_builder:calendar_feed:{self.report.pk}:{request.user.pk}:{path_key}'
+        held = cache.get(cache_key) if timeout else None
+        if held is not None:
+            response = HttpResponse(held['content'], content_type=calendar_feed.CONTENT_TYPE)
+            response['ETag'] = held['etag']
+            response['Last-Modified'] = http_date(held['last_modified'])
+            patch_cache_control(response, private=True, max_age=timeout)
+            return get_conditional_response(
+                request, etag=held['etag'], last_modified=held['last_modified'], response=response
+            )
+
+        self.kwargs['report'] = self.report
+        self.kwargs['enable_links'] = self.enable_links
+        self.kwargs['report_context'] = self.report_context
+        self.kwargs['calendar_feed'] = True
+        try:
+            response = view.as_view()(request, *self.args, **self.kwargs)
+        except (ReportError, ColumnNameError) as e:
+            return HttpResponse(str(e.value), status=400, content_type='text/plain')
+        if timeout:
+            response.streaming_content = self.cache_feed(response.streaming_content, cache_key, timeout)
+        patch_cache_control(response, private=True, max_age=timeout)
+        return response
+
+    @staticmethod
+    def cache_feed(chunks, cache_key, timeout):
+        """Yields the chunks of the feed, caching the whole feed once the last has been sent."""
+        sent = []
+        for chunk in chunks:
+            sent.append(chunk)
+            yield chunk
+        content = b''.join(sent)
+        cache.set(
+            cache_key,
+            {
+                'content': content,
+                'etag': quote_etag(hashlib.md5(content).hexdigest()),
+                'last_modified': int(time.time()),
+            },
+            timeout,
+        )
+
+
 class DuplicateReportModal(Modal):
     menu_display = MenuItemDisplay('Duplicate', font_awesome='fas fa-copy')
 
@@ -10,7 +10,6 @@ from django.shortcuts import get_object_or_404
 from django.urls import reverse
 from django.utils.safestring import mark_safe
 from django_datatables.columns import MenuColumn
-from django_datatables.datatables import DatatableTable
 from django_datatables.widgets import DataTableReorderWidget
 from django_menus.menu import HtmlMenu, MenuItem
 from django_modals.fields import FieldEx
@@ -32,6 +31,7 @@ from advanced_report_builder.models import ReportOption, ReportQuery, ReportType
 from advanced_report_builder.record_nav import RecordNavPlugin
 from advanced_report_builder.utils import get_query_js, get_report_builder_class, get_template_type_class
 from advanced_report_builder.variable_date import VariableDate
+from advanced_report_builder.views.breakdown import BreakdownModalMixin
 from advanced_report_builder.views.datatables.modal import (
     TableFieldForm,
     TableFieldModal,
@@ -57,7 +57,9 @@ class SingleValueView(ValueBaseView):
         return super().dispatch(request, *args, **kwargs)
 
     def report_builder_class(self, base_model):
-        report_builder_class = get_report_builder_class(model=base_model, report_type=self.chart_report.report_type)
+        report_builder_class = self.report_context.get_report_builder_class(
+            model=base_model, report_type=self.chart_report.report_type
+        )
         return report_builder_class
 
     def process_query_results(self, base_model, table):
@@ -100,14 +102,17 @@ class SingleValueView(ValueBaseView):
             SingleValueReport.SingleValueType.AVERAGE_SUM_OVER_TIME_EXCLUDING_WEEKENDS,
         ]:
             exclude_weekdays = None
+            working_day_calendar = None
             if single_value_type == SingleValueReport.SingleValueType.AVERAGE_SUM_OVER_TIME_EXCLUDING_WEEKENDS:
                 exclude_weekdays = [1, 7]
+                working_day_calendar = self.chart_report.working_day_calendar
 
             divider = self.get_period_divider(
                 annotation_value_choice=self.chart_report.average_scale,
                 start_date_type=self.chart_report.average_start_period,
                 end_date_type=self.chart_report.average_end_period,
                 exclude_weekdays=exclude_weekdays,
+                working_day_calendar=working_day_calendar,
             )
             self._process_aggregations(
                 field=self.chart_report.field,
@@ -190,12 +195,19 @@ class SingleValueView(ValueBaseView):
         context['single_value_report'] = self.chart_report
         return context
 
+    def get_chart_data(self):
+        chart_data = super().get_chart_data()
+        chart_data['prefix'] = self.table.prefix
+        if self.table.target_data is not None:
+            chart_data['target'] = self.table.target_data
+        return chart_data
+
     def get_target_data(self):
         report_query = self.get_report_query(report=self.chart_report)
         if report_query is None or report_query.target is None:
             return None
 
-        data = self.table.get_table_array(self.kwargs.get('request'), self.table.get_query())
+        data = self.table.get_raw_data()
         if len(data) == 0 or len(data[0]) == 0:
             return None
 
@@ -305,6 +317,7 @@ class SingleValueModal(MultiQueryModalMixin, QueryBuilderModalBase):
             'average_scale',
             'average_start_period',
             'average_end_period',
+            'working_day_calendar',
             'field',
             'prefix_type',
             'prefix',
@@ -388,6 +401,11 @@ class SingleValueModal(MultiQueryModalMixin, QueryBuilderModalBase):
                     },
                     'default': 'hide',
                 },
+                {
+                    'selector': '#div_id_working_day_calendar',
+                    'values': {SingleValueReport.SingleValueType.AVERAGE_SUM_OVER_TIME_EXCLUDING_WEEKENDS: 'show'},
+                    'default': 'hide',
+                },
             ],
         )
 
@@ -471,6 +489,7 @@ class SingleValueModal(MultiQueryModalMixin, QueryBuilderModalBase):
             'average_scale',
             'average_start_period',
             'average_end_period',
+            'working_day_calendar',
             'prefix_type',
             'prefix',
             'tile_colour',
@@ -687,16 +706,13 @@ class SingleValueModal(MultiQueryModalMixin, QueryBuilderModalBase):
         return self.command_response()
 
 
-class SingleValueShowBreakdownModal(TableUtilsMixin, Modal):
+class SingleValueShowBreakdownModal(BreakdownModalMixin, TableUtilsMixin, Modal):
     button_container_class = 'text-center'
     size = 'xl'
 
     def modal_title(self):
         return self.table_report.name
 
-    def add_table(self, base_model):
-        return DatatableTable(view=self, model=base_model)
-
     def setup_table(self):
         single_value_report = get_object_or_404(SingleValueReport, pk=self.slug['pk'])
         self.kwargs['enable_links'] = self.slug['enable_links'] == 'True'
@@ -720,7 +736,6 @@ class SingleValueShowBreakdownModal(TableUtilsMixin, Modal):
             )
         except (FieldError, FieldDoesNotExist) as e:
             raise ReportError(e)
-        table.ajax_data = False
         table.table_options['pageLength'] = 25
         table.table_options['bStateSave'] = False
         if single_value_report.record_nav:
@@ -0,0 +1,58 @@
+from bisect import bisect_left
+from datetime import timedelta
+from functools import lru_cache
+
+
+class WorkingDayIndex:
+    """Counts the working days from one date up to another in constant time.
+
+    Weekdays use Django's week_day numbering, Sunday=1 to Saturday=7. The working days before any date are the whole
+    weeks since 1 January 0001 (a Monday) times the working days in a week, plus those in the part week. Closures that
+    fall on a working weekday are held as sorted ordinals, so the closures between two dates are two bisects.
+    """
+
+    def __init__(self, exclude_weekdays=None, exclude_dates=None):
+        exclude_weekdays = {weekday for weekday in (exclude_weekdays or []) if 1 <= weekday <= 7}
+        # indexed by date.weekday(), Monday=0
+        working = [((weekday + 1) % 7) + 1 not in exclude_weekdays for weekday in range(7)]
+        self.workdays_per_week = sum(working)
+        self.days_into_week = [0]
+        for is_working in working:
+            self.days_into_week.append(self.days_into_week[-1] + is_working)
+        self.closures = sorted({day.toordinal() for day in exclude_dates or [] if working[day.weekday()]})
+
+    def days_before(self, ordinal):
+        weeks, day = divmod(ordinal - 1, 7)
+        return weeks * self.workdays_per_week + self.days_into_week[day]
+
+    def count(self, start_date, end_date):
+        """Returns the working days from start_date up to but not including end_date."""
+        if start_date > end_date:
+            start_date, end_date = end_date, start_date
+        start = start_date.toordinal()
+        end = end_date.toordinal()
+        closures = bisect_left(self.closures, end) - bisect_left(self.closures, start)
+        return self.days_before(end) - self.days_before(start) - closures
+
+
+def closure_dates(closures):
+    for start_date, end_date in closures:
+        day = start_date
+        while day <= (end_date or start_date):
+            yield day
+            day += timedelta(days=1)
+
+
+@lru_cache(maxsize=64)
+def get_calendar_index(calendar_id, modified):
+    """Returns the WorkingDayIndex of a WorkingDayCalendar.
+
+    Saving the calendar, or any of its closures, changes modified so the index is built again.
+    """
+    from advanced_report_builder.models import WorkingDayCalendar
+
+    calendar = WorkingDayCalendar.objects.get(pk=calendar_id)
+    return WorkingDayIndex(
+        exclude_weekdays=calendar.exclude_weekdays,
+        exclude_dates=closure_dates(calendar.closures.values_list('start_date', 'end_date')),
+    )
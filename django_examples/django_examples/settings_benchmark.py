@@ -0,0 +1,40 @@
+"""
+Settings for running the benchmark and query budget commands outside of docker.
+
+SQLite is used by default. Set BENCHMARK_DATABASE=postgresql to use a local PostgreSQL server, configured with the
+standard PGDATABASE / PGUSER / PGPASSWORD / PGHOST / PGPORT environment variables.
+"""
+
+import os
+
+from django_examples.settings import *  # noqa: F403
+from django_examples.settings import BASE_DIR, DEBUG_TOOLBAR_CONFIG, MIDDLEWARE
+
+DEBUG = False
+ALLOWED_HOSTS = ['testserver', 'localhost', '127.0.0.1']
+
+# the toolbar adds its own queries and memory to every request
+MIDDLEWARE = [m for m in MIDDLEWARE if not m.startswith('debug_toolbar')]
+# the toolbar's urls are still included, so allow the test runner to start with the app installed
+DEBUG_TOOLBAR_CONFIG = {**DEBUG_TOOLBAR_CONFIG, 'IS_RUNNING_TESTS': False}
+
+if os.environ.get('BENCHMARK_DATABASE', 'sqlite') == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('PGDATABASE', 'django_report_builder'),
+            'USER': os.environ.get('PGUSER', 'django_report_builder'),
+            'PASSWORD': os.environ.get('PGPASSWORD', 'django_report_builder'),
+            'HOST': os.environ.get('PGHOST', 'localhost'),
+            'PORT': int(os.environ.get('PGPORT', 5432)),
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('BENCHMARK_SQLITE_NAME', str(BASE_DIR / 'benchmark.sqlite3')),
+        }
+    }
+
+SILENCED_SYSTEM_CHECKS = ['debug_toolbar.W001']
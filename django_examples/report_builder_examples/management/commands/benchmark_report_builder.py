@@ -0,0 +1,158 @@
+import datetime
+import json
+import platform
+import re
+import statistics
+import time
+import tracemalloc
+
+import django
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from advanced_report_builder.utils import get_view_type_class
+from report_builder_examples.synthetic_data import create_sample_reports, generate_synthetic_data
+
+DASHBOARD = 'dashboard'
+TABLE_REPORT = 'tablereport'
+# rows fetched by the table data request
+TABLE_DATA_LENGTH = 100
+
+
+class Command(BaseCommand):
+    help = (
+        'Generates synthetic data at each scale and times rendering every report view type and a dashboard, '
+        'reporting wall time, query count and peak memory. '
+        'Use --settings django_examples.settings_benchmark to run against SQLite or a local PostgreSQL.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            nargs='+',
+            default=[10_000, 100_000, 1_000_000],
+            help='number of payment rows to generate for each run',
+        )
+        parser.add_argument('--repeat', type=int, default=3, help='timed renders per view')
+        parser.add_argument('--views', nargs='+', help='instance types to run (e.g. tablereport dashboard)')
+        parser.add_argument('--seed', default='synthetic_data')
+        parser.add_argument('--no-generate', action='store_true', help='benchmark the data already loaded')
+        parser.add_argument('--output', help='write the results as JSON to this file')
+
+    def handle(self, *args, **options):
+        user = get_user_model().objects.filter(username='benchmark').first()
+        if user is None:
+            user = get_user_model().objects.create_superuser('benchmark', 'benchmark@example.com', 'benchmark')
+        client = Client(HTTP_USER_AGENT='benchmark')
+        client.force_login(user)
+
+        row_counts = [None] if options['no_generate'] else options['rows']
+        results = []
+        for rows in row_counts:
+            if rows is not None:
+                self.stdout.write(f'Generating {rows} rows')
+                generate_synthetic_data(rows=rows, seed=options['seed'])
+            reports, dashboard = create_sample_reports()
+            for name, url, data in self.get_requests(
+                client=client, reports=reports, dashboard=dashboard, views=options['views']
+            ):
+                result = {
+                    'view': name,
+                    'rows': rows,
+                    **self.measure(client=client, url=url, repeat=options['repeat'], data=data),
+                }
+                results.append(result)
+                self.stdout.write(
+                    f'{name:<24} rows={rows} median={result["median_seconds"]:.4f}s '
+                    f'queries={result["queries"]} peak_memory={result["peak_memory_kb"]}KB'
+                )
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(
+                    {
+                        'created': datetime.datetime.now().isoformat(),
+                        'database': connection.vendor,
+                        'django': django.get_version(),
+                        'python': platform.python_version(),
+                        'results': results,
+                    },
+                    f,
+                    indent=2,
+                )
+
+    @staticmethod
+    def get_requests(client, reports, dashboard, views):
+        """Returns the name, url and any POST data of each request to measure.
+
+        A table report's page doesn't hold its rows, which are fetched by a separate datatable_data POST, so that
+        is measured as well as the page.
+        """
+        view_types = get_view_type_class().views
+        requests = []
+        for instance_type, report in reports.items():
+            if not views or instance_type in views:
+                name = view_types[instance_type].__name__
+                url = reverse('report_builder_examples:view_report', kwargs={'slug': report.slug})
+                requests.append((name, url, None))
+                if instance_type == TABLE_REPORT:
+                    content = client.get(url).content.decode()
+                    table_id = re.search(r'<table[^>]* id="([^"]+)"', content).group(1)
+                    data = {
+                        'datatable_data': 1,
+                        'table_id': table_id,
+                        'draw': 1,
+                        'start': 0,
+                        'length': TABLE_DATA_LENGTH,
+                    }
+                    requests.append((f'{name} data', url, data))
+        if not views or DASHBOARD in views:
+            requests.append(
+                (
+                    'ViewDashboardBase',
+                    reverse('report_builder_examples:view_dashboard', kwargs={'slug': dashboard.slug}),
+                    None,
+                )
+            )
+        return requests
+
+    @staticmethod
+    def measure(client, url, repeat, data=None):
+        def get():
+            response = client.get(url) if data is None else client.post(url, data)
+            if response.status_code != 200:
+                raise CommandError(f'{url} returned {response.status_code}')
+            return response
+
+        # the first render warms the template and content type caches
+        get()
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            get()
+            timings.append(time.perf_counter() - start)
+
+        # queries and memory are measured on separate renders so neither distorts the timings
+        with CaptureQueriesContext(connection) as queries:
+            get()
+        # read the count now as the next request resets the connection's query log
+        query_count = len(queries)
+        tracemalloc.start()
+        try:
+            get()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return {
+            'min_seconds': min(timings),
+            'median_seconds': statistics.median(timings),
+            'max_seconds': max(timings),
+            'queries': query_count,
+            'peak_memory_kb': peak // 1024,
+        }
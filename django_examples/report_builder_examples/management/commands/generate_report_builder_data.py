@@ -0,0 +1,77 @@
+import datetime
+import time
+
+from django.core.management.base import BaseCommand
+
+from advanced_report_builder.models import Dashboard, Report
+from report_builder_examples.synthetic_data import (
+    DEFAULT_ANCHOR_DATE,
+    SAMPLE_REPORT_PREFIX,
+    create_sample_reports,
+    generate_synthetic_data,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Replaces the example data with reproducible synthetic data at the given scale and creates saved reports '
+        'and dashboards over it. The same seed and options always generate the same data.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100_000, help='number of payments, the largest table')
+        parser.add_argument('--seed', default='synthetic_data')
+        parser.add_argument('--batch-size', type=int, default=5000, help='rows per bulk insert')
+        parser.add_argument(
+            '--anchor-date',
+            type=datetime.date.fromisoformat,
+            default=DEFAULT_ANCHOR_DATE,
+            help=f'YYYY-MM-DD the dates are spread around, default {DEFAULT_ANCHOR_DATE}',
+        )
+        parser.add_argument('--days', type=int, default=730, help='days of history before the anchor date')
+        parser.add_argument('--future-days', type=int, default=30, help='days after the anchor date')
+        parser.add_argument(
+            '--date-skew', type=float, default=0.0, help='concentrates dates towards the anchor date, 0 is uniform'
+        )
+        parser.add_argument(
+            '--company-skew',
+            type=float,
+            default=0.0,
+            help='Zipf exponent for how unevenly rows are shared between companies, 0 is uniform',
+        )
+        parser.add_argument('--payments-per-company', type=int, default=20)
+        parser.add_argument('--people-per-company', type=int, default=2)
+        parser.add_argument('--contracts-per-company', type=int, default=2)
+        parser.add_argument('--notes-per-company', type=int, default=1)
+        parser.add_argument('--tags-per-company', type=int, default=2)
+        parser.add_argument('--tallies-per-group', type=int, default=50)
+        parser.add_argument('--users', type=int, default=20)
+        parser.add_argument('--no-reports', action='store_true', help='do not create the sample reports')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        generate_synthetic_data(
+            rows=options['rows'],
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            days=options['days'],
+            future_days=options['future_days'],
+            date_skew=options['date_skew'],
+            company_skew=options['company_skew'],
+            payments_per_company=options['payments_per_company'],
+            people_per_company=options['people_per_company'],
+            contracts_per_company=options['contracts_per_company'],
+            notes_per_company=options['notes_per_company'],
+            tags_per_company=options['tags_per_company'],
+            tallies_per_group=options['tallies_per_group'],
+            users=options['users'],
+            anchor_date=options['anchor_date'],
+        )
+        self.stdout.write(f'Generated {options["rows"]} rows in {time.perf_counter() - start:.1f}s')
+
+        if not options['no_reports']:
+            create_sample_reports()
+            for report in Report.objects.filter(name__startswith=SAMPLE_REPORT_PREFIX).order_by('id'):
+                self.stdout.write(f'Report {report.name}: {report.slug}')
+            for dashboard in Dashboard.objects.filter(name__startswith=SAMPLE_REPORT_PREFIX).order_by('id'):
+                self.stdout.write(f'Dashboard {dashboard.name}: {dashboard.slug}')
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('report_builder_examples', '0018_alter_contract_end_date_alter_contract_start_date'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='payment',
+            name='date',
+            field=models.DateField(db_index=True),
+        ),
+    ]
@@ -0,0 +1,11 @@
+from django.db import migrations
+
+from advanced_report_builder.search import search_index_operations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('report_builder_examples', '0019_alter_payment_date'),
+    ]
+
+    operations = search_index_operations('report_builder_examples', 'Company', ['name'])
@@ -240,6 +240,7 @@ class Company(TimeStampedModel):
                     'title': 'Tags',
                     'type': 'tag',
                     'field': 'Tags',
+                    'server_side_field': 'tags__pk',
                     'kwargs': {'collapsed': False},
                 },
                 'importance_choice': {
@@ -407,7 +408,7 @@ class Tally(models.Model):
 
 class Payment(TimeStampedModel):
     company = models.ForeignKey(Company, on_delete=models.CASCADE)
-    date = models.DateField()
+    date = models.DateField(db_index=True)
     amount = models.IntegerField()
     quantity = models.IntegerField()
     received = models.BooleanField(default=False)
@@ -0,0 +1,520 @@
+import datetime
+import itertools
+import random
+
+from django.db import connection, transaction
+
+from advanced_report_builder.globals import ANNOTATION_CHOICE_SUM, ANNOTATION_VALUE_MONTH, ANNOTATION_VALUE_WEEK
+from advanced_report_builder.models import (
+    BarChartReport,
+    CalendarReport,
+    CalendarReportDataSet,
+    Dashboard,
+    DashboardReport,
+    FunnelChartReport,
+    KanbanReport,
+    KanbanReportLane,
+    LineChartReport,
+    MultiValueReport,
+    MultiValueReportCell,
+    MultiValueReportColumn,
+    PieChartReport,
+    Report,
+    ReportQuery,
+    ReportType,
+    SingleValueReport,
+    TableReport,
+)
+from report_builder_examples import models
+from report_builder_examples.import_data import import_report_types
+
+SAMPLE_REPORT_PREFIX = 'Synthetic'
+SAMPLE_DASHBOARD_NAME = 'Synthetic Dashboard'
+SAMPLE_INCLUDES_DASHBOARD_NAME = 'Synthetic Includes Dashboard'
+SYNTHETIC_USERNAME_PREFIX = 'synthetic_user_'
+SYNTHETIC_NAME_PREFIX = 'Synthetic '
+# the day the dates are spread around, so a seed gives the same data whichever day it is run
+DEFAULT_ANCHOR_DATE = datetime.date(2026, 1, 1)
+
+NOTES_PREFIXES = [
+    'Annual support',
+    'Consulting services',
+    'Software licence',
+    'Maintenance agreement',
+    'Cloud hosting',
+    'Data migration',
+    'Training package',
+    'Security audit',
+]
+
+SURNAMES = ['Smith', 'Jones', 'Taylor', 'Brown', 'Williams', 'Wilson', 'Johnson', 'Davies', 'Patel', 'Wright']
+COMPANY_CATEGORIES = ['Customer', 'Supplier', 'Partner', 'Prospect', 'Reseller']
+SECTORS = ['Retail', 'Finance', 'Manufacturing', 'Healthcare', 'Education', 'Energy', 'Transport', 'Media']
+TAGS = ['Key Account', 'Overdue', 'New', 'Renewal Due', 'Referral', 'VIP', 'At Risk', 'Dormant', 'Upsell', 'Trial']
+TALLY_TAGS = ['Morning', 'Evening', 'Weekend', 'Roadworks', 'Event']
+
+
+def clear_synthetic_data():
+    """Removes the example data. Children are deleted first so each delete is a single query."""
+    for model in (
+        models.Payment,
+        models.Contract,
+        models.Person,
+        models.Note,
+        models.CompanyInformation,
+        models.Tally.tally_tags.through,
+        models.Tally,
+        models.TallyGroup,
+        models.Tags.company.through,
+        models.Company.sectors.through,
+    ):
+        model.objects.all().delete()
+    models.Company.objects.all().delete()
+    models.Tags.objects.filter(tag__startswith=SYNTHETIC_NAME_PREFIX).delete()
+    for model in (models.Sector, models.CompanyCategory, models.TallyTag):
+        model.objects.filter(name__startswith=SYNTHETIC_NAME_PREFIX).delete()
+    models.UserProfile.objects.filter(username__startswith=SYNTHETIC_USERNAME_PREFIX).delete()
+
+
+class SyntheticDataGenerator:
+    """Generates reproducible example data at any scale.
+
+    rows is the number of payments, the largest table. Everything else fans out from the companies, of which
+    there are rows / payments_per_company. The same seed and options always produce the same data.
+
+    days and future_days set the spread of every date either side of anchor_date. date_skew concentrates dates
+    towards anchor_date (0 is uniform) and company_skew makes a few companies own most of the payments, contracts
+    and notes, following a Zipf like distribution (0 is uniform), so pivots and reverse foreign key columns
+    see realistic hot spots. Companies carry the include chains the report builder classes follow:
+    companyinformation and user_profile on companies and payments, and tally_group on tallies.
+    """
+
+    def __init__(
+        self,
+        rows,
+        seed='synthetic_data',
+        batch_size=5000,
+        days=730,
+        future_days=30,
+        date_skew=0.0,
+        company_skew=0.0,
+        payments_per_company=20,
+        people_per_company=2,
+        contracts_per_company=2,
+        notes_per_company=1,
+        tags_per_company=2,
+        tallies_per_group=50,
+        users=20,
+        anchor_date=DEFAULT_ANCHOR_DATE,
+    ):
+        self.rows = rows
+        self.batch_size = batch_size
+        self.days = days
+        self.future_days = future_days
+        self.date_skew = date_skew
+        self.company_skew = company_skew
+        self.payments_per_company = payments_per_company
+        self.people_per_company = people_per_company
+        self.contracts_per_company = contracts_per_company
+        self.notes_per_company = notes_per_company
+        self.tags_per_company = tags_per_company
+        self.tallies_per_group = tallies_per_group
+        self.users = users
+        self.rnd = random.Random(seed)
+        self.anchor_date = anchor_date
+        self.start_date = anchor_date - datetime.timedelta(days=days)
+        self.company_count = max(10, rows // max(1, payments_per_company))
+        self.company_ids = []
+        self.company_weights = None
+        self.user_ids = []
+
+    def random_date(self):
+        span = self.days + self.future_days + 1
+        if self.date_skew:
+            # u ** (1 + skew) bunches towards 0, so the offset bunches towards the anchor date
+            offset = int((self.days + 1) * (1 - self.rnd.random() ** (1 + self.date_skew)))
+            if self.future_days and self.rnd.random() < self.future_days / span:
+                offset = self.days + 1 + self.rnd.randrange(self.future_days)
+        else:
+            offset = self.rnd.randrange(span)
+        return self.start_date + datetime.timedelta(days=offset)
+
+    def company_ids_sample(self, count):
+        return self.rnd.choices(self.company_ids, cum_weights=self.company_weights, k=count)
+
+    def bulk_create(self, model, count, make_object):
+        """Creates count objects from make_object(index) one batch at a time so memory stays flat."""
+        for offset in range(0, count, self.batch_size):
+            model.objects.bulk_create(
+                [make_object(i) for i in range(offset, min(offset + self.batch_size, count))],
+                batch_size=self.batch_size,
+            )
+
+    def generate(self):
+        with transaction.atomic():
+            clear_synthetic_data()
+            self.create_users()
+            self.create_companies()
+            self.create_company_children()
+            self.create_tallies()
+            self.create_payments()
+        import_report_types()
+
+    def create_users(self):
+        self.bulk_create(
+            models.UserProfile,
+            self.users,
+            lambda i: models.UserProfile(
+                username=f'{SYNTHETIC_USERNAME_PREFIX}{i}',
+                first_name=f'User {i}',
+                last_name=self.rnd.choice(SURNAMES),
+                colour=f'#{self.rnd.randrange(0x1000000):06x}',
+            ),
+        )
+        self.user_ids = list(
+            models.UserProfile.objects.filter(username__startswith=SYNTHETIC_USERNAME_PREFIX)
+            .order_by('id')
+            .values_list('id', flat=True)
+        )
+
+    def random_user_id(self):
+        return self.rnd.choice(self.user_ids) if self.user_ids else None
+
+    def create_companies(self):
+        categories = models.CompanyCategory.objects.bulk_create(
+            [models.CompanyCategory(name=f'{SYNTHETIC_NAME_PREFIX}{name}') for name in COMPANY_CATEGORIES]
+        )
+        category_ids = [c.id for c in categories] + [None]
+        self.bulk_create(
+            models.Company,
+            self.company_count,
+            lambda i: models.Company(
+                name=f'Company {i}',
+                active=self.rnd.random() > 0.3,
+                number=f'{i:08d}',
+                importance=self.rnd.randrange(1, 4),
+                user_profile_id=self.random_user_id(),
+                company_category_id=self.rnd.choice(category_ids),
+            ),
+        )
+        self.company_ids = list(models.Company.objects.order_by('id').values_list('id', flat=True))
+        weights = [1 / (rank + 1) ** self.company_skew for rank in range(len(self.company_ids))]
+        self.company_weights = list(itertools.accumulate(weights))
+
+    def create_company_children(self):
+        self.bulk_create(
+            models.CompanyInformation,
+            len(self.company_ids),
+            lambda i: models.CompanyInformation(
+                company_id=self.company_ids[i],
+                value=self.rnd.randrange(10_000, 10_000_000),
+                incorporated_date=self.start_date - datetime.timedelta(days=self.rnd.randrange(365 * 30)),
+            ),
+        )
+
+        sectors = models.Sector.objects.bulk_create(
+            [models.Sector(name=f'{SYNTHETIC_NAME_PREFIX}{name}') for name in SECTORS]
+        )
+        sector_through = models.Company.sectors.through
+        self.bulk_create(
+            sector_through,
+            len(self.company_ids),
+            lambda i: sector_through(company_id=self.company_ids[i], sector_id=self.rnd.choice(sectors).id),
+        )
+
+        tags = models.Tags.objects.bulk_create([models.Tags(tag=f'{SYNTHETIC_NAME_PREFIX}{name}') for name in TAGS])
+        tag_through = models.Tags.company.through
+        company_tags = [
+            (company_id, tag.id)
+            for company_id in self.company_ids
+            for tag in self.rnd.sample(tags, self.rnd.randint(0, min(self.tags_per_company, len(tags))))
+        ]
+        self.bulk_create(
+            tag_through,
+            len(company_tags),
+            lambda i: tag_through(company_id=company_tags[i][0], tags_id=company_tags[i][1]),
+        )
+
+        self.bulk_create(
+            models.Person,
+            self.company_count * self.people_per_company,
+            lambda i: models.Person(
+                company_id=self.company_ids_sample(1)[0],
+                title=self.rnd.randrange(3),
+                first_name=f'First {i}',
+                surname=self.rnd.choice(SURNAMES),
+                weight=self.rnd.uniform(50, 100),
+            ),
+        )
+
+        def make_contract(i):
+            start_date = self.random_date()
+            return models.Contract(
+                company_id=self.company_ids_sample(1)[0],
+                notes=f'{self.rnd.choice(NOTES_PREFIXES)} #{i + 1}',
+                start_date=start_date,
+                end_date=start_date + datetime.timedelta(days=self.rnd.randint(30, 365)),
+                amount=self.rnd.randint(5000, 500000),
+                valid=self.rnd.random() > 0.2,
+                temperature=self.rnd.choice([0, 0, 1, 1, 1, 2]),
+            )
+
+        self.bulk_create(models.Contract, self.company_count * self.contracts_per_company, make_contract)
+
+        self.bulk_create(
+            models.Note,
+            self.company_count * self.notes_per_company,
+            lambda i: models.Note(
+                company_id=self.company_ids_sample(1)[0],
+                date=self.random_date(),
+                notes=f'{self.rnd.choice(NOTES_PREFIXES)} note {i + 1}',
+            ),
+        )
+
+    def create_tallies(self):
+        tally_count = max(10, self.rows // 10)
+        group_count = max(1, tally_count // max(1, self.tallies_per_group))
+        self.bulk_create(
+            models.TallyGroup,
+            group_count,
+            lambda i: models.TallyGroup(name=f'Tally Group {i}', date=self.random_date()),
+        )
+        group_ids = list(models.TallyGroup.objects.order_by('id').values_list('id', flat=True))
+        tally_tags = models.TallyTag.objects.bulk_create(
+            [models.TallyTag(name=f'{SYNTHETIC_NAME_PREFIX}{name}') for name in TALLY_TAGS]
+        )
+
+        self.bulk_create(
+            models.Tally,
+            tally_count,
+            lambda i: models.Tally(
+                date=self.random_date(),
+                tally_group_id=group_ids[i * len(group_ids) // tally_count],
+                cars=self.rnd.randrange(200),
+                vans=self.rnd.randrange(100),
+                buses=self.rnd.randrange(30),
+                lorries=self.rnd.randrange(30),
+                motor_bikes=self.rnd.randrange(40),
+                push_bikes=self.rnd.randrange(80),
+                tractors=self.rnd.randrange(10),
+                verified=self.rnd.random() > 0.4,
+                user_profile_id=self.random_user_id(),
+            ),
+        )
+        tally_ids = list(models.Tally.objects.order_by('id').values_list('id', flat=True))
+        tag_through = models.Tally.tally_tags.through
+        self.bulk_create(
+            tag_through,
+            len(tally_ids),
+            lambda i: tag_through(tally_id=tally_ids[i], tallytag_id=self.rnd.choice(tally_tags).id),
+        )
+
+    def create_payments(self):
+        for offset in range(0, self.rows, self.batch_size):
+            count = min(self.batch_size, self.rows - offset)
+            models.Payment.objects.bulk_create(
+                [
+                    models.Payment(
+                        company_id=company_id,
+                        date=self.random_date(),
+                        amount=self.rnd.randrange(1000, 10000),
+                        quantity=self.rnd.randrange(1, 15),
+                        received=self.rnd.random() > 0.5,
+                        user_profile_id=self.random_user_id(),
+                    )
+                    for company_id in self.company_ids_sample(count)
+                ],
+                batch_size=self.batch_size,
+            )
+
+
+def generate_synthetic_data(rows, seed='synthetic_data', batch_size=5000, **kwargs):
+    """Generates example data where rows is the number of payments. See SyntheticDataGenerator for the options."""
+    SyntheticDataGenerator(rows=rows, seed=seed, batch_size=batch_size, **kwargs).generate()
+
+
+def create_sample_reports():
+    """Creates one saved report of each type over the example data plus a dashboard showing them all.
+    Returns a dict of instance type to report and the dashboard. See create_include_reports for the reports
+    that follow the include chains."""
+    Report.objects.filter(name__startswith=SAMPLE_REPORT_PREFIX).delete()
+    Dashboard.objects.filter(name__in=[SAMPLE_DASHBOARD_NAME, SAMPLE_INCLUDES_DASHBOARD_NAME]).delete()
+    report_types = {report_type.name: report_type for report_type in ReportType.objects.all()}
+    payment = report_types['Payment']
+    sum_amount = {
+        'field': 'currency_amount',
+        'title': 'Amount',
+        'data_attr': f'annotations_type-{ANNOTATION_CHOICE_SUM}',
+    }
+    sum_quantity = {'field': 'quantity', 'title': 'Quantity', 'data_attr': f'annotations_type-{ANNOTATION_CHOICE_SUM}'}
+
+    reports = {
+        'tablereport': TableReport.objects.create(
+            name=f'{SAMPLE_REPORT_PREFIX} Table',
+            report_type=report_types['Company'],
+            table_fields=[
+                {'field': 'name', 'title': 'Name'},
+                {'field': 'importance_choice', 'title': 'Importance'},
+                {'field': 'people', 'title': 'People'},
+                {'field': 'payments', 'title': 'Payments'},
+                # STRING_AGG(DISTINCT ...) needs PostgreSQL
+                *(
+                    [{'field': 'contract_temperature', 'title': 'Contract Temperature'}]
+                    if connection.vendor == 'postgresql'
+                    else []
+                ),
+            ],
+            pivot_fields=[{'field': 'importance_choice', 'title': 'Importance'}],
+        ),
+        'singlevaluereport': SingleValueReport.objects.create(
+            name=f'{SAMPLE_REPORT_PREFIX} Single Value',
+            report_type=payment,
+            single_value_type=SingleValueReport.SingleValueType.SUM,
+            field='currency_amount',
+        ),
+        'barchartreport': BarChartReport.objects.create(
+            name=f'{SAMPLE_REPORT_PREFIX} Bar Chart',
+            report_type=payment,
+            axis_scale=ANNOTATION_VALUE_MONTH,
+            date_field='date',
+            axis_value_type=ANNOTATION_CHOICE_SUM,
+            fields=[sum_amount],
+        ),
+        'linechartreport': LineChartReport.objects.create(
+            name=f'{SAMPLE_REPORT_PREFIX} Line Chart',
+            report_type=payment,
+            axis_scale=ANNOTATION_VALUE_WEEK,
+            date_field='date',
+            axis_value_type=ANNOTATION_CHOICE_SUM,
+            fields=[sum_quantity],
+        ),
+        'piechartreport': PieChartReport.objects.create(
+            name=f'{SAMPLE_REPORT_PREFIX} Pie Chart', report_type=payment, fields=[sum_quantity, sum_amount]
+        ),
+        'funnelchartreport': FunnelChartReport.objects.create(
+            name=f'{SAMPLE_REPORT_PREFIX} Funnel Chart', report_type=payment, fields=[sum_quantity, sum_amount]
+        ),
+        'kanbanreport': KanbanReport.objects.create(name=f'{SAMPLE_REPORT_PREFIX} Kanban'),
+        'calendarreport': CalendarReport.objects.create(name=f'{SAMPLE_REPORT_PREFIX} Calendar'),
+        'multivaluereport': MultiValueReport.objects.create(
+            name=f'{SAMPLE_REPORT_PREFIX} Multi Value', rows=2, columns=2
+        ),
+    }
+
+    for order, (temperature, label) in enumerate(models.Contract.TEMPERATURE_TYPES):
+        KanbanReportLane.objects.create(
+            kanban_report=reports['kanbanreport'],
+            name=label,
+            order=order,
+            report_type=report_types['Contract'],
+            heading_field='notes',
+            order_by_field='start_date',
+            query_data={
+                'condition': 'AND',
+                'rules': [
+                    {
+                        'id': 'temperature',
+                        'field': 'temperature',
+                        'type': 'integer',
+                        'input': 'select',
+                        'operator': 'equal',
+                        'value': temperature,
+                    }
+                ],
+                'valid': True,
+            },
+        )
+
+    CalendarReportDataSet.objects.create(
+        calendar_report=reports['calendarreport'],
+        order=0,
+        name='Contracts',
+        report_type=report_types['Contract'],
+        heading_field='notes',
+        start_date_field='start_date',
+        end_date_type=CalendarReportDataSet.END_DATE_TYPE_FIELD,
+        end_date_field='end_date',
+    )
+
+    multi_value_report = reports['multivaluereport']
+    for column in (1, 2):
+        MultiValueReportColumn.objects.create(multi_value_report=multi_value_report, column=column, width=50)
+    for row, (text, multi_value_type, field) in enumerate(
+        (
+            ('Payments', MultiValueReportCell.MultiValueType.COUNT, None),
+            ('Amount', MultiValueReportCell.MultiValueType.SUM, 'currency_amount'),
+        ),
+        1,
+    ):
+        MultiValueReportCell.objects.create(multi_value_report=multi_value_report, row=row, column=1, text=text)
+        MultiValueReportCell.objects.create(
+            multi_value_report=multi_value_report,
+            row=row,
+            column=2,
+            multi_value_type=multi_value_type,
+            report_type=payment,
+            field=field,
+        )
+
+    dashboard = Dashboard.objects.create(name=SAMPLE_DASHBOARD_NAME)
+    for report in reports.values():
+        DashboardReport.objects.create(dashboard=dashboard, report=report)
+    create_include_reports(report_types=report_types)
+    return reports, dashboard
+
+
+def create_include_reports(report_types):
+    """Creates table reports whose columns and versions follow the include chains (payment to company to
+    company information, user_profile and tally_group) and a dashboard showing them.
+    Returns the reports and the dashboard."""
+    reports = [
+        TableReport.objects.create(
+            name=f'{SAMPLE_REPORT_PREFIX} Payments',
+            report_type=report_types['Payment'],
+            table_fields=[
+                {'field': 'date', 'title': 'Date'},
+                {'field': 'currency_amount', 'title': 'Amount'},
+                {'field': 'company__name', 'title': 'Company'},
+                {'field': 'company__importance_choice', 'title': 'Importance'},
+                {'field': 'company__companyinformation__company_value', 'title': 'Company Value'},
+                {'field': 'company__user_profile__full_name', 'title': 'Account Manager'},
+                {'field': 'user_profile__full_name', 'title': 'Taken By'},
+            ],
+        ),
+        TableReport.objects.create(
+            name=f'{SAMPLE_REPORT_PREFIX} Tallies',
+            report_type=report_types['Tally'],
+            table_fields=[
+                {'field': 'date', 'title': 'Date'},
+                {'field': 'tally_group__name', 'title': 'Group'},
+                {'field': 'cars', 'title': 'Cars'},
+                {'field': 'vans', 'title': 'Vans'},
+                {'field': 'verified', 'title': 'Verified'},
+                {'field': 'user_profile__username', 'title': 'User'},
+            ],
+        ),
+    ]
+    ReportQuery.objects.create(report=reports[0], name='Standard', query=None)
+    ReportQuery.objects.create(
+        report=reports[0],
+        name='Received',
+        query={
+            'condition': 'AND',
+            'rules': [
+                {
+                    'id': 'received',
+                    'field': 'received',
+                    'type': 'boolean',
+                    'input': 'radio',
+                    'operator': 'equal',
+                    'value': 1,
+                }
+            ],
+            'valid': True,
+        },
+    )
+
+    dashboard = Dashboard.objects.create(name=SAMPLE_INCLUDES_DASHBOARD_NAME)
+    for report in reports:
+        DashboardReport.objects.create(dashboard=dashboard, report=report)
+    return reports, dashboard
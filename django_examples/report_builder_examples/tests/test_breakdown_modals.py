@@ -0,0 +1,83 @@
+import csv
+import io
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from advanced_report_builder.models import ReportType, SingleValueReport
+from report_builder_examples.models import Payment
+from report_builder_examples.synthetic_data import generate_synthetic_data
+
+
+class BreakdownModalTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate_synthetic_data(rows=60, days=3, future_days=0, users=2)
+        cls.user = get_user_model().objects.create_superuser('breakdown', 'breakdown@example.com', 'breakdown')
+        cls.report = SingleValueReport.objects.create(
+            name='Payments',
+            report_type=ReportType.objects.get(name='Payment'),
+            show_breakdown=True,
+            breakdown_fields=[
+                {'field': 'date', 'title': 'Date'},
+                {'field': 'company__name', 'title': 'Company'},
+            ],
+        )
+        cls.url = reverse(
+            'advanced_report_builder:single_value_show_breakdown_modal',
+            kwargs={'slug': f'pk-{cls.report.pk}-enable_links-False'},
+        )
+
+    def setUp(self):
+        self.client = Client(HTTP_USER_AGENT='breakdown')
+        self.client.force_login(self.user)
+
+    def get_page(self, start=0, search=''):
+        response = self.client.post(
+            self.url,
+            {
+                'datatable_data': 1,
+                'table_id': 'breakdown',
+                'draw': 2,
+                'start': start,
+                'length': 25,
+                'search[value]': search,
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_rows_are_paged_on_the_server(self):
+        content = self.client.get(self.url).content.decode()
+        self.assertIn('serverSide', content)
+        self.assertNotIn('"data":', content)
+
+        page = self.get_page()
+        self.assertEqual(page['recordsTotal'], Payment.objects.count())
+        self.assertEqual(len(page['data']), 25)
+        self.assertEqual(len(self.get_page(start=50)['data']), Payment.objects.count() - 50)
+
+    @override_settings(REPORT_BUILDER_BREAKDOWN_MAX_ROWS=40)
+    def test_row_cap(self):
+        page = self.get_page()
+        self.assertEqual(page['recordsTotal'], 40)
+        self.assertIn('Limited to 40 rows', json.dumps(page['ajax_commands']))
+        self.assertEqual(len(self.get_page(start=25)['data']), 15)
+        self.assertEqual(self.get_page(start=50)['data'], [])
+
+        name = Payment.objects.values_list('company__name', flat=True).first()
+        page = self.get_page(search=name)
+        self.assertEqual(page['recordsFiltered'], Payment.objects.filter(company__name__icontains=name).count())
+
+    @override_settings(REPORT_BUILDER_BREAKDOWN_MAX_ROWS=40)
+    def test_export_all(self):
+        self.assertIn(f'{self.url}?export=csv', self.client.get(self.url).content.decode())
+        response = self.client.get(self.url, {'export': 'csv'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="payments.csv"')
+        rows = list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(rows[0], ['Date', 'Company'])
+        self.assertEqual(len(rows), Payment.objects.count() + 1)
@@ -0,0 +1,159 @@
+from datetime import UTC, date, datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Q
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone as django_timezone
+
+from advanced_report_builder import calendar_feed
+from advanced_report_builder.models import CalendarReport, CalendarReportDataSet, ReportType, TableReport
+from report_builder_examples.models import Contract
+from report_builder_examples.synthetic_data import SYNTHETIC_USERNAME_PREFIX, generate_synthetic_data
+
+
+class CalendarFeedFormatTests(SimpleTestCase):
+    def test_escape_and_fold(self):
+        self.assertEqual(
+            calendar_feed.escape_text('<b>Tea; cake, &amp; jam</b>\nLater'), 'Tea\\; cake\\, & jam\\nLater'
+        )
+        line = 'DESCRIPTION:' + 'é' * 100
+        folded = calendar_feed.fold_line(line)
+        self.assertTrue(folded.endswith('\r\n'))
+        parts = folded[:-2].split('\r\n')
+        self.assertTrue(all(len(part.encode()) <= 75 for part in parts))
+        self.assertEqual(parts[0] + ''.join(part[1:] for part in parts[1:]), line)
+
+    def test_event_dates(self):
+        stamp = datetime(2026, 1, 1, tzinfo=UTC)
+        all_day = calendar_feed.event(uid='1', start=date(2026, 3, 2), end=None, summary='Day', stamp=stamp)
+        self.assertIn('DTSTART;VALUE=DATE:20260302\r\n', all_day)
+        self.assertIn('DTEND;VALUE=DATE:20260303\r\n', all_day)
+        timed = calendar_feed.event(
+            uid='2',
+            start=datetime(2026, 3, 2, 9, 30, tzinfo=UTC),
+            end=datetime(2026, 3, 2, 11, tzinfo=UTC),
+            summary='Meeting',
+            stamp=stamp,
+        )
+        self.assertIn('DTSTART:20260302T093000Z\r\n', timed)
+        self.assertIn('DTEND:20260302T110000Z\r\n', timed)
+
+
+@override_settings(REPORT_BUILDER_CALENDAR_FEED_CACHE_SECONDS=60)
+class CalendarFeedTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # the feed's window is around today
+        generate_synthetic_data(rows=200, days=800, future_days=400, users=2, anchor_date=django_timezone.localdate())
+        cls.user = get_user_model().objects.create_superuser('feed', 'feed@example.com', 'feed')
+        cls.report = CalendarReport.objects.create(name='Contracts')
+        CalendarReportDataSet.objects.create(
+            calendar_report=cls.report,
+            order=0,
+            name='Contracts',
+            report_type=ReportType.objects.get(name='Contract'),
+            heading_field='notes',
+            start_date_field='start_date',
+            end_date_type=CalendarReportDataSet.END_DATE_TYPE_FIELD,
+            end_date_field='end_date',
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client(HTTP_USER_AGENT='calendar feed')
+        self.client.force_login(self.user)
+        self.url = reverse('report_builder_examples:view_report_calendar_feed', kwargs={'slug': self.report.slug})
+
+    @staticmethod
+    def contracts_in_window():
+        window_start, window_end = calendar_feed.get_feed_window(django_timezone.localdate())
+        return Contract.objects.filter(
+            Q(start_date__lt=window_end) & (Q(start_date__gte=window_start) | Q(end_date__gte=window_start))
+        )
+
+    def test_feed(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], calendar_feed.CONTENT_TYPE)
+        content = b''.join(response.streaming_content).decode()
+        self.assertTrue(content.startswith('BEGIN:VCALENDAR\r\n'))
+        self.assertTrue(content.endswith('END:VCALENDAR\r\n'))
+
+        in_window = self.contracts_in_window()
+        self.assertLess(in_window.count(), Contract.objects.exclude(start_date=None).count())
+        self.assertEqual(content.count('BEGIN:VEVENT'), in_window.count())
+        contract = in_window.first()
+        self.assertIn(f'DTSTART;VALUE=DATE:{contract.start_date:%Y%m%d}', content)
+
+        cached = self.client.get(self.url)
+        self.assertFalse(cached.streaming)
+        self.assertEqual(cached.content.decode(), content)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=cached['ETag']).status_code, 304)
+
+        contract.start_date = django_timezone.localdate() + timedelta(days=1)
+        contract.save()
+        with override_settings(REPORT_BUILDER_CALENDAR_FEED_CACHE_SECONDS=0):
+            self.assertNotEqual(b''.join(self.client.get(self.url).streaming_content).decode(), content)
+
+    def test_token(self):
+        client = Client()
+        self.assertEqual(client.get(self.url).status_code, 404)
+        self.assertEqual(client.get(self.url, {'token': 'not-a-token'}).status_code, 404)
+        token = calendar_feed.get_feed_token(self.user)
+        self.assertEqual(calendar_feed.get_feed_user(token), self.user)
+        self.assertEqual(client.get(self.url, {'token': token}).status_code, 200)
+
+        self.user.is_active = False
+        self.user.save()
+        self.assertIsNone(calendar_feed.get_feed_user(token))
+        self.assertEqual(client.get(self.url, {'token': token}).status_code, 404)
+
+    def test_not_a_calendar(self):
+        report = TableReport.objects.create(name='Contracts', report_type=ReportType.objects.get(name='Contract'))
+        url = reverse('report_builder_examples:view_report_calendar_feed', kwargs={'slug': report.slug})
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_logged_in_user(self):
+        report = CalendarReport.objects.create(name='My contracts')
+        CalendarReportDataSet.objects.create(
+            calendar_report=report,
+            order=0,
+            name='My contracts',
+            report_type=ReportType.objects.get(name='Contract'),
+            heading_field='notes',
+            start_date_field='start_date',
+            end_date_type=CalendarReportDataSet.END_DATE_TYPE_FIELD,
+            end_date_field='end_date',
+            query_data={
+                'condition': 'AND',
+                'rules': [
+                    {
+                        'id': 'company__user_profile__logged_in_user',
+                        'field': 'company__user_profile',
+                        'type': 'string',
+                        'operator': 'equal',
+                        'value': '1',
+                    }
+                ],
+                'valid': True,
+            },
+        )
+        url = reverse('report_builder_examples:view_report_calendar_feed', kwargs={'slug': report.slug})
+        # calendar apps have no session, only the token in the feed's URL
+        client = Client()
+        feeds = []
+        for user in get_user_model().objects.filter(username__startswith=SYNTHETIC_USERNAME_PREFIX):
+            data = {'token': calendar_feed.get_feed_token(user)}
+            # the first request streams the feed and the second is served from the cache
+            for response in (client.get(url, data), client.get(url, data)):
+                content = b''.join(response.streaming_content) if response.streaming else response.content
+                self.assertEqual(
+                    content.decode().count('BEGIN:VEVENT'),
+                    self.contracts_in_window().filter(company__user_profile=user).count(),
+                )
+            feeds.append(content)
+        self.assertEqual(len(feeds), 2)
+        self.assertNotEqual(feeds[0], feeds[1])
@@ -0,0 +1,79 @@
+import json
+import re
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from advanced_report_builder.models import (
+    CalendarReport,
+    CalendarReportDataSet,
+    CalendarReportDescription,
+    ReportType,
+)
+from advanced_report_builder.views.calendar import CalendarView
+from report_builder_examples.synthetic_data import generate_synthetic_data
+
+
+class CalendarUnionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate_synthetic_data(rows=100, users=2)
+        cls.user = get_user_model().objects.create_superuser('calendar', 'calendar@example.com', 'calendar')
+        cls.report = CalendarReport.objects.create(name='Calendar')
+        contract = ReportType.objects.get(name='Contract')
+        description = CalendarReportDescription.objects.create(
+            calendar_report=cls.report, name='Contract', description='{{ notes }} for {{ currency_amount }}'
+        )
+        CalendarReportDataSet.objects.create(
+            calendar_report=cls.report,
+            order=0,
+            name='Contracts',
+            report_type=contract,
+            heading_field='notes',
+            start_date_field='start_date',
+            end_date_type=CalendarReportDataSet.END_DATE_TYPE_FIELD,
+            end_date_field='end_date',
+            calendar_report_description=description,
+        )
+        CalendarReportDataSet.objects.create(
+            calendar_report=cls.report,
+            order=1,
+            name='Contract starts',
+            report_type=contract,
+            heading_field='company__name',
+            start_date_field='start_date',
+            end_date_type=CalendarReportDataSet.END_DATE_TYPE_DURATION_FIXED,
+            end_duration=7200,
+        )
+        CalendarReportDataSet.objects.create(
+            calendar_report=cls.report,
+            order=2,
+            name='Payments',
+            report_type=ReportType.objects.get(name='Payment'),
+            heading_field='currency_amount',
+            start_date_field='date',
+            end_date_type=CalendarReportDataSet.END_DATE_TYPE_DURATION_FIXED,
+        )
+
+    def render(self):
+        client = Client(HTTP_USER_AGENT='calendar union')
+        client.force_login(self.user)
+        url = reverse('report_builder_examples:view_report', kwargs={'slug': self.report.slug})
+        with CaptureQueriesContext(connection) as queries:
+            content = client.get(url).content.decode()
+        events = [json.loads(table)['data'] for table in re.findall(r'var table = (\{.*\});', content)]
+        return events, [query['sql'] for query in queries.captured_queries]
+
+    def test_union(self):
+        with mock.patch.object(CalendarView, 'combine_data_set_queries'):
+            expected, separate_queries = self.render()
+        events, queries = self.render()
+        self.assertEqual(len(events), 3)
+        self.assertTrue(all(events))
+        self.assertEqual(events, expected)
+        self.assertEqual(len(queries), len(separate_queries) - 2)
+        self.assertEqual(sum('UNION ALL' in query for query in queries), 1)
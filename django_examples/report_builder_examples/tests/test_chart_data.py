@@ -0,0 +1,88 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from advanced_report_builder.globals import ANNOTATION_CHOICE_SUM, ANNOTATION_VALUE_MONTH
+from advanced_report_builder.models import (
+    LineChartReport,
+    PieChartReport,
+    ReportType,
+    SingleValueReport,
+    TableReport,
+)
+from report_builder_examples.models import Company, Payment
+from report_builder_examples.synthetic_data import generate_synthetic_data
+
+FIELDS = [{'field': 'currency_amount', 'title': 'Amount', 'data_attr': f'annotations_type-{ANNOTATION_CHOICE_SUM}'}]
+
+
+class ChartDataTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate_synthetic_data(rows=100, days=200, future_days=0, users=2)
+        cls.user = get_user_model().objects.create_superuser('data', 'data@example.com', 'data')
+        cls.payment = ReportType.objects.get(name='Payment')
+
+    def setUp(self):
+        self.client = Client(HTTP_USER_AGENT='chart data')
+        self.client.force_login(self.user)
+
+    @staticmethod
+    def data_url(report):
+        return reverse('report_builder_examples:view_report_data', kwargs={'slug': report.slug})
+
+    def test_line_chart(self):
+        report = LineChartReport.objects.create(
+            name='Monthly Payments',
+            report_type=self.payment,
+            axis_scale=ANNOTATION_VALUE_MONTH,
+            date_field='date',
+            axis_value_type=ANNOTATION_CHOICE_SUM,
+            fields=FIELDS,
+        )
+        response = self.client.get(self.data_url(report))
+        self.assertEqual(response.status_code, 200)
+        chart_data = response.json()
+        self.assertEqual(len(chart_data['series']), 1)
+        self.assertEqual(chart_data['series'][0]['title'], 'Amount')
+        self.assertEqual(len(chart_data['labels']), len(chart_data['series'][0]['data']))
+        self.assertTrue(all(label.endswith('-01') for label in chart_data['labels']))
+        # the amounts are pence, shown in pounds
+        total = sum(float(value) for value in chart_data['series'][0]['data'])
+        self.assertAlmostEqual(total * 100, sum(Payment.objects.values_list('amount', flat=True)))
+
+        etag = response['ETag']
+        not_modified = self.client.get(self.data_url(report), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified['ETag'], etag)
+        not_modified = self.client.get(self.data_url(report), HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(not_modified.status_code, 304)
+
+        Payment.objects.create(company=Company.objects.first(), date=date.today(), amount=12345, quantity=1)
+        response = self.client.get(
+            self.data_url(report), HTTP_IF_NONE_MATCH=etag, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_pie_chart_and_single_value(self):
+        pie_chart = PieChartReport.objects.create(name='Payments', report_type=self.payment, fields=FIELDS)
+        chart_data = self.client.get(self.data_url(pie_chart)).json()
+        self.assertNotIn('labels', chart_data)
+        self.assertEqual(chart_data['series'][0]['title'], 'Amount')
+
+        single_value = SingleValueReport.objects.create(
+            name='Total Payments',
+            report_type=self.payment,
+            single_value_type=SingleValueReport.SingleValueType.SUM,
+            field='currency_amount',
+        )
+        chart_data = self.client.get(self.data_url(single_value)).json()
+        self.assertEqual(len(chart_data['series']), 1)
+        self.assertIn('prefix', chart_data)
+
+    def test_not_a_chart(self):
+        report = TableReport.objects.create(name='Payments', report_type=self.payment)
+        self.assertEqual(self.client.get(self.data_url(report)).status_code, 404)
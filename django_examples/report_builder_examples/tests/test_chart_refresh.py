@@ -0,0 +1,100 @@
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils.html import escapejs
+
+from advanced_report_builder.globals import ANNOTATION_CHOICE_SUM, ANNOTATION_VALUE_DAY, ANNOTATION_VALUE_WEEK
+from advanced_report_builder.models import BarChartReport, Dashboard, DashboardReport, LineChartReport, ReportType
+from report_builder_examples.synthetic_data import generate_synthetic_data
+
+FIELDS = [{'field': 'currency_amount', 'title': 'Amount', 'data_attr': f'annotations_type-{ANNOTATION_CHOICE_SUM}'}]
+
+
+class ChartRefreshTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate_synthetic_data(rows=200, days=200, future_days=0, users=2)
+        cls.user = get_user_model().objects.create_superuser('refresh', 'refresh@example.com', 'refresh')
+        cls.chart_kwargs = {
+            'report_type': ReportType.objects.get(name='Payment'),
+            'date_field': 'date',
+            'axis_value_type': ANNOTATION_CHOICE_SUM,
+            'fields': FIELDS,
+        }
+
+    def setUp(self):
+        self.client = Client(HTTP_USER_AGENT='chart refresh')
+        self.client.force_login(self.user)
+
+    def get_chart_data(self, report, since=None):
+        url = reverse('report_builder_examples:view_report_data', kwargs={'slug': report.slug})
+        response = self.client.get(url, {'since': since} if since else {})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_since(self):
+        for report in (
+            LineChartReport.objects.create(name='Line', axis_scale=ANNOTATION_VALUE_WEEK, **self.chart_kwargs),
+            BarChartReport.objects.create(
+                name='Bar', axis_scale=ANNOTATION_VALUE_DAY, show_blank_dates=True, **self.chart_kwargs
+            ),
+        ):
+            with self.subTest(report=report.name):
+                chart_data = self.get_chart_data(report)
+                self.assertNotIn('since', chart_data)
+                labels = chart_data['labels']
+                since = labels[-3]
+
+                delta = self.get_chart_data(report, since=since)
+                self.assertEqual(delta['since'], since)
+                self.assertEqual(delta['labels'], labels[-3:])
+                self.assertEqual(delta['series'][0]['data'], chart_data['series'][0]['data'][-3:])
+
+    def test_since_in_period(self):
+        report = LineChartReport.objects.create(name='Line', axis_scale=ANNOTATION_VALUE_WEEK, **self.chart_kwargs)
+        labels = self.get_chart_data(report)['labels']
+        # a date within a week returns from the start of that week
+        since = date.fromisoformat(labels[-2]) + timedelta(days=3)
+        delta = self.get_chart_data(report, since=since.isoformat())
+        self.assertEqual(delta['since'], labels[-2])
+        self.assertEqual(delta['labels'], labels[-2:])
+
+    def test_formatted_labels_return_everything(self):
+        report = BarChartReport.objects.create(
+            name='Bar', axis_scale=ANNOTATION_VALUE_WEEK, show_blank_dates=False, **self.chart_kwargs
+        )
+        chart_data = self.get_chart_data(report)
+        self.assertEqual(self.get_chart_data(report, since='2026-01-01'), chart_data)
+
+    def test_refresh_url(self):
+        report = LineChartReport.objects.create(name='Line', axis_scale=ANNOTATION_VALUE_WEEK, **self.chart_kwargs)
+        url = reverse('report_builder_examples:view_report', kwargs={'slug': report.slug})
+        data_url = reverse('report_builder_examples:view_report_data', kwargs={'slug': report.slug})
+        self.assertNotIn('advanced_report_builder_chart_refresh(', self.client.get(url).content.decode())
+        with override_settings(
+            REPORT_BUILDER_CHART_DATA_URL_NAME='report_builder_examples:view_report_data',
+            REPORT_BUILDER_CHART_REFRESH_SECONDS=60,
+        ):
+            content = self.client.get(url).content.decode()
+        self.assertIn('advanced_report_builder_chart_refresh(', content)
+        self.assertIn(f"url: '{escapejs(data_url)}'", content)
+
+    @override_settings(
+        REPORT_BUILDER_CHART_DATA_URL_NAME='report_builder_examples:view_report_data',
+        REPORT_BUILDER_CHART_REFRESH_SECONDS=60,
+    )
+    def test_dashboard_pod(self):
+        report = LineChartReport.objects.create(name='Line', axis_scale=ANNOTATION_VALUE_WEEK, **self.chart_kwargs)
+        dashboard = Dashboard.objects.create(name='Refresh')
+        dashboard_report = DashboardReport.objects.create(dashboard=dashboard, report=report, order=1)
+        content = self.client.get(
+            reverse('report_builder_examples:view_dashboard', kwargs={'slug': dashboard.slug})
+        ).content.decode()
+        data_url = reverse(
+            'report_builder_examples:view_report_data',
+            kwargs={'slug': f'pk-{report.slug}-dashboard_report-{dashboard_report.pk}'},
+        )
+        self.assertIn(f"url: '{escapejs(data_url)}'", content)
+        self.assertEqual(self.client.get(data_url).json(), self.get_chart_data(report))
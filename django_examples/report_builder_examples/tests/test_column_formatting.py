@@ -0,0 +1,118 @@
+import datetime
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+from django_datatables.columns import ColumnBase, DateColumn
+from django_datatables.datatables import DatatableExcludedRow
+
+from advanced_report_builder.columns import (
+    ReportBuilderCurrencyColumn,
+    ReportBuilderCurrencyPenceColumn,
+    ReportBuilderDateColumn,
+    ReportBuilderNumberColumn,
+    compile_date_format,
+)
+from advanced_report_builder.globals import DATE_FORMAT_TYPES_DJANGO_FORMAT
+from advanced_report_builder.views import calendar, kanban
+from advanced_report_builder.views.datatables.tables import ColumnBatchMixin
+
+
+class ColumnFormattingTests(SimpleTestCase):
+    """The batched format_column of each column must give the same results as row_result."""
+
+    def assertFormatsLikeRowResult(self, column, values):
+        rows = [{column.field: value} for value in values]
+        self.assertEqual(column.format_column(rows, {}), [column.row_result(row, {}) for row in rows])
+
+    def test_compile_date_format(self):
+        values = [
+            datetime.date(2024, 1, 5),
+            datetime.date(1999, 12, 31),
+            datetime.datetime(2005, 7, 9, 13, 45, tzinfo=datetime.UTC),
+        ]
+        for date_format in [*DATE_FORMAT_TYPES_DJANGO_FORMAT.values(), '%d%%%m {%Y}']:
+            format_date = compile_date_format(date_format)
+            for value in values:
+                with self.subTest(date_format=date_format, value=value):
+                    self.assertEqual(format_date(value), value.strftime(date_format))
+
+    def test_date_column(self):
+        for date_format in ('%d/%m/%Y', '%B %y'):
+            column = ReportBuilderDateColumn(column_name='date', field='date', date_format=date_format)
+            self.assertFormatsLikeRowResult(column, [datetime.date(2024, 2, 29), None, 'text'])
+
+    def test_number_column(self):
+        values = [0, 12, 1.5, -2.25, Decimal('10.500'), None, 1234567.891]
+        for decimal_places, trim_zeros in ((0, True), (2, True), (2, False)):
+            column = ReportBuilderNumberColumn(
+                column_name='number', field='number', decimal_places=decimal_places, trim_zeros=trim_zeros
+            )
+            self.assertFormatsLikeRowResult(column, values)
+
+    def test_currency_columns(self):
+        values = [0, 5, 99999, -123456789, Decimal('1234.5'), None]
+        for column_class in (ReportBuilderCurrencyColumn, ReportBuilderCurrencyPenceColumn):
+            for prefix in ('', '£'):
+                column = column_class(column_name='amount', field='amount')
+                column.currency_prefix = prefix
+                with self.subTest(column=column_class.__name__, prefix=prefix):
+                    self.assertFormatsLikeRowResult(column, values)
+
+    def test_row_result_override(self):
+        class BracketsNumberColumn(ReportBuilderNumberColumn):
+            def row_result(self, data, page_data):
+                return f'({super().row_result(data, page_data)})'
+
+        table = ColumnBatchMixin()
+        table.page_results = {}
+        rows = [{'number': 1.5}, {'number': None}]
+        for column, expected in (
+            (ReportBuilderNumberColumn(column_name='number', field='number', decimal_places=1), ['1.5', '']),
+            (BracketsNumberColumn(column_name='number', field='number', decimal_places=1), ['(1.5)', '()']),
+        ):
+            self.assertEqual(table.get_column_values(column, rows, set()), expected)
+
+
+class ExcludingColumn(ColumnBase):
+    def row_result(self, data, _page_data):
+        if data['exclude']:
+            raise DatatableExcludedRow
+        return data['name']
+
+
+class ExcludingDateColumn(DateColumn):
+    def iso_row_result(self, data, _page_data):
+        if data['exclude']:
+            raise DatatableExcludedRow
+        return data['name']
+
+
+class ColumnExclusionTests(SimpleTestCase):
+    """Columns that kanban and calendar tables format themselves still exclude rows."""
+
+    rows = [{'name': 'kept', 'exclude': False}, {'name': 'excluded', 'exclude': True}]
+
+    def get_table_array(self, table_class, *columns):
+        # the constructor needs a model and a view, which formatting doesn't use
+        table = table_class.__new__(table_class)
+        table.columns = columns
+        table.page_results = {}
+        table.max_records = None
+        return table.get_table_array(None, [dict(row) for row in self.rows])
+
+    def test_description_columns(self):
+        for module in (kanban, calendar):
+            with self.subTest(table=module.__name__):
+                description = module.DescriptionColumn(column_name='description', field='', html='{{ name }}')
+                table_array = self.get_table_array(
+                    module.KanbanTable if module is kanban else module.CalendarTable,
+                    ExcludingColumn(column_name='name', field='name'),
+                    description,
+                )
+                self.assertEqual(table_array, [['kept', 'kept']])
+
+    def test_iso_date_column(self):
+        table_array = self.get_table_array(
+            calendar.CalendarTable, ExcludingDateColumn(column_name='date', field='name')
+        )
+        self.assertEqual(table_array, [['kept']])
@@ -0,0 +1,95 @@
+import json
+import math
+import re
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import Client, SimpleTestCase, TestCase
+from django.urls import reverse
+
+from advanced_report_builder.downsample import downsample_rows, lttb_indices
+from advanced_report_builder.globals import ANNOTATION_CHOICE_SUM, ANNOTATION_VALUE_DAY
+from advanced_report_builder.models import LineChartReport, ReportType
+from report_builder_examples.synthetic_data import generate_synthetic_data
+
+
+def make_rows(values):
+    start = date(2024, 1, 1)
+    return [
+        [(start + timedelta(days=index)).strftime('%Y-%m-%d'), *row_values] for index, row_values in enumerate(values)
+    ]
+
+
+class LttbTests(SimpleTestCase):
+    def test_short_series_unchanged(self):
+        points = [(x, x) for x in range(10)]
+        self.assertEqual(lttb_indices(points, 10), list(range(10)))
+        self.assertEqual(lttb_indices(points, 2), list(range(10)))
+
+    def test_keeps_ends_and_peaks(self):
+        points = [(x, math.sin(x / 10)) for x in range(1000)]
+        points[500] = (500, 50)
+        points[700] = (700, -50)
+        indices = lttb_indices(points, 100)
+        self.assertEqual(len(indices), 100)
+        self.assertEqual(indices, sorted(indices))
+        self.assertEqual(indices[0], 0)
+        self.assertEqual(indices[-1], 999)
+        self.assertIn(500, indices)
+        self.assertIn(700, indices)
+
+    def test_rows_keep_each_lines_peaks(self):
+        values = [[0, 0] for _ in range(2000)]
+        values[300][0] = 100
+        values[1500][1] = '250'
+        rows = make_rows(values)
+        downsampled = downsample_rows(rows, 200)
+        self.assertLessEqual(len(downsampled), 200)
+        self.assertIn(rows[300], downsampled)
+        self.assertIn(rows[1500], downsampled)
+        self.assertEqual(downsampled[0], rows[0])
+        self.assertEqual(downsampled[-1], rows[-1])
+        short_rows = rows[:50]
+        self.assertIs(downsample_rows(short_rows, 200), short_rows)
+
+
+class LineChartDownsampleTests(TestCase):
+    def test_line_chart(self):
+        generate_synthetic_data(rows=500, days=400, future_days=0, users=2)
+        user = get_user_model().objects.create_superuser('downsample', 'downsample@example.com', 'downsample')
+        client = Client(HTTP_USER_AGENT='downsample')
+        client.force_login(user)
+        report = LineChartReport.objects.create(
+            name='Daily Payments',
+            report_type=ReportType.objects.get(name='Payment'),
+            axis_scale=ANNOTATION_VALUE_DAY,
+            date_field='date',
+            axis_value_type=ANNOTATION_CHOICE_SUM,
+            fields=[
+                {
+                    'field': 'currency_amount',
+                    'title': 'Amount',
+                    'data_attr': f'annotations_type-{ANNOTATION_CHOICE_SUM}',
+                }
+            ],
+        )
+
+        def get_points(slug):
+            response = client.get(reverse('report_builder_examples:view_report', kwargs={'slug': slug}))
+            self.assertEqual(response.status_code, 200)
+            content = response.content.decode()
+            return len(json.loads(re.search(r'var table = (\{.*\});', content).group(1))['data']), content
+
+        all_points, content = get_points(report.slug)
+        self.assertGreater(all_points, 300)
+        self.assertNotIn('Full resolution', content)
+
+        report.max_points = 100
+        report.save()
+        points, content = get_points(report.slug)
+        self.assertLessEqual(points, 100)
+        self.assertIn('Full resolution', content)
+
+        points, content = get_points(f'pk-{report.slug}-full{report.id}-1')
+        self.assertEqual(points, all_points)
+        self.assertIn('Downsample', content)
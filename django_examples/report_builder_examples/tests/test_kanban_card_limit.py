@@ -0,0 +1,76 @@
+import json
+import re
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from advanced_report_builder.models import KanbanReport, KanbanReportLane, ReportType
+from report_builder_examples.models import Contract
+from report_builder_examples.synthetic_data import generate_synthetic_data
+
+
+class KanbanCardLimitTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate_synthetic_data(rows=100, users=2)
+        cls.user = get_user_model().objects.create_superuser('kanban', 'kanban@example.com', 'kanban')
+        cls.report = KanbanReport.objects.create(name='Contracts')
+        cls.contract = ReportType.objects.get(name='Contract')
+        cls.contract_count = Contract.objects.count()
+
+    def setUp(self):
+        self.client = Client(HTTP_USER_AGENT='kanban card limit')
+        self.client.force_login(self.user)
+        self.url = reverse('report_builder_examples:view_report', kwargs={'slug': self.report.slug})
+
+    def add_lane(self, order_by_field, ascending=True, card_limit=7):
+        return KanbanReportLane.objects.create(
+            kanban_report=self.report,
+            name='Lane',
+            order=0,
+            report_type=self.contract,
+            heading_field='notes',
+            order_by_field=order_by_field,
+            order_by_ascending=ascending,
+            card_limit=card_limit,
+        )
+
+    def load_all(self, lane):
+        content = self.client.get(self.url).content.decode()
+        self.assertIn(f'<span class="badge badge-secondary">{self.contract_count}</span>', content)
+        cards = json.loads(re.search(r'var table = (\{.*\});', content).group(1))['data']
+        self.assertEqual(len(cards), lane.card_limit)
+        cursor = json.loads(re.search(r'var cursor = (.*);', content).group(1))
+        while cursor is not None:
+            response = self.client.post(
+                self.url, {'kanban_report_lane': lane.id, 'lane_index': 0, 'cursor': json.dumps(cursor)}
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.json()['data']), lane.card_limit)
+            cards += response.json()['data']
+            cursor = response.json()['cursor']
+        return cards
+
+    def assert_pages(self, lane, order_by):
+        cards = self.load_all(lane)
+        # the hidden pk column is last
+        self.assertEqual(
+            [card[-1] for card in cards], list(Contract.objects.order_by(*order_by).values_list('id', flat=True))
+        )
+
+    def test_keyset(self):
+        # amount can't be null, so the lane seeks on it
+        lane = self.add_lane(order_by_field='amount', ascending=False)
+        self.assert_pages(lane, ('-amount', '-id'))
+
+    def test_offset(self):
+        # start_date can be null, so the lane pages with an offset
+        lane = self.add_lane(order_by_field='start_date')
+        self.assert_pages(lane, ('start_date', 'id'))
+
+    def test_bad_request(self):
+        lane = self.add_lane(order_by_field='amount')
+        self.assertEqual(self.client.post(self.url, {'kanban_report_lane': lane.id}).status_code, 400)
+        response = self.client.post(self.url, {'kanban_report_lane': lane.id + 1, 'lane_index': 0, 'cursor': 'null'})
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,75 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import Sum
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.formats import number_format
+
+from advanced_report_builder.models import KanbanReport, KanbanReportLane, ReportType
+from report_builder_examples.models import Company, Contract
+from report_builder_examples.synthetic_data import generate_synthetic_data
+
+
+def rule_data(field, operator, value, rule_type='integer'):
+    return {
+        'condition': 'AND',
+        'rules': [{'id': field, 'field': field, 'type': rule_type, 'operator': operator, 'value': value}],
+        'valid': True,
+    }
+
+
+class KanbanLaneTotalsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate_synthetic_data(rows=200, users=2)
+        cls.user = get_user_model().objects.create_superuser('totals', 'totals@example.com', 'totals')
+        cls.report = KanbanReport.objects.create(name='Totals')
+        contract = ReportType.objects.get(name='Contract')
+        for order, (temperature, label) in enumerate(Contract.TEMPERATURE_TYPES):
+            KanbanReportLane.objects.create(
+                kanban_report=cls.report,
+                name=label,
+                order=order,
+                report_type=contract,
+                heading_field='notes',
+                card_limit=5,
+                sum_field='currency_amount',
+                query_data=rule_data('temperature', 'equal', temperature),
+            )
+        company = ReportType.objects.get(name='Company')
+        for order, query_data in enumerate(
+            # the payments filter joins many rows for each company
+            (rule_data('payment__amount', 'greater', 5000), rule_data('active', 'equal', True, 'boolean')),
+            start=3,
+        ):
+            KanbanReportLane.objects.create(
+                kanban_report=cls.report,
+                name=f'Companies {order}',
+                order=order,
+                report_type=company,
+                heading_field='name',
+                card_limit=5,
+                query_data=query_data,
+            )
+
+    def test_totals(self):
+        client = Client(HTTP_USER_AGENT='kanban totals')
+        client.force_login(self.user)
+        url = reverse('report_builder_examples:view_report', kwargs={'slug': self.report.slug})
+        with CaptureQueriesContext(connection) as queries:
+            content = client.get(url).content.decode()
+        count_queries = [query['sql'] for query in queries.captured_queries if 'COUNT(' in query['sql']]
+        # one for the contract lanes and one for the company lanes
+        self.assertEqual(len(count_queries), 2, '\n'.join(count_queries))
+
+        for temperature, _ in Contract.TEMPERATURE_TYPES:
+            contracts = Contract.objects.filter(temperature=temperature)
+            total = number_format(contracts.aggregate(total=Sum('amount'))['total'] / 100, 2, force_grouping=True)
+            self.assertIn(f'<span class="badge badge-secondary">{contracts.count()}</span>', content)
+            self.assertIn(f'<span class="badge badge-info">{total}</span>', content)
+        for companies in (
+            Company.objects.filter(payment__amount__gt=5000).distinct(),
+            Company.objects.filter(active=True),
+        ):
+            self.assertIn(f'<span class="badge badge-secondary">{companies.count()}</span>', content)
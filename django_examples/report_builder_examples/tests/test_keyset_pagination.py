@@ -0,0 +1,113 @@
+import json
+import re
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from advanced_report_builder.models import ReportType, TableReport
+from advanced_report_builder.views.datatables.keyset import KeysetTable
+from report_builder_examples.synthetic_data import generate_synthetic_data
+
+PAGE_LENGTH = 10
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # a few days of data so many rows share a date and the primary key has to break the ties
+        generate_synthetic_data(rows=95, days=3, future_days=0, users=2)
+        cls.user = get_user_model().objects.create_superuser('keyset', 'keyset@example.com', 'keyset')
+        cls.payment = ReportType.objects.get(name='Payment')
+
+    def setUp(self):
+        self.client = Client(HTTP_USER_AGENT='keyset')
+        self.client.force_login(self.user)
+
+    def create_report(self, order_by_field='date', order_by_ascending=True, estimated_count=False):
+        return TableReport.objects.create(
+            name='Payments',
+            report_type=self.payment,
+            table_fields=[
+                {'field': 'date', 'title': 'Date'},
+                {'field': 'currency_amount', 'title': 'Amount'},
+                {'field': 'company__name', 'title': 'Company'},
+            ],
+            order_by_field=order_by_field,
+            order_by_ascending=order_by_ascending,
+            keyset_pagination=True,
+            estimated_count=estimated_count,
+        )
+
+    def get_page(self, report, start, direction='asc', extra_data=None, **cursor):
+        url = reverse('report_builder_examples:view_report', kwargs={'slug': report.slug})
+        table_id = re.search(r'<table[^>]* id="([^"]+)"', self.client.get(url).content.decode()).group(1)
+        data = {
+            'datatable_data': 1,
+            'table_id': table_id,
+            'draw': 2,
+            'start': start,
+            'length': PAGE_LENGTH,
+            'order[0][column]': 0,
+            'order[0][dir]': direction,
+            **{key: json.dumps(value) for key, value in cursor.items()},
+            **(extra_data or {}),
+        }
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(url, data)
+        self.assertEqual(response.status_code, 200)
+        return response.json(), [query['sql'] for query in queries.captured_queries]
+
+    def test_seek_matches_offset(self):
+        report = self.create_report()
+        for direction in ('asc', 'desc'):
+            with self.subTest(direction=direction):
+                page, _ = self.get_page(report, start=0, direction=direction)
+                self.assertEqual(page['recordsTotal'], 95)
+                start = 0
+                while page['data']:
+                    offset_page, _ = self.get_page(report, start=start, direction=direction)
+                    self.assertEqual(page['data'], offset_page['data'])
+                    start += PAGE_LENGTH
+                    page, queries = self.get_page(
+                        report, start=start, direction=direction, keyset_after=page['keyset']['last']
+                    )
+                    self.assertFalse([sql for sql in queries if 'OFFSET' in sql and 'payment' in sql])
+                self.assertEqual(start, 100)
+
+    def test_previous_page(self):
+        report = self.create_report()
+        first, _ = self.get_page(report, start=0)
+        second, _ = self.get_page(report, start=PAGE_LENGTH, keyset_after=first['keyset']['last'])
+        third, _ = self.get_page(report, start=PAGE_LENGTH * 2, keyset_after=second['keyset']['last'])
+        previous, _ = self.get_page(report, start=PAGE_LENGTH, keyset_before=third['keyset']['first'])
+        self.assertEqual(previous['data'], second['data'])
+        self.assertEqual(previous['keyset'], second['keyset'])
+
+    def test_unindexed_ordering_uses_offset(self):
+        report = self.create_report(order_by_field='quantity')
+        page, _ = self.get_page(report, start=PAGE_LENGTH)
+        self.assertNotIn('keyset', page)
+        self.assertEqual(len(page['data']), PAGE_LENGTH)
+
+    def test_estimated_count_below_threshold_is_exact(self):
+        report = self.create_report(estimated_count=True)
+        page, _ = self.get_page(report, start=0)
+        self.assertEqual(page['recordsTotal'], 95)
+        self.assertNotIn('count_estimated', page)
+
+    @override_settings(REPORT_BUILDER_ESTIMATED_COUNT_THRESHOLD=1000)
+    def test_estimated_count(self):
+        report = self.create_report(estimated_count=True)
+        with mock.patch.object(KeysetTable, 'estimate_count', return_value=250000):
+            page, _ = self.get_page(report, start=0)
+            self.assertEqual(page['recordsTotal'], 250000)
+            self.assertTrue(page['count_estimated'])
+            self.assertEqual(len(page['data']), PAGE_LENGTH)
+
+            page, _ = self.get_page(report, start=0, extra_data={'exact_count': 1})
+            self.assertEqual(page['recordsTotal'], 95)
+            self.assertNotIn('count_estimated', page)
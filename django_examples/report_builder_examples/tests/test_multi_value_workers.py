@@ -0,0 +1,70 @@
+import re
+import threading
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from advanced_report_builder.models import MultiValueReport, MultiValueReportCell, MultiValueReportColumn, ReportType
+from advanced_report_builder.views.multi_value import MultiValueView
+from report_builder_examples.synthetic_data import generate_synthetic_data
+
+
+class MultiValueWorkersTests(TransactionTestCase):
+    def setUp(self):
+        generate_synthetic_data(rows=100, days=100, future_days=0, users=2)
+        user = get_user_model().objects.create_superuser('workers', 'workers@example.com', 'workers')
+        self.client = Client(HTTP_USER_AGENT='multi value workers')
+        self.client.force_login(user)
+
+        self.report = MultiValueReport.objects.create(name='Counts', rows=2, columns=5)
+        for column in range(1, 6):
+            MultiValueReportColumn.objects.create(multi_value_report=self.report, column=column, width=20)
+        count = MultiValueReportCell.MultiValueType.COUNT
+        for column, name in enumerate(('Payment', 'Company', 'Person', 'Contract', 'Sector'), 1):
+            MultiValueReportCell.objects.create(multi_value_report=self.report, row=1, column=column, text=name)
+            MultiValueReportCell.objects.create(
+                multi_value_report=self.report,
+                row=2,
+                column=column,
+                multi_value_type=count,
+                report_type=ReportType.objects.get(name=name),
+            )
+        # a bad cell is contained to its own cell
+        MultiValueReportCell.objects.filter(row=2, column=5).update(
+            multi_value_type=MultiValueReportCell.MultiValueType.SUM, field='name'
+        )
+        MultiValueReportCell.objects.filter(row=1, column=5).update(
+            multi_value_type=MultiValueReportCell.MultiValueType.EQUATION, text='A2 + B2'
+        )
+
+    def render(self):
+        response = self.client.get(reverse('report_builder_examples:view_report', kwargs={'slug': self.report.slug}))
+        self.assertEqual(response.status_code, 200)
+        content = response.content.decode()
+        # each render gives the cells random ids
+        for index, cell_id in enumerate(re.findall(r' id="([a-z]{8})"', content)):
+            content = content.replace(cell_id, f'cell{index}')
+        return content
+
+    def test_workers(self):
+        with self.assertLogs('advanced_report_builder.views.multi_value', 'WARNING'):
+            expected = self.render()
+        self.assertIn('E2: not a number field', expected)
+
+        threads = set()
+
+        def compute_cell(view, **kwargs):
+            threads.add(threading.current_thread().name)
+            return compute_cell.original(view, **kwargs)
+
+        compute_cell.original = MultiValueView._compute_cell
+        with (
+            override_settings(REPORT_BUILDER_MULTI_VALUE_WORKERS=4),
+            mock.patch.object(MultiValueView, '_compute_cell', autospec=True, side_effect=compute_cell),
+            self.assertLogs('advanced_report_builder.views.multi_value', 'WARNING'),
+        ):
+            self.assertEqual(self.render(), expected)
+        self.assertTrue(all(name.startswith('multi_value') for name in threads))
+        self.assertGreater(len(threads), 1)
@@ -0,0 +1,171 @@
+import re
+from datetime import date, timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Sum
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from advanced_report_builder.globals import (
+    ANNOTATION_CHOICE_SUM,
+    ANNOTATION_VALUE_DAY,
+    ANNOTATION_VALUE_FUNCTIONS,
+    ANNOTATION_VALUE_MONTH,
+    ANNOTATION_VALUE_QUARTER,
+    ANNOTATION_VALUE_WEEK,
+    ANNOTATION_VALUE_YEAR,
+)
+from advanced_report_builder.models import BarChartReport, LineChartReport, ReportQuery, ReportType
+from advanced_report_builder.period_cache import (
+    CACHE_PREFIX,
+    PeriodBucketCache,
+    get_period_start,
+    invalidate_period_cache,
+)
+from advanced_report_builder.variable_date import VariableDate
+from report_builder_examples.models import Payment
+from report_builder_examples.synthetic_data import generate_synthetic_data
+
+TODAY = date(2026, 3, 18)
+
+
+@override_settings(REPORT_BUILDER_PERIOD_CACHE_TIMEOUT=None, REPORT_BUILDER_PERIOD_CACHE_LATE_DAYS=1)
+class PeriodBucketCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate_synthetic_data(rows=300, days=400, future_days=10, users=2)
+
+    def setUp(self):
+        cache.clear()
+
+    @staticmethod
+    def get_query(axis_scale):
+        return (
+            Payment.objects.annotate(bucket=ANNOTATION_VALUE_FUNCTIONS[axis_scale]('date'))
+            .values('bucket')
+            .annotate(total=Sum('amount'))
+            .order_by('bucket')
+        )
+
+    @staticmethod
+    def get_period_cache(axis_scale, today):
+        return PeriodBucketCache(
+            report_id=1,
+            date_field='date',
+            django_field=Payment._meta.get_field('date'),
+            bucket_field='bucket',
+            axis_scale=axis_scale,
+            today=today,
+        )
+
+    def test_period_start(self):
+        day = date(2026, 8, 20)
+        self.assertEqual(get_period_start(day, ANNOTATION_VALUE_YEAR), date(2026, 1, 1))
+        self.assertEqual(get_period_start(day, ANNOTATION_VALUE_QUARTER), date(2026, 7, 1))
+        self.assertEqual(get_period_start(day, ANNOTATION_VALUE_MONTH), date(2026, 8, 1))
+        self.assertEqual(get_period_start(day, ANNOTATION_VALUE_WEEK), date(2026, 8, 17))
+        self.assertEqual(get_period_start(day, ANNOTATION_VALUE_DAY), day)
+
+    def test_results_match_query(self):
+        for axis_scale in ANNOTATION_VALUE_FUNCTIONS:
+            query = self.get_query(axis_scale)
+            expected = list(query)
+            with self.subTest(axis_scale=axis_scale):
+                # filled, then read back from the cache, then rolled over to later days
+                for today in (TODAY, TODAY, TODAY + timedelta(days=1), TODAY + timedelta(days=40)):
+                    self.assertEqual(self.get_period_cache(axis_scale, today).get_results(query), expected)
+
+    def test_only_open_periods_queried(self):
+        query = self.get_query(ANNOTATION_VALUE_DAY)
+        self.get_period_cache(ANNOTATION_VALUE_DAY, TODAY).get_results(query)
+        with CaptureQueriesContext(connection) as queries:
+            self.get_period_cache(ANNOTATION_VALUE_DAY, TODAY).get_results(query)
+        self.assertEqual(len(queries), 1)
+        self.assertIn('IS NULL', queries[0]['sql'])
+
+    def test_invalidate(self):
+        query = self.get_query(ANNOTATION_VALUE_MONTH)
+        self.get_period_cache(ANNOTATION_VALUE_MONTH, TODAY).get_results(query)
+        Payment.objects.filter(date__lt=date(2026, 1, 1)).update(amount=1)
+        self.assertNotEqual(self.get_period_cache(ANNOTATION_VALUE_MONTH, TODAY).get_results(query), list(query))
+        invalidate_period_cache(report_id=1)
+        self.assertEqual(self.get_period_cache(ANNOTATION_VALUE_MONTH, TODAY).get_results(query), list(query))
+
+    def get_client(self):
+        user = get_user_model().objects.create_superuser('period', 'period@example.com', 'period')
+        client = Client(HTTP_USER_AGENT='period cache')
+        client.force_login(user)
+        return client
+
+    def get_chart_kwargs(self):
+        return {
+            'report_type': ReportType.objects.get(name='Payment'),
+            'axis_scale': ANNOTATION_VALUE_DAY,
+            'date_field': 'date',
+            'axis_value_type': ANNOTATION_CHOICE_SUM,
+            'fields': [
+                {
+                    'field': 'currency_amount',
+                    'title': 'Amount',
+                    'data_attr': f'annotations_type-{ANNOTATION_CHOICE_SUM}',
+                }
+            ],
+        }
+
+    def test_charts(self):
+        client = self.get_client()
+        chart_kwargs = self.get_chart_kwargs()
+        for report in (
+            BarChartReport.objects.create(name='Bar Chart', show_blank_dates=True, **chart_kwargs),
+            LineChartReport.objects.create(name='Line Chart', **chart_kwargs),
+        ):
+            url = reverse('report_builder_examples:view_report', kwargs={'slug': report.slug})
+            with self.subTest(report=report.name):
+                with override_settings(REPORT_BUILDER_PERIOD_CACHE_TIMEOUT=0):
+                    expected = self.render(client, url)
+                with mock.patch.object(
+                    PeriodBucketCache, 'get_results', autospec=True, side_effect=PeriodBucketCache.get_results
+                ) as get_results:
+                    self.assertEqual(self.render(client, url), expected)
+                    self.assertEqual(self.render(client, url), expected)
+                self.assertEqual(get_results.call_count, 2)
+
+    def test_variable_dates_kept_for_the_day(self):
+        client = self.get_client()
+        report = BarChartReport.objects.create(name='Last 12 Months', **self.get_chart_kwargs())
+        ReportQuery.objects.create(
+            report=report,
+            query={
+                'condition': 'AND',
+                'rules': [
+                    {
+                        'id': 'date__variable_date',
+                        'field': 'date',
+                        'type': 'string',
+                        'operator': 'equal',
+                        'value': f'#variable_date:{VariableDate.RANGE_TYPE_LAST_12_MONTHS}',
+                    }
+                ],
+                'valid': True,
+            },
+        )
+        url = reverse('report_builder_examples:view_report', kwargs={'slug': report.slug})
+        with mock.patch.object(cache, 'set', wraps=cache.set) as cache_set:
+            client.get(url)
+            self.get_period_cache(ANNOTATION_VALUE_DAY, TODAY).get_results(self.get_query(ANNOTATION_VALUE_DAY))
+        timeouts = [call.args[2] for call in cache_set.call_args_list if call.args[0].startswith(CACHE_PREFIX)]
+        self.assertEqual(len(timeouts), 2)
+        self.assertLessEqual(timeouts[0], 24 * 60 * 60)
+        # without variable dates the rows are kept until they are invalidated
+        self.assertIsNone(timeouts[1])
+
+    @staticmethod
+    def render(client, url):
+        content = client.get(url).content.decode()
+        # each render gives the canvas a random id
+        canvas_id = re.search(r'<canvas id="(\w+)"', content).group(1)
+        return content.replace(canvas_id, 'canvas')
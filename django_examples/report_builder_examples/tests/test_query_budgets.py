@@ -0,0 +1,315 @@
+"""Query count budgets for rendering each report type and a dashboard through the real views.
+
+These run against SQLite without docker:
+
+    cd django_examples
+    python manage.py test report_builder_examples --settings django_examples.settings_benchmark
+
+Each budget is a fixed cost plus a cost per unit of configuration (lanes, data sets, cells, options, pods). The
+reports are also rendered before and after the data grows, and the query count must not change, so a change that
+makes the number of queries follow the data rather than the configuration fails even inside the budget.
+"""
+
+import re
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from advanced_report_builder.globals import ANNOTATION_CHOICE_SUM, ANNOTATION_VALUE_MONTH, PeriodType
+from advanced_report_builder.models import (
+    BarChartReport,
+    CalendarReport,
+    CalendarReportDataSet,
+    Dashboard,
+    DashboardReport,
+    KanbanReport,
+    KanbanReportLane,
+    LineChartReport,
+    MultiValueReport,
+    MultiValueReportCell,
+    MultiValueReportColumn,
+    PieChartReport,
+    ReportOption,
+    ReportQuery,
+    ReportType,
+    SingleValueReport,
+    TableReport,
+    Target,
+)
+from advanced_report_builder.utils import make_slug_str
+from report_builder_examples import models
+from report_builder_examples.synthetic_data import generate_synthetic_data
+
+SMALL_ROWS = 100
+LARGE_ROWS = 1000
+
+# report, report permission, session, user, child report, report type, content type, report queries and options
+REPORT_QUERIES = 9
+# kanban, calendar and multi value reports have no report type of their own
+REPORT_TYPE_QUERIES = 2
+# the saved state of the datatable
+TABLE_QUERIES = 2
+# lanes, data sets or multi value rows and cells, each loaded once for the whole report
+CHILDREN_QUERIES = 1
+# each lane or cell loads its report type and content type and then runs its own query
+QUERIES_PER_LANE = 3
+QUERIES_PER_QUERY_CELL = 3
+# each data set loads its report type and content type, and the data sets' events are fetched with one query
+QUERIES_PER_DATA_SET = 2
+EVENTS_QUERIES = 1
+# the selected option objects are fetched together, one query per model
+QUERIES_PER_OPTION_MODEL = 1
+# each option lists its choices for the option menu
+QUERIES_PER_OPTION_MENU = 1
+# dashboard, session, user, dashboard reports, report queries and report options
+DASHBOARD_QUERIES = 6
+# the child reports are loaded together, one query per report type
+QUERIES_PER_REPORT_TYPE = 1
+# report permission and the datatable's saved state
+QUERIES_PER_TABLE_POD = 3
+# report permission and the value
+QUERIES_PER_SINGLE_VALUE_POD = 2
+# the report query's target and the colour for the value's percentage of it
+QUERIES_PER_TARGET = 2
+
+
+class QueryBudgetTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate_synthetic_data(rows=SMALL_ROWS, users=5)
+        cls.user = get_user_model().objects.create_superuser('budget', 'budget@example.com', 'budget')
+        cls.report_types = {report_type.name: report_type for report_type in ReportType.objects.all()}
+
+    def setUp(self):
+        self.client = Client(HTTP_USER_AGENT='query budget')
+        self.client.force_login(self.user)
+
+    def count_queries(self, url, data=None):
+        # the first render fills the per process caches, such as the content types
+        self.render(url=url, data=data)
+        with CaptureQueriesContext(connection) as queries:
+            self.render(url=url, data=data)
+        return [query['sql'] for query in queries.captured_queries]
+
+    def render(self, url, data=None):
+        response = self.client.get(url) if data is None else self.client.post(url, data)
+        self.assertEqual(response.status_code, 200, url)
+        return response
+
+    def assertQueryBudget(self, url, budget, data=None):
+        """Renders url at two sizes of data and checks it stays within budget and does not grow with the data."""
+        small_queries = self.count_queries(url=url, data=data)
+        generate_synthetic_data(rows=LARGE_ROWS, users=5)
+        large_queries = self.count_queries(url=url, data=data)
+        self.assertLessEqual(
+            len(small_queries),
+            budget,
+            f'{url} ran {len(small_queries)} queries, the budget is {budget}:\n' + '\n'.join(small_queries),
+        )
+        self.assertEqual(
+            len(small_queries),
+            len(large_queries),
+            f'{url} ran {len(small_queries)} queries with {SMALL_ROWS} rows but {len(large_queries)} '
+            f'with {LARGE_ROWS}:\n' + '\n'.join(large_queries),
+        )
+
+    @staticmethod
+    def report_url(report, **slug):
+        return reverse(
+            'report_builder_examples:view_report',
+            kwargs={'slug': make_slug_str({'pk': report.slug}, overrides=slug) if slug else report.slug},
+        )
+
+    def payment_table(self, name='Payments'):
+        return TableReport.objects.create(
+            name=name,
+            report_type=self.report_types['Payment'],
+            table_fields=[
+                {'field': 'date', 'title': 'Date'},
+                {'field': 'currency_amount', 'title': 'Amount'},
+                {'field': 'company__name', 'title': 'Company'},
+                {'field': 'company__companyinformation__company_value', 'title': 'Company Value'},
+                {'field': 'user_profile__full_name', 'title': 'Taken By'},
+            ],
+        )
+
+
+class ReportQueryBudgetTests(QueryBudgetTestCase):
+    def test_table(self):
+        report = self.payment_table()
+        self.assertQueryBudget(url=self.report_url(report), budget=REPORT_QUERIES + TABLE_QUERIES)
+
+    def test_table_data(self):
+        report = self.payment_table()
+        url = self.report_url(report)
+        table_id = re.search(r'<table[^>]* id="([^"]+)"', self.render(url).content.decode()).group(1)
+        self.assertQueryBudget(
+            url=url,
+            budget=REPORT_QUERIES + TABLE_QUERIES + 1,
+            data={'datatable_data': 1, 'table_id': table_id, 'draw': 1, 'start': 0, 'length': 100},
+        )
+
+    def test_table_versions_and_options(self):
+        for option_count in (1, 3):
+            with self.subTest(option_count=option_count):
+                report = self.payment_table(name=f'Payments {option_count}')
+                ReportQuery.objects.create(report=report, name='Standard')
+                ReportQuery.objects.create(report=report, name='Received', query=None)
+                slug = {}
+                for option in range(option_count):
+                    report_option = ReportOption.objects.create(
+                        report=report,
+                        name=f'Company {option}',
+                        field='company',
+                        content_type=self.report_types['Company'].content_type,
+                        report_builder_class_name='ReportBuilder',
+                    )
+                    slug[f'option{report_option.pk}'] = models.Company.objects.order_by('pk')[option].pk
+                self.assertQueryBudget(
+                    url=self.report_url(report, **slug),
+                    budget=REPORT_QUERIES
+                    + TABLE_QUERIES
+                    + QUERIES_PER_OPTION_MODEL
+                    + option_count * QUERIES_PER_OPTION_MENU,
+                )
+
+    def test_single_value(self):
+        report = SingleValueReport.objects.create(
+            name='Single Value',
+            report_type=self.report_types['Payment'],
+            single_value_type=SingleValueReport.SingleValueType.SUM,
+            field='currency_amount',
+        )
+        self.assertQueryBudget(url=self.report_url(report), budget=REPORT_QUERIES + 1)
+
+    def test_single_value_target(self):
+        report = SingleValueReport.objects.create(
+            name='Single Value',
+            report_type=self.report_types['Payment'],
+            single_value_type=SingleValueReport.SingleValueType.SUM,
+            field='currency_amount',
+        )
+        target = Target.objects.create(
+            slug='payments',
+            name='Payments',
+            target_type=Target.TargetType.COUNT,
+            period_type=PeriodType.NO_PERIOD,
+            default_value=1000,
+        )
+        ReportQuery.objects.create(report=report, name='Standard', target=target)
+        url = self.report_url(report)
+        self.assertIn('target', self.render(url).content.decode())
+        # the target is worked out from the value already fetched, not a second query for it
+        self.assertQueryBudget(url=url, budget=REPORT_QUERIES + QUERIES_PER_TARGET + 1)
+
+    def test_charts(self):
+        fields = [
+            {'field': 'currency_amount', 'title': 'Amount', 'data_attr': f'annotations_type-{ANNOTATION_CHOICE_SUM}'}
+        ]
+        payment = self.report_types['Payment']
+        chart_kwargs = {
+            'report_type': payment,
+            'axis_scale': ANNOTATION_VALUE_MONTH,
+            'date_field': 'date',
+            'axis_value_type': ANNOTATION_CHOICE_SUM,
+            'fields': fields,
+        }
+        for report in (
+            BarChartReport.objects.create(name='Bar Chart', **chart_kwargs),
+            LineChartReport.objects.create(name='Line Chart', **chart_kwargs),
+            PieChartReport.objects.create(name='Pie Chart', report_type=payment, fields=fields),
+        ):
+            with self.subTest(report=report.name):
+                self.assertQueryBudget(url=self.report_url(report), budget=REPORT_QUERIES + 1)
+
+    def test_kanban(self):
+        for lane_count in (1, 3):
+            with self.subTest(lane_count=lane_count):
+                report = KanbanReport.objects.create(name=f'Kanban {lane_count}')
+                for order in range(lane_count):
+                    KanbanReportLane.objects.create(
+                        kanban_report=report,
+                        name=f'Lane {order}',
+                        order=order,
+                        report_type=self.report_types['Contract'],
+                        heading_field='notes',
+                        order_by_field='start_date',
+                    )
+                self.assertQueryBudget(
+                    url=self.report_url(report),
+                    budget=REPORT_QUERIES - REPORT_TYPE_QUERIES + CHILDREN_QUERIES + lane_count * QUERIES_PER_LANE,
+                )
+
+    def test_calendar(self):
+        for data_set_count in (1, 3):
+            with self.subTest(data_set_count=data_set_count):
+                report = CalendarReport.objects.create(name=f'Calendar {data_set_count}')
+                for order in range(data_set_count):
+                    CalendarReportDataSet.objects.create(
+                        calendar_report=report,
+                        order=order,
+                        name=f'Contracts {order}',
+                        report_type=self.report_types['Contract'],
+                        heading_field='notes',
+                        start_date_field='start_date',
+                        end_date_type=CalendarReportDataSet.END_DATE_TYPE_FIELD,
+                        end_date_field='end_date',
+                    )
+                self.assertQueryBudget(
+                    url=self.report_url(report),
+                    budget=REPORT_QUERIES
+                    - REPORT_TYPE_QUERIES
+                    + CHILDREN_QUERIES
+                    + EVENTS_QUERIES
+                    + data_set_count * QUERIES_PER_DATA_SET,
+                )
+
+    def test_multi_value(self):
+        for row_count in (1, 4):
+            with self.subTest(row_count=row_count):
+                report = MultiValueReport.objects.create(name=f'Multi Value {row_count}', rows=row_count, columns=2)
+                for column in (1, 2):
+                    MultiValueReportColumn.objects.create(multi_value_report=report, column=column, width=50)
+                for row in range(1, row_count + 1):
+                    MultiValueReportCell.objects.create(multi_value_report=report, row=row, column=1, text='Payments')
+                    MultiValueReportCell.objects.create(
+                        multi_value_report=report,
+                        row=row,
+                        column=2,
+                        multi_value_type=MultiValueReportCell.MultiValueType.COUNT,
+                        report_type=self.report_types['Payment'],
+                    )
+                self.assertQueryBudget(
+                    url=self.report_url(report),
+                    budget=REPORT_QUERIES
+                    - REPORT_TYPE_QUERIES
+                    # rows, cells and columns
+                    + CHILDREN_QUERIES * 3
+                    + row_count * QUERIES_PER_QUERY_CELL,
+                )
+
+
+class DashboardQueryBudgetTests(QueryBudgetTestCase):
+    def test_dashboard(self):
+        reports = [
+            self.payment_table(),
+            SingleValueReport.objects.create(
+                name='Single Value',
+                report_type=self.report_types['Payment'],
+                single_value_type=SingleValueReport.SingleValueType.COUNT,
+            ),
+        ]
+        for pod_count in (2, 6):
+            with self.subTest(pod_count=pod_count):
+                dashboard = Dashboard.objects.create(name=f'Dashboard {pod_count}')
+                for pod in range(pod_count):
+                    DashboardReport.objects.create(dashboard=dashboard, report=reports[pod % len(reports)])
+                self.assertQueryBudget(
+                    url=reverse('report_builder_examples:view_dashboard', kwargs={'slug': dashboard.slug}),
+                    budget=DASHBOARD_QUERIES
+                    + len(reports) * QUERIES_PER_REPORT_TYPE
+                    + pod_count // 2 * (QUERIES_PER_TABLE_POD + QUERIES_PER_SINGLE_VALUE_POD),
+                )
@@ -0,0 +1,74 @@
+import re
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from advanced_report_builder.globals import (
+    REVERSE_FOREIGN_KEY_ANNOTATION_DATE_MIN,
+    REVERSE_FOREIGN_KEY_DELIMITER_COMMA,
+    REVERSE_FOREIGN_KEY_DELIMITER_VALUES,
+)
+from advanced_report_builder.models import ReportType, TableReport
+from report_builder_examples import models
+from report_builder_examples.synthetic_data import generate_synthetic_data
+
+
+class ReverseForeignKeyColumnTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate_synthetic_data(rows=20, users=2)
+        cls.user = get_user_model().objects.create_superuser('reverse', 'reverse@example.com', 'reverse')
+        cls.company = ReportType.objects.get(name='Company')
+
+    def setUp(self):
+        self.client = Client(HTTP_USER_AGENT='reverse foreign key')
+        self.client.force_login(self.user)
+
+    def get_table_data(self, *extra_fields, column=None):
+        """Returns the column for each company, the first contract date by default, and the SQL that fetched it."""
+        if column is None:
+            column = {
+                'field': 'contract_created',
+                'title': 'First Contract',
+                'data_attr': f'annotations_type-{REVERSE_FOREIGN_KEY_ANNOTATION_DATE_MIN}',
+            }
+        report = TableReport.objects.create(
+            name='Companies',
+            report_type=self.company,
+            table_fields=[{'field': 'name', 'title': 'Name'}, column, *extra_fields],
+        )
+        url = reverse('report_builder_examples:view_report', kwargs={'slug': report.slug})
+        table_id = re.search(r'<table[^>]* id="([^"]+)"', self.client.get(url).content.decode()).group(1)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(url, {'datatable_data': 1, 'table_id': table_id})
+        self.assertEqual(response.status_code, 200)
+        (sql,) = [query['sql'] for query in queries.captured_queries if '_contract' in query['sql']]
+        return {row[0]: row[1] for row in response.json()['data']}, sql
+
+    def test_subquery_when_no_other_aggregates(self):
+        subquery_data, subquery_sql = self.get_table_data()
+        self.assertNotIn('GROUP BY', subquery_sql.rsplit(')', 1)[-1])
+        self.assertIn('(SELECT MIN(', subquery_sql)
+
+        grouped_data, grouped_sql = self.get_table_data({'field': 'total_contract_amount', 'title': 'Total'})
+        self.assertNotIn('(SELECT MIN(', grouped_sql)
+        self.assertEqual(subquery_data, grouped_data)
+
+    @skipUnless(connection.vendor == 'postgresql', 'STRING_AGG(DISTINCT ...) needs PostgreSQL')
+    def test_choice_labels(self):
+        data, _ = self.get_table_data(
+            column={
+                'field': 'contract_temperature',
+                'title': 'Temperature',
+                'data_attr': f'delimiter_type-{REVERSE_FOREIGN_KEY_DELIMITER_COMMA}',
+            }
+        )
+        labels = dict(models.Contract.TEMPERATURE_TYPES)
+        delimiter = REVERSE_FOREIGN_KEY_DELIMITER_VALUES[REVERSE_FOREIGN_KEY_DELIMITER_COMMA]
+        for company in models.Company.objects.prefetch_related('contract_set'):
+            expected = sorted({labels[contract.temperature] for contract in company.contract_set.all()})
+            self.assertEqual(sorted(filter(None, data[company.name].split(delimiter))), expected)
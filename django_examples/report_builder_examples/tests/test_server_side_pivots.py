@@ -0,0 +1,66 @@
+import json
+import re
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from advanced_report_builder.models import ReportType, TableReport
+from report_builder_examples import models
+from report_builder_examples.synthetic_data import generate_synthetic_data
+
+
+class ServerSidePivotTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate_synthetic_data(rows=40, users=2)
+        cls.user = get_user_model().objects.create_superuser('pivot', 'pivot@example.com', 'pivot')
+        cls.report = TableReport.objects.create(
+            name='Companies',
+            report_type=ReportType.objects.get(name='Company'),
+            table_fields=[{'field': 'name', 'title': 'Name'}],
+            pivot_fields=[{'field': 'importance_choice'}, {'field': 'tags'}],
+            keyset_pagination=True,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client(HTTP_USER_AGENT='server side pivots')
+        self.client.force_login(self.user)
+        self.url = reverse('report_builder_examples:view_report', kwargs={'slug': self.report.slug})
+        self.table_id = re.search(r'<table[^>]* id="([^"]+)"', self.client.get(self.url).content.decode()).group(1)
+
+    def get_facets(self, js_filter_state):
+        data = {
+            'datatable_data': 1,
+            'table_id': self.table_id,
+            'draw': 2,
+            'start': 0,
+            'length': 10,
+            'need_facets': 1,
+            'js_filter_state': json.dumps(js_filter_state),
+        }
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, data)
+        self.assertEqual(response.status_code, 200)
+        group_by_queries = [query['sql'] for query in queries.captured_queries if 'GROUP BY' in query['sql']]
+        return response.json(), group_by_queries
+
+    def test_facet_counts(self):
+        high = models.Company.objects.filter(importance=1).count()
+        page, group_by_queries = self.get_facets({})
+        self.assertEqual(page['facets']['importance_choice']['High'], [high, high])
+        # one GROUP BY for each pivot, used for both the totals and the counts
+        self.assertEqual(len(group_by_queries), 2)
+
+        tag = models.Tags.objects.filter(company__isnull=False).first()
+        tagged = tag.company.count()
+        page, group_by_queries = self.get_facets({'Tags': {'include': [tag.tag]}})
+        self.assertEqual(page['recordsFiltered'], tagged)
+        self.assertEqual(page['facets']['Tags'][tag.tag], [tagged, tagged])
+        self.assertEqual(page['facets']['importance_choice']['High'][1], high)
+        # the totals are kept, so only the filtered counts are worked out again
+        self.assertEqual(len(group_by_queries), 2)
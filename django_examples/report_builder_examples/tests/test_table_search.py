@@ -0,0 +1,71 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from advanced_report_builder.models import ReportType, TableReport
+from report_builder_examples.models import Company, Payment
+from report_builder_examples.synthetic_data import generate_synthetic_data
+
+
+class TableSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate_synthetic_data(rows=60, days=3, future_days=0, users=2)
+        cls.user = get_user_model().objects.create_superuser('search', 'search@example.com', 'search')
+        cls.payment = ReportType.objects.get(name='Payment')
+
+    def setUp(self):
+        self.client = Client(HTTP_USER_AGENT='search')
+        self.client.force_login(self.user)
+
+    def search(self, search_type, value):
+        report = TableReport.objects.create(
+            name='Payments',
+            report_type=self.payment,
+            table_fields=[
+                {'field': 'date', 'title': 'Date'},
+                {'field': 'quantity', 'title': 'Quantity'},
+                {'field': 'company__name', 'title': 'Company'},
+            ],
+            order_by_field='date',
+            keyset_pagination=True,
+            search_type=search_type,
+        )
+        url = reverse('report_builder_examples:view_report', kwargs={'slug': report.slug})
+        table_id = re.search(r'<table[^>]* id="([^"]+)"', self.client.get(url).content.decode()).group(1)
+        response = self.client.post(
+            url,
+            {
+                'datatable_data': 1,
+                'table_id': table_id,
+                'draw': 2,
+                'start': 0,
+                'length': 100,
+                'search[value]': value,
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()['recordsFiltered']
+
+    def test_trigram_searches_text_columns(self):
+        name = Company.objects.filter(payment__isnull=False).values_list('name', flat=True).first()
+        expected = Payment.objects.filter(company__name__icontains=name).count()
+        self.assertEqual(self.search(TableReport.SearchType.CONTAINS, name), expected)
+        self.assertEqual(self.search(TableReport.SearchType.TRIGRAM, name), expected)
+
+        # the quantity column is not text so is left out of a trigram search
+        quantity = str(Payment.objects.values_list('quantity', flat=True).first())
+        self.assertGreater(self.search(TableReport.SearchType.CONTAINS, quantity), 0)
+        self.assertEqual(
+            self.search(TableReport.SearchType.TRIGRAM, quantity),
+            Payment.objects.filter(company__name__icontains=quantity).count(),
+        )
+
+    def test_full_text_falls_back_to_contains(self):
+        name = Company.objects.filter(payment__isnull=False).values_list('name', flat=True).first()
+        self.assertEqual(
+            self.search(TableReport.SearchType.FULL_TEXT, name),
+            self.search(TableReport.SearchType.CONTAINS, name),
+        )
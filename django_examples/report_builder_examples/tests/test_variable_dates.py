@@ -0,0 +1,68 @@
+from datetime import date, timedelta
+
+from django.test import SimpleTestCase
+
+from advanced_report_builder.report_context import ReportContext
+from advanced_report_builder.variable_date import VariableDate, get_variable_date_table, lookup_variable_dates
+
+# month ends, quarter ends, year ends and leap days
+DAYS = [
+    date(2023, 1, 1),
+    date(2023, 3, 31),
+    date(2023, 12, 31),
+    date(2024, 2, 28),
+    date(2024, 2, 29),
+    date(2024, 3, 1),
+    date(2024, 8, 31),
+    date(2025, 6, 15),
+    date(2027, 11, 30),
+    date(2028, 2, 29),
+]
+
+
+class VariableDateTableTests(SimpleTestCase):
+    def test_table_matches_get_variable_dates(self):
+        variable_date = VariableDate()
+        for today in DAYS:
+            for financial_year_start_month in range(1, 13):
+                table = get_variable_date_table(today, financial_year_start_month)
+                self.assertEqual(len(table), len(VariableDate.RANGE_TYPE_CHOICES))
+                for range_type, label in VariableDate.RANGE_TYPE_CHOICES:
+                    with self.subTest(today=today, month=financial_year_start_month, range_type=label):
+                        self.assertEqual(
+                            table[range_type],
+                            variable_date.get_variable_dates(
+                                range_type=range_type,
+                                financial_year_start_month=financial_year_start_month,
+                                today=today,
+                            ),
+                        )
+
+    def test_every_day_of_a_leap_year(self):
+        variable_date = VariableDate()
+        today = date(2024, 1, 1)
+        while today.year == 2024:
+            table = get_variable_date_table(today, 4)
+            for range_type, _ in VariableDate.RANGE_TYPE_CHOICES:
+                self.assertEqual(
+                    table[range_type],
+                    variable_date.get_variable_dates(range_type=range_type, financial_year_start_month=4, today=today),
+                )
+            today += timedelta(days=1)
+
+    def test_table_built_once_per_day(self):
+        today = date(2031, 5, 5)
+        self.assertIs(get_variable_date_table(today, 1), get_variable_date_table(today, 1))
+        self.assertIsNot(get_variable_date_table(today, 1), get_variable_date_table(today + timedelta(days=1), 1))
+
+    def test_lookup(self):
+        today = date(2024, 2, 29)
+        expected = VariableDate().get_variable_dates(
+            range_type=VariableDate.RANGE_TYPE_THIS_FINANCIAL_YEAR, financial_year_start_month=4, today=today
+        )
+        self.assertEqual(lookup_variable_dates(str(VariableDate.RANGE_TYPE_THIS_FINANCIAL_YEAR), 4, today), expected)
+        self.assertEqual(
+            ReportContext(today=today).get_variable_dates(VariableDate.RANGE_TYPE_THIS_FINANCIAL_YEAR, 4), expected
+        )
+        with self.assertRaises(AssertionError):
+            lookup_variable_dates(999, 1, today)
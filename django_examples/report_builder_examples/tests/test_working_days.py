@@ -0,0 +1,126 @@
+import random
+from datetime import date, timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import Client, SimpleTestCase, TestCase
+from django.urls import reverse
+
+from advanced_report_builder.globals import ANNOTATION_VALUE_DAY
+from advanced_report_builder.models import ReportType, SingleValueReport, WorkingDayCalendar, WorkingDayClosure
+from advanced_report_builder.utils import count_days
+from advanced_report_builder.variable_date import VariableDate
+from report_builder_examples.synthetic_data import generate_synthetic_data
+
+
+def count_days_by_walking(start_date, end_date, exclude_weekdays=None, exclude_dates=None):
+    """The day by day count that count_days replaced."""
+    if start_date > end_date:
+        start_date, end_date = end_date, start_date
+    exclude_weekdays = set(exclude_weekdays or [])
+    exclude_dates = set(exclude_dates or [])
+    current = start_date
+    count = 0
+    while current < end_date:
+        weekday = ((current.weekday() + 1) % 7) + 1
+        if weekday not in exclude_weekdays and current not in exclude_dates:
+            count += 1
+        current += timedelta(days=1)
+    return count
+
+
+class CountDaysTests(SimpleTestCase):
+    def test_matches_walking_the_days(self):
+        generator = random.Random(40)
+        first = date(2019, 12, 20)
+        holidays = [first + timedelta(days=generator.randrange(2000)) for _ in range(60)]
+        for exclude_weekdays in (None, [1, 7], [7], [2, 3, 4], [1, 2, 3, 4, 5, 6, 7]):
+            for exclude_dates in (None, holidays):
+                for _ in range(50):
+                    start_date = first + timedelta(days=generator.randrange(2000))
+                    end_date = start_date + timedelta(days=generator.randrange(-40, 800))
+                    with self.subTest(exclude_weekdays=exclude_weekdays, start_date=start_date, end_date=end_date):
+                        self.assertEqual(
+                            count_days(start_date, end_date, exclude_weekdays, exclude_dates),
+                            count_days_by_walking(start_date, end_date, exclude_weekdays, exclude_dates),
+                        )
+
+    def test_same_day(self):
+        self.assertEqual(count_days(date(2026, 1, 5), date(2026, 1, 5), [1, 7]), 0)
+
+
+class WorkingDayCalendarTests(TestCase):
+    def test_closures(self):
+        calendar = WorkingDayCalendar.objects.create(name='England')
+        # Monday 5 to Monday 19 January 2026 is ten weekdays
+        self.assertEqual(calendar.get_index().count(date(2026, 1, 5), date(2026, 1, 19)), 10)
+
+        WorkingDayClosure.objects.create(calendar=calendar, name='Bank holiday', start_date=date(2026, 1, 6))
+        # a closure over a weekend only takes off its weekdays
+        closure = WorkingDayClosure.objects.create(
+            calendar=calendar,
+            name='Stocktake',
+            closure_type=WorkingDayClosure.ClosureType.CLOSURE,
+            start_date=date(2026, 1, 9),
+            end_date=date(2026, 1, 12),
+        )
+        calendar.refresh_from_db()
+        self.assertEqual(calendar.get_index().count(date(2026, 1, 5), date(2026, 1, 19)), 7)
+
+        closure.delete()
+        calendar.refresh_from_db()
+        self.assertEqual(calendar.get_index().count(date(2026, 1, 5), date(2026, 1, 19)), 9)
+
+        # as the admin's delete selected does
+        WorkingDayClosure.objects.filter(calendar=calendar).delete()
+        calendar.refresh_from_db()
+        self.assertEqual(calendar.get_index().count(date(2026, 1, 5), date(2026, 1, 19)), 10)
+
+        calendar.exclude_weekdays = [1]
+        calendar.save()
+        self.assertEqual(calendar.get_index().count(date(2026, 1, 5), date(2026, 1, 19)), 12)
+
+    def test_single_value_average(self):
+        generate_synthetic_data(rows=20, days=3, future_days=0, users=2)
+        user = get_user_model().objects.create_superuser('calendar', 'calendar@example.com', 'calendar')
+        calendar = WorkingDayCalendar.objects.create(name='England')
+        report = SingleValueReport.objects.create(
+            name='Daily Payments',
+            report_type=ReportType.objects.get(name='Payment'),
+            single_value_type=SingleValueReport.SingleValueType.AVERAGE_SUM_OVER_TIME_EXCLUDING_WEEKENDS,
+            field='currency_amount',
+            average_scale=ANNOTATION_VALUE_DAY,
+            average_start_period=VariableDate.RANGE_TYPE_LAST_CALENDAR_YEAR,
+            average_end_period=VariableDate.RANGE_TYPE_LAST_CALENDAR_YEAR,
+            working_day_calendar=calendar,
+        )
+        client = Client(HTTP_USER_AGENT='calendar')
+        client.force_login(user)
+        with mock.patch.object(
+            WorkingDayCalendar, 'get_index', autospec=True, side_effect=WorkingDayCalendar.get_index
+        ) as get_index:
+            response = client.get(reverse('report_builder_examples:view_report', kwargs={'slug': report.slug}))
+        self.assertEqual(response.status_code, 200)
+        get_index.assert_called_once()
+
+    def test_single_value_average_without_calendar(self):
+        generate_synthetic_data(rows=20, days=3, future_days=0, users=2)
+        user = get_user_model().objects.create_superuser('calendar', 'calendar@example.com', 'calendar')
+        client = Client(HTTP_USER_AGENT='calendar')
+        client.force_login(user)
+        for single_value_type in (
+            SingleValueReport.SingleValueType.AVERAGE_SUM_OVER_TIME,
+            SingleValueReport.SingleValueType.AVERAGE_SUM_OVER_TIME_EXCLUDING_WEEKENDS,
+        ):
+            report = SingleValueReport.objects.create(
+                name=f'Daily Payments {single_value_type}',
+                report_type=ReportType.objects.get(name='Payment'),
+                single_value_type=single_value_type,
+                field='currency_amount',
+                average_scale=ANNOTATION_VALUE_DAY,
+                average_start_period=VariableDate.RANGE_TYPE_LAST_CALENDAR_YEAR,
+                average_end_period=VariableDate.RANGE_TYPE_LAST_CALENDAR_YEAR,
+            )
+            with self.subTest(single_value_type=single_value_type):
+                response = client.get(reverse('report_builder_examples:view_report', kwargs={'slug': report.slug}))
+                self.assertEqual(response.status_code, 200)
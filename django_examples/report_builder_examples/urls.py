@@ -5,6 +5,8 @@ from report_builder_examples.views.dashboards import ViewDashboard, ViewDashboar
 from report_builder_examples.views.reports import (
     PermissionModal,
     ViewReport,
+    ViewReportCalendarFeed,
+    ViewReportData,
     ViewReports,
 )
 from report_builder_examples.views.targets import ViewTargets
@@ -20,6 +22,8 @@ urlpatterns = [
     ),
     path('', ViewReports.as_view(), name='index'),
     path('report/<str:slug>/', ViewReport.as_view(), name='view_report'),
+    path('report/data/<str:slug>/', ViewReportData.as_view(), name='view_report_data'),
+    path('report/feed/<str:slug>.ics', ViewReportCalendarFeed.as_view(), name='view_report_calendar_feed'),
     path('dashboards/', ViewDashboards.as_view(), name='dashboards_index'),
     path('dashboards/<str:slug>/', ViewDashboard.as_view(), name='view_dashboard'),
     path(
@@ -11,7 +11,11 @@ from advanced_report_builder.views.funnel_charts import FunnelChartView
 from advanced_report_builder.views.kanban import KanbanView
 from advanced_report_builder.views.line_charts import LineChartView
 from advanced_report_builder.views.pie_charts import PieChartView
-from advanced_report_builder.views.reports import ViewReportBase
+from advanced_report_builder.views.reports import (
+    ViewReportBase,
+    ViewReportCalendarFeedBase,
+    ViewReportDataBase,
+)
 from advanced_report_builder.views.single_values import SingleValueView
 from report_builder_examples.models import ReportPermission
 from report_builder_examples.views.base import MainIndices, MainMenu
@@ -177,6 +181,12 @@ class ViewKanbanViewReport(KanbanView):
         ]
 
 
+def has_report_permission(request, report):
+    if hasattr(report, 'reportpermission') and report.reportpermission.requires_superuser:
+        return request.user.is_superuser
+    return True
+
+
 class ViewReport(MainMenu, ViewReportBase):
     template_name = 'report_builder_examples/report.html'
     views_overrides = {
@@ -198,10 +208,21 @@ class ViewReport(MainMenu, ViewReportBase):
         return redirect('report_builder_examples:view_report', slug=self.report.slug)
 
     def has_permission(self):
-        report = self.report
-        if hasattr(report, 'reportpermission') and report.reportpermission.requires_superuser:
-            return self.request.user.is_superuser
-        return True
+        return has_report_permission(self.request, self.report)
+
+
+class ViewReportData(ViewReportDataBase):
+    views_overrides = ViewReport.views_overrides
+
+    def has_permission(self):
+        return has_report_permission(self.request, self.report)
+
+
+class ViewReportCalendarFeed(ViewReportCalendarFeedBase):
+    views_overrides = ViewReport.views_overrides
+
+    def has_permission(self):
+        return has_report_permission(self.request, self.report)
 
 
 class PermissionModal(ModelFormModal):